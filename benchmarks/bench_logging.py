@@ -0,0 +1,72 @@
+"""Per-call cost of logger.info on the hot loop: synchronous handlers vs the queue listener.
+
+Usage:
+    python -m benchmarks.bench_logging [--calls 20000] [--json]
+
+Both setups write to a file in a temporary directory and to a console
+stream (discarded), so only the caller-side cost differs.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from config.config import CONFIG
+from log.logging_config import setup_logging, stop_logging
+
+
+def legacy_logger(path: str, stream) -> logging.Logger:
+    """The pre-queue setup: FileHandler + StreamHandler called inline."""
+    logger = logging.getLogger("bench.sync")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    file_handler = logging.FileHandler(path, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s"))
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    return logger
+
+
+def bench(label: str, logger: logging.Logger, calls: int) -> float:
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        logger.info(f"🔍 Found {i} pairs for ethereum (q=ethereum)")
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    mean = sum(samples) / calls * 1e6
+    p99 = samples[int(calls * 0.99)] * 1e6
+    print(f"{label:<16} {calls:>8} calls  mean {mean:7.2f} us  p99 {p99:8.2f} us  max {samples[-1] * 1e6:9.1f} us")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="Use the JSON-lines file format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        before = bench("sync handlers", legacy_logger(os.path.join(directory, "sync.log"), devnull), args.calls)
+
+        settings = {**CONFIG["LOGGING"], "file": os.path.join(directory, "queued.log"), "json": args.json}
+        stdout, sys.stdout = sys.stdout, devnull  # The console handler binds sys.stdout
+        try:
+            logger = setup_logging(settings, name="bench.queued")
+        finally:
+            sys.stdout = stdout
+        after = bench("queue listener", logger, args.calls)
+
+        start = time.perf_counter()
+        stop_logging("bench.queued")
+        print(f"{'drain':<16} {(time.perf_counter() - start) * 1000:>14.1f} ms (writer thread catching up)")
+
+    print(f"caller-side speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Throughput of the pairs write path: pandas `to_sql` vs COPY + ON CONFLICT upsert.
+
+Usage (needs the POSTGRES_* variables of the .env file):
+    python -m benchmarks.bench_pairs_upsert [--sizes 1000 10000 100000]
+
+Runs against a scratch `pairs_bench` table with the same schema as `pairs`.
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+from db.bulk import upsert_pairs
+from db.db import get_db_config
+
+BENCH_TABLE = 'pairs_bench'
+
+
+def make_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    addresses = [f"0x{i:040x}" for i in range(n)]
+    return pd.DataFrame({
+        'pair_address': addresses,
+        'base_token_name': [f"TOKEN{i}" for i in range(n)],
+        'base_token_address': addresses,
+        'quote_token_address': addresses,
+        'price': rng.random(n),
+        'liquidity': rng.random(n) * 1e6,
+        'volume_24h': rng.random(n) * 1e6,
+        'chain': rng.choice(['ethereum', 'bsc', 'polygon'], n),
+        'exchange': rng.choice(['uniswap', 'pancakeswap'], n),
+        'created_at': pd.Timestamp('2024-01-01'),
+        'timestamp': datetime.utcnow(),
+        'creator_address': addresses,
+    })
+
+
+def reset(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {BENCH_TABLE} (LIKE pairs INCLUDING ALL)"))
+
+
+def bench(engine, label, fn, df):
+    reset(engine)
+    start = time.perf_counter()
+    fn(df)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(df):>8} rows  {elapsed:8.3f}s  {len(df) / elapsed:12,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    load_dotenv()
+    db_config = get_db_config()
+    engine = create_engine(
+        f'postgresql+psycopg2://{db_config["user"]}:{db_config["password"]}'
+        f'@{db_config["host"]}:{db_config["port"]}/{db_config["dbname"]}'
+    )
+
+    for n in args.sizes:
+        df = make_frame(n)
+        bench(engine, "to_sql (append)", lambda d: d.to_sql(BENCH_TABLE, engine, if_exists='append', index=False), df)
+        bench(engine, "COPY + upsert (insert)", lambda d: upsert_pairs(engine, d, table=BENCH_TABLE), df)
+
+        # Second pass on the populated table: every row conflicts (to_sql would fail here)
+        start = time.perf_counter()
+        upsert_pairs(engine, df, table=BENCH_TABLE)
+        elapsed = time.perf_counter() - start
+        print(f"{'COPY + upsert (update)':<28} {n:>8} rows  {elapsed:8.3f}s  {n / elapsed:12,.0f} rows/s")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Rows/sec of the pairs normalization step: json_normalize + apply vs the vectorized path.
+
+Usage:
+    python -m benchmarks.bench_process_data [--payload pairs.json[.gz]] [--rows 5000] [--repeat 5]
+
+`--payload` takes recorded DexScreener responses: a list of pairs or
+{"pairs": [...]} as JSON (optionally gzip-compressed). Without it, a
+synthetic payload shaped like the /search response is used.
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+from empty_my_wallet.normalize import normalize_pairs
+
+
+def legacy_normalize(raw_data: List[Dict]) -> pd.DataFrame:
+    """The pre-vectorization code of process_data, kept for comparison."""
+    df = pd.json_normalize(raw_data, sep='_')
+
+    def validate_address(addr):
+        if not isinstance(addr, str):
+            return None
+        clean_addr = addr.strip()[:128]
+        if len(clean_addr) not in (42, 44) or not clean_addr.startswith(('0x', 'osmo')):
+            return None
+        return clean_addr
+
+    return pd.DataFrame({
+        'pair_address': df['pairAddress'].apply(validate_address),
+        'base_token_name': df['baseToken_name'],
+        'base_token_address': df['baseToken_address'].apply(validate_address),
+        'quote_token_address': df['quoteToken_address'].apply(validate_address),
+        'price': pd.to_numeric(df['priceUsd'], errors='coerce'),
+        'liquidity': pd.to_numeric(df['liquidity_usd'], errors='coerce'),
+        'volume_24h': pd.to_numeric(df['volume_h24'], errors='coerce'),
+        'chain': df['chainId'],
+        'exchange': df['dexId'],
+        'created_at': pd.to_datetime(df['pairCreatedAt'], unit='ms'),
+        'timestamp': datetime.utcnow()
+    })
+
+
+def synthetic_pair(i: int) -> Dict:
+    rnd = random.Random(i)
+    address = lambda: "0x" + "".join(rnd.choice("0123456789abcdef") for _ in range(40))
+    return {
+        "chainId": rnd.choice(["ethereum", "bsc", "polygon"]),
+        "dexId": rnd.choice(["uniswap", "pancakeswap", "quickswap"]),
+        "url": f"https://dexscreener.com/x/{i}",
+        "pairAddress": address(),
+        "baseToken": {"address": address(), "name": f"Token {i}", "symbol": f"TK{i}"},
+        "quoteToken": {"address": address(), "name": "Wrapped Ether", "symbol": "WETH"},
+        "priceNative": str(rnd.random()),
+        "priceUsd": str(rnd.random() * 10),
+        "txns": {"m5": {"buys": 1, "sells": 2}, "h1": {"buys": 3, "sells": 4},
+                 "h6": {"buys": 5, "sells": 6}, "h24": {"buys": 7, "sells": 8}},
+        "volume": {"h24": rnd.random() * 1e6, "h6": 1.0, "h1": 1.0, "m5": 1.0},
+        "priceChange": {"m5": 0.1, "h1": 0.2, "h6": 0.3, "h24": 0.4},
+        "liquidity": {"usd": rnd.random() * 1e6, "base": 1.0, "quote": 1.0},
+        "fdv": rnd.random() * 1e7,
+        "pairCreatedAt": 1700000000000 + i,
+    }
+
+
+def load_payload(path: str) -> List[Dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("pairs") or []
+    return data
+
+
+def bench(label: str, fn, payload: List[Dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        best = min(best, time.perf_counter() - start)
+    rate = len(payload) / best
+    print(f"{label:<28} {len(payload):>8} rows  {best * 1000:9.1f} ms  {rate:12,.0f} rows/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload", help="Recorded DexScreener pairs (JSON, optionally .gz)")
+    parser.add_argument("--rows", type=int, default=5000, help="Synthetic payload size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = load_payload(args.payload) if args.payload else [synthetic_pair(i) for i in range(args.rows)]
+
+    before = bench("json_normalize + apply", legacy_normalize, payload, args.repeat)
+    after = bench("vectorized", normalize_pairs, payload, args.repeat)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
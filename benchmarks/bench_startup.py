@@ -0,0 +1,113 @@
+"""Cold start of the bot: module import and EmptyMyWallet construction, in fresh processes.
+
+Usage:
+    python -m benchmarks.bench_startup [--restarts 5] [--database-url sqlite:///...]
+
+Each run is a new interpreter (cold imports). The first start migrates an
+empty database; the following ones are restarts on a current schema with a
+saved model, as after a crash. External APIs are served by the replay stub
+(empty recording), the log file and model live in a temporary directory.
+`--eager` also imports sklearn, matplotlib and binance up front, as the bot
+used to, for comparison.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+EAGER_MODULES = ["sklearn.ensemble", "matplotlib.pyplot", "binance.client"]
+
+
+def child(args):
+    start = time.perf_counter()
+    if args.eager:
+        import importlib
+        for module in EAGER_MODULES:
+            importlib.import_module(module)
+
+    from config.config import CONFIG
+    from empty_my_wallet.empty_my_wallet import EmptyMyWallet
+    from empty_my_wallet.replay import ReplaySession, StubServer
+    imported = time.perf_counter()
+
+    CONFIG["LOGGING"]["file"] = os.path.join(args.workdir, "bot.log")
+    CONFIG["LOGGING"]["console"] = False
+    CONFIG["MODEL"]["model_path"] = os.path.join(args.workdir, "model.joblib")
+    CONFIG["METRICS"]["enabled"] = False
+    CONFIG["MARKET_STREAM"]["enabled"] = False
+    CONFIG["FEATURE_STORE"]["path"] = None
+
+    stub = StubServer({}).start()
+    constructing = time.perf_counter()
+    bot = EmptyMyWallet("bench", "bench", test_mode=True, database_url=args.database_url,
+                        session=ReplaySession(stub.url))
+    constructed = time.perf_counter()
+    bot.anomaly_detector.wait_loaded()
+    model_ready = time.perf_counter()
+
+    print(json.dumps({
+        "import": imported - start,
+        "init": constructed - constructing,
+        "ready": (imported - start) + (constructed - constructing),
+        "model_loaded": model_ready - constructing,
+    }))
+    sys.stdout.flush()
+    os._exit(0)  # Skip joining the background threads
+
+
+def save_model(path: str):
+    import joblib
+    import numpy as np
+    from sklearn.ensemble import IsolationForest
+
+    X = np.random.default_rng(0).lognormal(size=(2000, 3))
+    joblib.dump({"version": 1, "model": IsolationForest(n_estimators=100).fit(X)}, path)
+
+
+def run_child(workdir: str, database_url: str, eager: bool) -> dict:
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--child",
+               "--workdir", workdir, "--database-url", database_url]
+    if eager:
+        command.append("--eager")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(label: str, runs: list):
+    print(f"\n{label} ({len(runs)} runs, median)")
+    for key in ("import", "init", "ready", "model_loaded"):
+        print(f"  {key:<14}{statistics.median(run[key] for run in runs) * 1000:>10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restarts", type=int, default=5)
+    parser.add_argument("--database-url", help="Target database (default: SQLite file in the temp dir)")
+    parser.add_argument("--eager", action="store_true", help="Also time the eager-import variant")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        first = run_child(workdir, database_url, eager=False)
+        report("first start (empty database, no model)", [first])
+
+        save_model(os.path.join(workdir, "model.joblib"))
+        report("restart (current schema, saved model)",
+               [run_child(workdir, database_url, eager=False) for _ in range(args.restarts)])
+        if args.eager:
+            report("restart, eager imports",
+                   [run_child(workdir, database_url, eager=True) for _ in range(args.restarts)])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import logging
 import os
-import yaml
+from collections.abc import MutableMapping
 
 # Configuration par défaut
 DEFAULT_CONFIG = {
@@ -17,6 +17,136 @@ DEFAULT_CONFIG = {
         "coin_blacklist": [],
         "dev_blacklist": [],
         "chain_whitelist": ["ethereum", "bsc", "polygon"],
+    },
+    "BLACKLIST": {
+        "full_sync_interval": 600,
+        "sync_overlap": 60,
+    },
+    "HTTP": {
+        "pool_connections": 16,
+        "pool_maxsize": 32,
+        "defaults": {"timeout": 10, "retries": 1, "failure_threshold": 5, "reset_timeout": 30},
+        "apis": {
+            "dexscreener": {"timeout": 10},
+            "explorer": {"timeout": 10},
+            "explorer_balance": {"timeout": 5},
+            "honeypot": {"timeout": 5},
+        },
+    },
+    "INGESTION": {
+        "max_workers": 8,
+        "requests_per_second": 5,
+        "burst": 10,
+        "max_retries": 3,
+        "max_backoff": 60,
+        "queries": {},
+    },
+    "CREATOR_CACHE": {
+        "max_size": 50000,
+        "batch_size": 5,
+        "negative_ttl": 3600,
+        "requests_per_second": 5,
+    },
+    "HONEYPOT": {
+        "api_url": "https://api.honeypot.is/v2/IsHoneypot",
+        "max_workers": 16,
+        "positive_ttl": 86400,
+        "negative_ttl": 900,
+        "max_size": 50000,
+    },
+    "SNAPSHOTS": {
+        "enabled": True,
+        "premake_days": 2,
+        "retention_days": 30,
+    },
+    "MODEL": {
+        "detector": "isolation_forest",
+        "n_estimators": 100,
+        "contamination": 0.01,
+        "min_refit_rows": 1000,
+        "refit_interval": 600,
+        "zscore_window": 5000,
+        "zscore_threshold": 6.0,
+        "zscore_recompute_every": 10,
+        "model_path": "data/model.joblib",
+    },
+    "FEATURE_STORE": {
+        "capacity": 100000,
+        "path": None,
+    },
+    "METRICS": {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 9108,
+    },
+    "DASHBOARD": {
+        "enabled": True,
+        "top_n": 100,
+        "refresh_interval": 60,
+    },
+    "LOGGING": {
+        "level": "INFO",
+        "file": "log/dex_screener_bot.log",
+        "rotation": "size",
+        "max_bytes": 10 * 1024 * 1024,
+        "backup_count": 5,
+        "when": "midnight",
+        "json": False,
+        "console": True,
+    },
+    "SCHEDULER": {
+        "interval": 60,
+        "adaptive": True,
+        "min_interval": 60,
+        "max_interval": 300,
+        "api_budgets_per_minute": {"dexscreener": 300, "explorer": 150, "explorer_balance": 150, "honeypot": 300},
+        "budget_utilization": 0.5,
+    },
+    "TRADING": {
+        "quote_asset": "USDT",
+        "quantity": 10,
+        "refresh_interval": 3600,
+        "refresh_retry_interval": 30,
+        "resolve_contracts": True,
+        "name_fallback": True,
+        "contract_symbols": {},
+    },
+    "MARKET_STREAM": {
+        "enabled": False,
+        "url": "wss://stream.binance.com:9443/",
+        "max_streams": 200,
+        "max_quote_age": 5,
+        "quote_timeout": 1.0,
+        "max_spread_bps": 50,
+        "max_backoff": 60,
+    },
+    "RISK_GATE": {
+        "max_workers": 32,
+        "token_budget": 2.0,
+        "fail_closed": True,
+    },
+    "CHANGE_DETECTION": {
+        "enabled": True,
+        "price_threshold": 0.005,
+        "liquidity_threshold": 0.01,
+        "volume_threshold": 0.02,
+        "refresh_interval": 900,
+        "max_idle": 3600,
+    },
+    "SHARDING": {
+        "enabled": False,
+        "mode": "chain",
+        "hash_buckets": 16,
+        "lease_ttl": 30,
+        "heartbeat_interval": 5,
+        "trade_poll_interval": 1,
+    },
+    "ARCHIVE": {
+        "enabled": False,
+        "path": "data/archive",
+        "raw": True,
+        "compression_level": 3,
+        "flush_interval": 600,
     }
 }
 
@@ -42,15 +172,24 @@ API_KEYS = {
 
 # Fonction de chargement de la configuration
 def load_config(config_path="config/config.yaml"):
+    import yaml
+
     try:
         # Tentative de chargement du fichier YAML
         with open(config_path, "r") as config_file:
-            config = yaml.safe_load(config_file)
+            config = yaml.load(config_file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
         
         # Si la configuration est manquante ou invalide, retour à la configuration par défaut
         if not config:
             raise ValueError("Le fichier de configuration est vide.")
         
+        # Compléter les sections/clés absentes avec les valeurs par défaut
+        for section, defaults in DEFAULT_CONFIG.items():
+            if isinstance(defaults, dict):
+                config[section] = {**defaults, **(config.get(section) or {})}
+            else:
+                config.setdefault(section, defaults)
+
         logging.info("Configuration chargée avec succès.")
         return config
     except (FileNotFoundError, yaml.YAMLError, ValueError) as e:
@@ -58,5 +197,33 @@ def load_config(config_path="config/config.yaml"):
         logging.info("Chargement de la configuration par défaut.")
         return DEFAULT_CONFIG
 
+class LazyConfig(MutableMapping):
+    """Configuration chargée au premier accès (pas de lecture YAML à l'import)."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._config = None
+
+    def _load(self):
+        if self._config is None:
+            self._config = self._loader()
+        return self._config
+
+    def __getitem__(self, section):
+        return self._load()[section]
+
+    def __setitem__(self, section, value):
+        self._load()[section] = value
+
+    def __delitem__(self, section):
+        del self._load()[section]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+
 # Chargement de la configuration
-CONFIG = load_config()
+CONFIG = LazyConfig(load_config)
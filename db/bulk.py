@@ -0,0 +1,91 @@
+import io
+from typing import List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import text
+
+PAIRS_COLUMNS = [
+    'pair_address', 'base_token_name', 'base_token_address', 'quote_token_address',
+    'price', 'liquidity', 'volume_24h', 'chain', 'exchange', 'created_at',
+    'timestamp', 'creator_address',
+]
+
+NULL_MARKER = '\\N'
+
+
+def frame_to_csv(df: pd.DataFrame, columns: Sequence[str]) -> io.StringIO:
+    """Serialize a frame to an in-memory CSV buffer suitable for COPY."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, columns=list(columns), index=False, header=False, na_rep=NULL_MARKER)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_frame(cursor, df: pd.DataFrame, table: str, columns: Sequence[str]):
+    """Stream a frame into `table` with COPY FROM STDIN (psycopg2 cursor)."""
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    cursor.copy_expert(
+        f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')",
+        frame_to_csv(df, columns)
+    )
+
+
+def copy_upsert(engine, df: pd.DataFrame, table: str, key: str,
+                columns: Optional[List[str]] = None, order_by: Optional[str] = None) -> int:
+    """Bulk upsert a frame: COPY into a temp staging table, then one INSERT ... ON CONFLICT merge.
+
+    Rows sharing the same key are collapsed (keeping the greatest `order_by`)
+    so a single batch can never hit the same conflicting row twice.
+    Falls back to an executemany upsert on non-PostgreSQL engines.
+    """
+    if df.empty:
+        return 0
+
+    columns = columns or [c for c in df.columns]
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c != key)
+
+    if engine.dialect.name != 'postgresql':
+        return _executemany_upsert(engine, df, table, key, columns, column_list, updates)
+
+    staging = f"{table}_staging"
+    order = f', "{order_by}" DESC' if order_by else ''
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+        cursor = conn.connection.cursor()
+        try:
+            copy_frame(cursor, df, staging, columns)
+        finally:
+            cursor.close()
+        result = conn.execute(text(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT DISTINCT ON ("{key}") {column_list}
+            FROM {staging}
+            ORDER BY "{key}"{order}
+            ON CONFLICT ("{key}") DO UPDATE SET {updates}
+        """))
+        return result.rowcount
+
+
+def _executemany_upsert(engine, df, table, key, columns, column_list, updates) -> int:
+    values = ", ".join(f":{c}" for c in columns)
+    query = text(f"""
+        INSERT INTO {table} ({column_list})
+        VALUES ({values})
+        ON CONFLICT ("{key}") DO UPDATE SET {updates}
+    """)
+    frame = df[columns].drop_duplicates(subset=[key], keep='last')
+    rows = [
+        {c: (v.to_pydatetime() if isinstance(v, pd.Timestamp) else None if pd.isna(v) else v)
+         for c, v in record.items()}
+        for record in frame.to_dict('records')
+    ]
+    with engine.begin() as conn:
+        conn.execute(query, rows)
+    return len(rows)
+
+
+def upsert_pairs(engine, df: pd.DataFrame, table: str = 'pairs') -> int:
+    """Upsert processed pairs keyed on pair_address (latest snapshot wins)."""
+    columns = [c for c in PAIRS_COLUMNS if c in df.columns]
+    return copy_upsert(engine, df, table, key='pair_address', columns=columns, order_by='timestamp')
@@ -0,0 +1,341 @@
+import math
+import os
+import socket
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from config.config import CONFIG
+from empty_my_wallet.metrics import SHARD_LEASES, TRADE_INTENTS
+
+LEADER_SHARD = 'leader'
+
+# Clé de l'advisory lock du trader (espace de clés applicatif, arbitraire mais fixe)
+TRADER_LOCK_KEY = 0x454D5702
+
+TRADE_COLUMNS = ['pair_address', 'chain', 'base_token_name', 'base_token_address', 'price']
+
+# Statuts couverts par l'index unique par token (migration 005)
+ACTIVE_INTENT_STATUSES = "('pending', 'claimed', 'executed')"
+
+# Executes a batch of claimed trade intents, one result per intent (None when skipped)
+TradeExecutor = Callable[[List[Dict]], List[Optional[object]]]
+
+
+class ExecutorUnavailableError(RuntimeError):
+    """Raised by a TradeExecutor before sending any order: the claimed intents go back to pending."""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def pair_bucket(pair_address: str, buckets: int) -> int:
+    """Stable hash bucket of a pair address (same on every worker and node)."""
+    return zlib.crc32((pair_address or '').lower().encode()) % buckets
+
+
+class ShardCoordinator:
+    """Shards the pipeline across bot workers through Postgres leases.
+
+    The work is split into shards: one per whitelisted chain (`mode: chain`)
+    or `hash_buckets` ranges of pair-address hashes (`mode: hash`). Every
+    worker heartbeats into `bot_workers` and holds leases in `shard_leases`
+    that expire after `lease_ttl` seconds. On each heartbeat a worker renews
+    its leases, takes free or expired ones up to its fair share
+    (shards / live workers) and releases the surplus, so shards move to
+    the remaining workers when one dies and spread out when one joins.
+
+    In hash mode every worker still fetches every chain (DexScreener cannot
+    be queried by pair-address range) and drops the pairs outside its
+    buckets, so ingestion requests grow with the worker count; the cycle
+    cadence is stretched by `fetch_copies` to keep the pool within the API
+    budget. Hash mode only pays off when processing, not ingestion, is the
+    bottleneck.
+
+    One worker also holds the `leader` lease: it is the single writer that
+    executes trades (drained from `trade_intents` under an advisory lock)
+    and runs the shared maintenance. When disabled, the worker owns
+    everything and is the leader.
+    """
+
+    def __init__(self, engine, logger, chains: Iterable[str], worker_id: Optional[str] = None,
+                 settings: Optional[Dict] = None):
+        self.engine = engine
+        self.logger = logger
+        self.settings = settings or CONFIG["SHARDING"]
+        self.worker_id = worker_id or default_worker_id()
+        self.chains = [chain.lower() for chain in chains]
+        self.mode = self.settings["mode"]
+        self.buckets = int(self.settings["hash_buckets"])
+        self.lease_ttl = float(self.settings["lease_ttl"])
+
+        self.enabled = bool(self.settings["enabled"])
+        if self.enabled and engine.dialect.name != 'postgresql':
+            self.logger.warning("⚠️ Sharding needs PostgreSQL, running as a single worker")
+            self.enabled = False
+
+        if self.mode == 'hash':
+            self.shards = [f"hash:{bucket}" for bucket in range(self.buckets)]
+        else:
+            self.shards = [f"chain:{chain}" for chain in self.chains]
+
+        self._owned = frozenset()
+        self._leader = False
+        self._live_workers = 1
+        self._valid_until = 0.0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[TradeExecutor] = None
+
+    @property
+    def owned(self) -> frozenset:
+        """Shards leased by this worker (empty once the leases may have expired)."""
+        if not self.enabled:
+            return frozenset(self.shards)
+        return self._owned if time.monotonic() < self._valid_until else frozenset()
+
+    @property
+    def is_leader(self) -> bool:
+        if not self.enabled:
+            return True
+        return self._leader and time.monotonic() < self._valid_until
+
+    @property
+    def fetch_copies(self) -> int:
+        """Workers fetching the same chains: the live workers in hash mode, 1 otherwise."""
+        if not self.enabled or self.mode != 'hash':
+            return 1
+        return self._live_workers
+
+    def owned_chains(self) -> List[str]:
+        """Chains to fetch: all of them in hash mode, the leased ones in chain mode."""
+        if self.mode == 'hash':
+            return list(self.chains)
+        owned = self.owned
+        return [chain for chain in self.chains if f"chain:{chain}" in owned]
+
+    def select(self, pairs: Iterable[Dict]) -> Iterator[Dict]:
+        """Keep the raw pairs of the owned hash buckets (pass-through in chain mode)."""
+        if not self.enabled or self.mode != 'hash':
+            yield from pairs
+            return
+        owned = {int(shard.split(':', 1)[1]) for shard in self.owned}
+        for pair in pairs:
+            if pair_bucket(pair.get('pairAddress'), self.buckets) in owned:
+                yield pair
+
+    def register_shards(self):
+        """Lease rows for the configured shards (the tables come from the migrations)."""
+        if not self.enabled:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("""
+                    INSERT INTO shard_leases (shard) VALUES (:shard)
+                    ON CONFLICT (shard) DO NOTHING
+                """),
+                [{"shard": shard} for shard in self.shards + [LEADER_SHARD]]
+            )
+
+    def heartbeat(self) -> frozenset:
+        """Renew, claim and release leases; returns the shards now owned."""
+        started = time.monotonic()
+        ttl = f"INTERVAL '{self.lease_ttl} seconds'"
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO bot_workers (worker_id, started_at, heartbeat_at)
+                VALUES (:worker, NOW() AT TIME ZONE 'utc', NOW() AT TIME ZONE 'utc')
+                ON CONFLICT (worker_id) DO UPDATE SET heartbeat_at = EXCLUDED.heartbeat_at
+            """), {"worker": self.worker_id})
+            live = conn.execute(text(f"""
+                SELECT COUNT(*) FROM bot_workers
+                WHERE heartbeat_at > NOW() AT TIME ZONE 'utc' - {ttl}
+            """)).scalar() or 1
+            # Les workers morts depuis longtemps sont oubliés
+            conn.execute(text(f"""
+                DELETE FROM bot_workers
+                WHERE heartbeat_at < NOW() AT TIME ZONE 'utc' - 10 * {ttl}
+            """))
+
+            owned = set(conn.execute(text(f"""
+                UPDATE shard_leases SET expires_at = NOW() AT TIME ZONE 'utc' + {ttl}
+                WHERE worker_id = :worker
+                RETURNING shard
+            """), {"worker": self.worker_id}).scalars())
+            leader = LEADER_SHARD in owned
+            owned.discard(LEADER_SHARD)
+
+            target = math.ceil(len(self.shards) / live)
+            if len(owned) > target:
+                surplus = sorted(owned)[target:]
+                conn.execute(text("""
+                    UPDATE shard_leases SET worker_id = NULL, expires_at = NULL
+                    WHERE worker_id = :worker AND shard IN :shards
+                """).bindparams(bindparam("shards", expanding=True)),
+                    {"worker": self.worker_id, "shards": surplus})
+                owned.difference_update(surplus)
+            elif len(owned) < target:
+                owned.update(self._claim(conn, self.shards, target - len(owned), ttl))
+
+            if not leader:
+                leader = bool(self._claim(conn, [LEADER_SHARD], 1, ttl))
+
+        changed = owned != self._owned or leader != self._leader
+        self._owned, self._leader = frozenset(owned), leader
+        self._live_workers = live
+        self._valid_until = started + self.lease_ttl
+        SHARD_LEASES.set(len(owned), worker=self.worker_id)
+        if changed:
+            self.logger.info(f"🧩 Worker {self.worker_id} owns {len(owned)}/{len(self.shards)} shards "
+                             f"({', '.join(sorted(owned)) or 'none'}){' and leads' if leader else ''} "
+                             f"- {live} live workers")
+        return self._owned
+
+    def _claim(self, conn, shards: List[str], limit: int, ttl: str) -> List[str]:
+        return list(conn.execute(text(f"""
+            UPDATE shard_leases SET worker_id = :worker, expires_at = NOW() AT TIME ZONE 'utc' + {ttl}
+            WHERE shard IN (
+                SELECT shard FROM shard_leases
+                WHERE shard IN :shards
+                  AND (worker_id IS NULL OR expires_at < NOW() AT TIME ZONE 'utc')
+                ORDER BY shard
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING shard
+        """).bindparams(bindparam("shards", expanding=True)),
+            {"worker": self.worker_id, "shards": shards, "limit": limit}).scalars())
+
+    def release(self):
+        """Give the leases back right away (clean shutdown) instead of letting them expire."""
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE shard_leases SET worker_id = NULL, expires_at = NULL WHERE worker_id = :worker
+            """), {"worker": self.worker_id})
+            conn.execute(text("DELETE FROM bot_workers WHERE worker_id = :worker"), {"worker": self.worker_id})
+        self._owned, self._leader = frozenset(), False
+        SHARD_LEASES.set(0, worker=self.worker_id)
+
+    def start(self, executor: Optional[TradeExecutor] = None):
+        """First heartbeat, then heartbeats and trade draining in a background thread."""
+        if not self.enabled or self._running:
+            return
+        self._executor = executor
+        self.heartbeat()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="shard-coordinator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=self.lease_ttl)
+        try:
+            self.release()
+        except Exception as e:
+            self.logger.error(f"❌ Error releasing shard leases: {str(e)}")
+
+    def _loop(self):
+        heartbeat_interval = float(self.settings["heartbeat_interval"])
+        poll_interval = float(self.settings["trade_poll_interval"])
+        next_heartbeat = time.monotonic() + heartbeat_interval
+        while self._running:
+            try:
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + heartbeat_interval
+                    self.heartbeat()
+                if self._executor is not None and self.is_leader:
+                    self.drain_trades(self._executor)
+            except Exception as e:
+                self.logger.error(f"❌ Shard coordinator error: {str(e)}")
+            time.sleep(min(poll_interval, max(0.0, next_heartbeat - time.monotonic())))
+
+    def enqueue_trades(self, rows: pd.DataFrame) -> int:
+        """Queue approved trades for the leader.
+
+        A token with an intent pending, claimed or executed (by any worker)
+        is not queued again; failed and skipped intents can be retried.
+        """
+        if rows.empty:
+            return 0
+        # Un seul INSERT multi-lignes ; RETURNING ne renvoie que les intentions réellement ajoutées
+        params = {"worker": self.worker_id}
+        values = []
+        for i, row in enumerate(rows.to_dict('records')):
+            values.append("(" + ", ".join(f":{column}_{i}" for column in TRADE_COLUMNS) + ", :worker)")
+            params.update({f"{column}_{i}": None if pd.isna(row.get(column)) else row.get(column)
+                           for column in TRADE_COLUMNS})
+        with self.engine.begin() as conn:
+            queued = len(conn.execute(text(f"""
+                INSERT INTO trade_intents ({', '.join(TRADE_COLUMNS)}, worker_id)
+                VALUES {', '.join(values)}
+                ON CONFLICT (base_token_address) WHERE status IN {ACTIVE_INTENT_STATUSES} DO NOTHING
+                RETURNING id
+            """), params).all())
+        TRADE_INTENTS.inc(queued, status="queued")
+        return queued
+
+    def drain_trades(self, executor: TradeExecutor, limit: int = 50) -> int:
+        """Execute the pending intents; only the holder of the trader lock does it.
+
+        Intents are marked `claimed` before any order is sent, so a crash
+        between the order and the status update never sends it twice.
+        """
+        with self.engine.connect() as conn:
+            if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": TRADER_LOCK_KEY}).scalar():
+                conn.commit()
+                return 0
+            conn.commit()
+            try:
+                with conn.begin():
+                    intents = [dict(row) for row in conn.execute(text(f"""
+                        UPDATE trade_intents SET status = 'claimed'
+                        WHERE id IN (
+                            SELECT id FROM trade_intents
+                            WHERE status = 'pending'
+                            ORDER BY id
+                            LIMIT :limit
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING id, {', '.join(TRADE_COLUMNS)}, worker_id
+                    """), {"limit": limit}).mappings()]
+                if not intents:
+                    return 0
+
+                intents.sort(key=lambda intent: intent['id'])
+                try:
+                    results = executor(intents)
+                except ExecutorUnavailableError as e:
+                    # Aucun ordre envoyé : on rend les intents au prochain drain
+                    self.logger.error(f"❌ Trade executor unavailable, {len(intents)} intents released: {str(e)}")
+                    with conn.begin():
+                        conn.execute(text("""
+                            UPDATE trade_intents SET status = 'pending' WHERE id IN :ids
+                        """).bindparams(bindparam("ids", expanding=True)),
+                            {"ids": [intent['id'] for intent in intents]})
+                    return 0
+                except Exception as e:
+                    self.logger.error(f"❌ Trade execution error: {str(e)}")
+                    results = [e] * len(intents)
+
+                statuses = []
+                for intent, result in zip(intents, results):
+                    status = "failed" if isinstance(result, Exception) else "executed" if result else "skipped"
+                    statuses.append({"id": intent['id'], "status": status})
+                    TRADE_INTENTS.inc(status=status)
+                with conn.begin():
+                    conn.execute(text("""
+                        UPDATE trade_intents SET status = :status, executed_at = NOW() AT TIME ZONE 'utc'
+                        WHERE id = :id
+                    """), statuses)
+                return len(intents)
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": TRADER_LOCK_KEY})
+                conn.commit()
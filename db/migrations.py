@@ -0,0 +1,276 @@
+"""Versioned schema migrations.
+
+Every migration runs once, in order, and is recorded in `schema_migrations`.
+The bot checks the recorded version at startup (one query) and only takes
+the migration lock and runs DDL when it is behind. Migrations can also be
+applied explicitly before a deployment:
+
+    python -m db.migrations [--database-url URL] [--reapply VERSION]
+
+Migrations only use `IF NOT EXISTS` DDL, so the first run is a no-op on
+databases created by earlier versions of the bot. PostgreSQL-only objects
+(partitions, materialized view, worker leases) are skipped on SQLite.
+"""
+import argparse
+import logging
+import sys
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from config.config import CONFIG
+from db.summary import SUMMARY_VIEW, ViabilitySummary
+
+MIGRATION_LOCK_KEY = 0x454D5701
+
+
+def _core_tables(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS blacklist (
+            address VARCHAR(128) PRIMARY KEY,
+            type VARCHAR(20) CHECK (type IN ('coin', 'dev')) NOT NULL,
+            reason TEXT NOT NULL,
+            listed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+        );
+    """))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_blacklist_type ON blacklist(type);
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS pairs (
+            pair_address VARCHAR(128) PRIMARY KEY,
+            base_token_name TEXT NOT NULL,
+            base_token_address VARCHAR(128) NOT NULL,
+            quote_token_address VARCHAR(128) NOT NULL,
+            price NUMERIC CHECK (price >= 0),
+            liquidity NUMERIC CHECK (liquidity >= 0),
+            volume_24h NUMERIC CHECK (volume_24h >= 0),
+            chain TEXT NOT NULL,
+            exchange TEXT NOT NULL,
+            created_at TIMESTAMP,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+            creator_address VARCHAR(128)
+        );
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS contract_creators (
+            chain TEXT NOT NULL,
+            contract_address VARCHAR(128) NOT NULL,
+            creator_address VARCHAR(128),
+            resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+            PRIMARY KEY (chain, contract_address)
+        );
+    """))
+
+
+def _pair_snapshots(conn):
+    # Les partitions journalières sont créées au fil de l'eau par SnapshotStore
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS pair_snapshots (
+            pair_address VARCHAR(128) NOT NULL,
+            chain TEXT NOT NULL,
+            price NUMERIC,
+            liquidity NUMERIC,
+            volume_24h NUMERIC,
+            timestamp TIMESTAMP NOT NULL
+        ) PARTITION BY RANGE (timestamp);
+    """))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_pair_snapshots_pair_ts
+        ON pair_snapshots (pair_address, timestamp);
+    """))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_pair_snapshots_ts_brin
+        ON pair_snapshots USING BRIN (timestamp);
+    """))
+
+
+def _pair_viability(conn):
+    top_n = int(CONFIG["DASHBOARD"]["top_n"])
+    conn.execute(text(f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {SUMMARY_VIEW} AS
+        WITH ranked AS (
+            SELECT
+                pair_address, base_token_name, price, liquidity, volume_24h,
+                chain, exchange, created_at,
+                ROW_NUMBER() OVER (PARTITION BY chain ORDER BY volume_24h DESC NULLS LAST, pair_address) AS chain_rank,
+                ROW_NUMBER() OVER (ORDER BY volume_24h DESC NULLS LAST, pair_address) AS global_rank
+            FROM pairs
+        ), top_pairs AS (
+            SELECT * FROM ranked WHERE chain_rank <= {top_n}
+        )
+        SELECT
+            pair_address, base_token_name, price, liquidity, volume_24h,
+            chain, exchange, created_at, chain_rank,
+            global_rank <= {top_n} AS global_top,
+            (volume_24h / NULLIF(MAX(volume_24h) OVER (PARTITION BY chain), 0) * 0.5 +
+             liquidity / NULLIF(MAX(liquidity) OVER (PARTITION BY chain), 0) * 0.5) * 100
+                AS viability_score,
+            CASE WHEN global_rank <= {top_n} THEN
+                (volume_24h / NULLIF(MAX(CASE WHEN global_rank <= {top_n} THEN volume_24h END) OVER (), 0) * 0.5 +
+                 liquidity / NULLIF(MAX(CASE WHEN global_rank <= {top_n} THEN liquidity END) OVER (), 0) * 0.5) * 100
+            END AS global_viability_score
+        FROM top_pairs;
+    """))
+    # Required by REFRESH ... CONCURRENTLY
+    conn.execute(text(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_{SUMMARY_VIEW}_pair
+        ON {SUMMARY_VIEW} (pair_address);
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS idx_{SUMMARY_VIEW}_chain
+        ON {SUMMARY_VIEW} (chain, chain_rank);
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS summary_refreshes (
+            name TEXT PRIMARY KEY,
+            refreshed_at TIMESTAMP NOT NULL
+        );
+    """))
+    ViabilitySummary.stamp(conn)
+
+
+def _worker_leases(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS bot_workers (
+            worker_id TEXT PRIMARY KEY,
+            started_at TIMESTAMP NOT NULL,
+            heartbeat_at TIMESTAMP NOT NULL
+        );
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS shard_leases (
+            shard TEXT PRIMARY KEY,
+            worker_id TEXT,
+            expires_at TIMESTAMP
+        );
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS trade_intents (
+            id BIGSERIAL PRIMARY KEY,
+            pair_address VARCHAR(128) NOT NULL,
+            chain TEXT NOT NULL,
+            base_token_name TEXT NOT NULL,
+            base_token_address VARCHAR(128) NOT NULL,
+            price NUMERIC,
+            worker_id TEXT NOT NULL,
+            status VARCHAR(10) DEFAULT 'pending' NOT NULL,
+            created_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'utc') NOT NULL,
+            executed_at TIMESTAMP
+        );
+    """))
+    # Un token n'est en attente qu'une seule fois, quel que soit le worker
+    conn.execute(text("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_trade_intents_pending
+        ON trade_intents (base_token_address) WHERE status = 'pending';
+    """))
+
+
+def _trade_intents_once(conn):
+    # Un token déjà en attente, en cours d'exécution ou acheté n'est plus jamais remis en file
+    # (failed/skipped peuvent être réessayés). Les doublons antérieurs sont déclassés
+    # pour que l'index puisse être créé.
+    conn.execute(text("""
+        UPDATE trade_intents SET status = 'duplicate'
+        WHERE status IN ('pending', 'claimed', 'executed')
+          AND id NOT IN (
+              SELECT MIN(id) FROM trade_intents
+              WHERE status IN ('pending', 'claimed', 'executed')
+              GROUP BY base_token_address
+          );
+    """))
+    conn.execute(text("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_trade_intents_token
+        ON trade_intents (base_token_address) WHERE status IN ('pending', 'claimed', 'executed');
+    """))
+    conn.execute(text("DROP INDEX IF EXISTS idx_trade_intents_pending;"))
+
+
+# (version, name, apply, postgresql only) — append only, never edit an applied migration
+MIGRATIONS: List[Tuple[int, str, Callable, bool]] = [
+    (1, "core tables", _core_tables, False),
+    (2, "pair snapshots", _pair_snapshots, True),
+    (3, "pair viability view", _pair_viability, True),
+    (4, "worker leases", _worker_leases, True),
+    (5, "one trade intent per token", _trade_intents_once, True),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(engine) -> int:
+    """Last applied migration (0 on an empty database)."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar() or 0
+    except DBAPIError:
+        return 0
+
+
+def migrate(engine, logger=None, reapply: Optional[int] = None) -> int:
+    """Apply the pending migrations; returns how many ran (0 when already current)."""
+    logger = logger or logging.getLogger(__name__)
+    if reapply is None and current_version(engine) >= LATEST_VERSION:
+        return 0
+
+    postgres = engine.dialect.name == 'postgresql'
+    applied = 0
+    with engine.begin() as conn:
+        if postgres:
+            # Workers starting together: un seul migre, les autres attendent puis voient la version à jour
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+            );
+        """))
+        current = conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar() or 0
+
+        for version, name, apply, postgres_only in MIGRATIONS:
+            if version <= current and version != reapply:
+                continue
+            skipped = postgres_only and not postgres
+            if not skipped:
+                apply(conn)
+            if version > current:
+                conn.execute(text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                             {"version": version, "name": name})
+            applied += 1
+            logger.info(f"🗄️ {'Skipped' if skipped else 'Applied'} migration {version:03d} ({name})"
+                        f"{f' on {engine.dialect.name}' if skipped else ''}")
+    return applied
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+    from sqlalchemy import create_engine
+
+    from db.db import get_db_config
+
+    parser = argparse.ArgumentParser(description="Apply the pending database migrations")
+    parser.add_argument("--database-url", help="SQLAlchemy URL (default: PostgreSQL from .env)")
+    parser.add_argument("--reapply", type=int, help="Run an already applied migration again (e.g. 3 after "
+                                                    "dropping pair_viability to change DASHBOARD.top_n)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    load_dotenv()
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        db_config = get_db_config()
+        engine = create_engine(
+            f'postgresql+psycopg2://{db_config["user"]}:{db_config["password"]}'
+            f'@{db_config["host"]}:{db_config["port"]}/{db_config["dbname"]}',
+            connect_args={'sslmode': 'require'}
+        )
+
+    applied = migrate(engine, reapply=args.reapply)
+    print(f"Schema at version {current_version(engine)} ({applied} migrations applied)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+from config.config import CONFIG
+from db.bulk import copy_frame
+
+SNAPSHOT_COLUMNS = ['pair_address', 'chain', 'price', 'liquidity', 'volume_24h', 'timestamp']
+
+PARTITION_PREFIX = 'pair_snapshots_'
+
+
+class SnapshotStore:
+    """Append-only price/liquidity/volume history in `pair_snapshots`.
+
+    The table is range-partitioned by day on `timestamp`. Partitions are
+    created ahead of time and retention drops whole partitions rather than
+    deleting rows. A BRIN index on `timestamp` and a btree on
+    (pair_address, timestamp) keep recent-window queries fast.
+    """
+
+    def __init__(self, engine, logger, settings: Optional[Dict] = None):
+        self.engine = engine
+        self.logger = logger
+        self.settings = settings or CONFIG["SNAPSHOTS"]
+        self.enabled = bool(self.settings["enabled"]) and engine.dialect.name == 'postgresql'
+        self._partitions = set()
+
+    @staticmethod
+    def partition_name(day: datetime) -> str:
+        return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+    def ensure_partitions(self, start: datetime, end: Optional[datetime] = None):
+        """Create the daily partitions covering [start, end + premake_days]."""
+        if not self.enabled:
+            return
+
+        first = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        last = (end or start) + timedelta(days=int(self.settings["premake_days"]))
+        missing = []
+        day = first
+        while day <= last:
+            if self.partition_name(day) not in self._partitions:
+                missing.append(day)
+            day += timedelta(days=1)
+        if not missing:
+            return
+
+        with self.engine.begin() as conn:
+            # Plusieurs workers peuvent créer la même partition en même temps
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('pair_snapshots'))"))
+            for day in missing:
+                name = self.partition_name(day)
+                conn.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS {name}
+                    PARTITION OF pair_snapshots
+                    FOR VALUES FROM ('{day:%Y-%m-%d}') TO ('{day + timedelta(days=1):%Y-%m-%d}');
+                """))
+        self._partitions.update(self.partition_name(day) for day in missing)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """COPY a cycle's pairs into the snapshot table."""
+        if not self.enabled or df.empty:
+            return 0
+
+        self.ensure_partitions(df['timestamp'].min(), df['timestamp'].max())
+        with self.engine.begin() as conn:
+            cursor = conn.connection.cursor()
+            try:
+                copy_frame(cursor, df, 'pair_snapshots', SNAPSHOT_COLUMNS)
+            finally:
+                cursor.close()
+        return len(df)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        """Drop the partitions that are entirely older than `retention_days`."""
+        if not self.enabled:
+            return 0
+
+        cutoff = (now or datetime.utcnow()) - timedelta(days=int(self.settings["retention_days"]))
+        oldest_kept = self.partition_name(cutoff)
+        with self.engine.begin() as conn:
+            partitions = conn.execute(text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = 'pair_snapshots'
+            """)).scalars().all()
+
+            # Names are zero-padded dates, so lexical order is chronological
+            expired = sorted(name for name in partitions
+                             if name.startswith(PARTITION_PREFIX) and name < oldest_kept)
+            for name in expired:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                self._partitions.discard(name)
+
+        if expired:
+            self.logger.info(f"🧹 Dropped {len(expired)} expired snapshot partitions")
+        return len(expired)
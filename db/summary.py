@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from config.config import CONFIG
+
+SUMMARY_VIEW = 'pair_viability'
+
+
+class ViabilitySummary:
+    """Precomputed viability data for the dashboard in the `pair_viability` view.
+
+    The materialized view keeps the top `top_n` pairs by 24h volume of every
+    chain with their viability score, plus the score over the global top
+    `top_n`. A refresh recomputes the view over the whole `pairs` table, so
+    the bot runs it concurrently in a background thread, at most every
+    `refresh_interval` seconds, and stamps `summary_refreshes`, which the
+    frontend uses to invalidate its cache.
+
+    The view is created by migration 3 (`db/migrations.py`). `top_n` is part
+    of its definition: after changing it, drop the view and run
+    `python -m db.migrations --reapply 3`.
+    """
+
+    def __init__(self, engine, logger, settings: Optional[Dict] = None):
+        self.engine = engine
+        self.logger = logger
+        self.settings = settings or CONFIG["DASHBOARD"]
+        self.enabled = bool(self.settings["enabled"]) and engine.dialect.name == 'postgresql'
+        self._refreshed_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def stamp(conn):
+        conn.execute(text("""
+            INSERT INTO summary_refreshes (name, refreshed_at)
+            VALUES (:name, NOW() AT TIME ZONE 'utc')
+            ON CONFLICT (name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at
+        """), {"name": SUMMARY_VIEW})
+
+    def maybe_refresh(self) -> bool:
+        """Start a background refresh if `refresh_interval` elapsed and none is running."""
+        if not self.enabled:
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        if (self._refreshed_at is not None and
+                time.monotonic() - self._refreshed_at < float(self.settings["refresh_interval"])):
+            return False
+        self._refreshed_at = time.monotonic()
+        self._thread = threading.Thread(target=self._refresh_safe, name="summary-refresh", daemon=True)
+        self._thread.start()
+        return True
+
+    def _refresh_safe(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            self.logger.error(f"❌ Error refreshing {SUMMARY_VIEW}: {str(e)}")
+
+    def refresh(self):
+        """Refresh the view without blocking dashboard reads, then bump its version."""
+        if not self.enabled:
+            return
+
+        # CONCURRENTLY diffs against the current contents and only writes the changed rows
+        with self.engine.begin() as conn:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SUMMARY_VIEW}"))
+            self.stamp(conn)
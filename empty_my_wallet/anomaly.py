@@ -0,0 +1,240 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import CONFIG
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import IsolationForest
+
+FEATURES = ["price", "liquidity", "volume_24h"]
+
+
+class RobustZScoreDetector:
+    """Online detector based on a rolling median / MAD per feature.
+
+    Features are log-scaled (prices and volumes are heavy-tailed). A row is
+    anomalous when any feature is more than `threshold` robust standard
+    deviations away from the rolling median. No training step: each batch is
+    scored against the window and then appended to it.
+
+    The window is a preallocated ring buffer, so appending a batch is
+    O(batch). The median and MAD are recomputed every `recompute_every`
+    batches (O(window)) and reused in between, which keeps the amortized
+    cost per batch independent of the window size.
+    """
+
+    def __init__(self, window: int, threshold: float, recompute_every: int = 10):
+        self.threshold = threshold
+        self.capacity = window
+        self.recompute_every = max(1, recompute_every)
+        self._buffer: Optional[np.ndarray] = None
+        self._size = 0
+        self._head = 0
+        self._batches = 0
+        self._median: Optional[np.ndarray] = None
+        self._mad: Optional[np.ndarray] = None
+
+    def _append(self, X: np.ndarray):
+        if self._buffer is None:
+            self._buffer = np.empty((self.capacity, X.shape[1]))
+        X = X[-self.capacity:]
+        end = self._head + len(X)
+        if end <= self.capacity:
+            self._buffer[self._head:end] = X
+        else:
+            split = self.capacity - self._head
+            self._buffer[self._head:] = X[:split]
+            self._buffer[:end - self.capacity] = X[split:]
+        self._head = end % self.capacity
+        self._size = min(self.capacity, self._size + len(X))
+
+    def _refresh_stats(self):
+        history = self._buffer[:self._size]
+        self._median = np.median(history, axis=0)
+        mad = np.median(np.abs(history - self._median), axis=0) * 1.4826
+        mad[mad == 0] = np.finfo(float).eps
+        self._mad = mad
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Max absolute robust z-score per row (0 while the window is empty)."""
+        if self._size == 0:
+            return np.zeros(len(X))
+        # Statistiques recalculées tous les `recompute_every` lots (et dès le premier)
+        if self._median is None or self._batches % self.recompute_every == 0:
+            self._refresh_stats()
+        return np.max(np.abs((X - self._median) / self._mad), axis=1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.log1p(np.clip(X, 0, None))
+        scores = self.score(X)
+        if len(X):
+            self._append(X)
+            self._batches += 1
+        return scores > self.threshold
+
+
+def _fit_from_shared_memory(shm_name: str, shape, params: Dict) -> "IsolationForest":
+    """Process-pool entry point: fit an IsolationForest on a window held in shared memory."""
+    from sklearn.ensemble import IsolationForest
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        X = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return IsolationForest(**params).fit(X)
+    finally:
+        shm.close()
+
+
+class AnomalyDetector:
+    """Anomaly scoring that never trains on the hot path.
+
+    In `isolation_forest` mode, a pre-fitted model is only used for inference
+    (`predict`). `schedule_refit` copies the rolling window (the feature
+    store) into shared memory and trains a replacement in a worker process.
+    The new model is published with a single reference swap, tagged with
+    an increasing version, and saved with joblib so a restart resumes from
+    it. Only the very first batch, with no saved model, is fit
+    synchronously. `robust_zscore` mode uses the online
+    `RobustZScoreDetector` instead.
+
+    sklearn and joblib are imported lazily and the saved model is loaded in
+    a background thread, so construction returns immediately; the first
+    `predict` waits for the load.
+    """
+
+    def __init__(self, logger, settings: Optional[Dict] = None):
+        self.logger = logger
+        self.settings = settings or CONFIG["MODEL"]
+        self.mode = self.settings["detector"]
+        self.model_path = self.settings.get("model_path")
+        # (version, model), replaced as a whole so readers never see a mix
+        self._published: Tuple[int, Optional["IsolationForest"]] = (0, None)
+        self.last_refit = 0.0
+        self.last_mean_score: Optional[float] = None
+
+        self._refit_future = None
+        self._executor = None
+        self._online = RobustZScoreDetector(int(self.settings["zscore_window"]),
+                                            float(self.settings["zscore_threshold"]),
+                                            int(self.settings["zscore_recompute_every"]))
+        self._loader: Optional[threading.Thread] = None
+        if self.mode == "isolation_forest" and self.model_path and os.path.exists(self.model_path):
+            self._loader = threading.Thread(target=self._load, name="model-load", daemon=True)
+            self._loader.start()
+
+    def wait_loaded(self):
+        if self._loader is not None:
+            self._loader.join()
+            self._loader = None
+
+    @property
+    def model(self) -> Optional["IsolationForest"]:
+        return self._published[1]
+
+    @property
+    def version(self) -> int:
+        return self._published[0]
+
+    def _params(self) -> Dict:
+        return {"n_estimators": int(self.settings["n_estimators"]),
+                "contamination": self.settings["contamination"]}
+
+    def _load(self):
+        import joblib
+
+        try:
+            saved = joblib.load(self.model_path)
+            self._published = (saved["version"], saved["model"])
+            self.last_refit = time.monotonic()
+            self.logger.info(f"🤖 Loaded model v{saved['version']} from {self.model_path}")
+        except Exception as e:
+            self.logger.error(f"❌ Could not load saved model: {str(e)}")
+
+    def _persist(self, version: int, model: "IsolationForest"):
+        if not self.model_path:
+            return
+        import joblib
+
+        directory = os.path.dirname(self.model_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.model_path}.tmp"
+        joblib.dump({"version": version, "model": model}, tmp_path)
+        os.replace(tmp_path, self.model_path)
+
+    def _publish(self, model: "IsolationForest") -> int:
+        version = self._published[0] + 1
+        self._published = (version, model)
+        return version
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of anomalous rows."""
+        X = df[FEATURES].to_numpy(dtype=float)
+        if self.mode == "robust_zscore":
+            return self._online.predict(X)
+
+        self.wait_loaded()
+        model = self.model
+        if model is None:
+            from sklearn.ensemble import IsolationForest
+
+            model = IsolationForest(**self._params()).fit(X)
+            self._publish(model)
+            self.last_refit = time.monotonic()
+
+        # Same rule as IsolationForest.predict, without scoring twice
+        scores = model.decision_function(X)
+        self.last_mean_score = float(scores.mean())
+        return scores < 0
+
+    def _on_refit_done(self, future, shm: shared_memory.SharedMemory):
+        shm.close()
+        shm.unlink()
+        try:
+            model = future.result()
+        except Exception as e:
+            self.logger.error(f"❌ Background model refit failed: {str(e)}")
+            return
+
+        version = self._publish(model)
+        self.logger.info(f"🤖 Model v{version} re-trained in background and swapped in")
+        try:
+            self._persist(version, model)
+        except Exception as e:
+            self.logger.error(f"❌ Could not save model v{version}: {str(e)}")
+
+    def schedule_refit(self, window: np.ndarray) -> bool:
+        """Start a refit in the process pool on a (rows, FEATURES) window if one is due and none is running."""
+        if self.mode != "isolation_forest" or len(window) < int(self.settings["min_refit_rows"]):
+            return False
+        self.wait_loaded()
+        if self._refit_future is not None and not self._refit_future.done():
+            return False
+        if time.monotonic() - self.last_refit < float(self.settings["refit_interval"]):
+            return False
+
+        if self._executor is None:
+            # spawn: the bot runs several threads, forking them is unsafe
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+        self.last_refit = time.monotonic()
+        # Snapshot the window into shared memory: the ring buffer keeps being written while we train
+        window = np.asarray(window, dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(window.nbytes, 1))
+        np.ndarray(window.shape, dtype=np.float64, buffer=shm.buf)[:] = window
+
+        self._refit_future = self._executor.submit(_fit_from_shared_memory, shm.name, window.shape, self._params())
+        self._refit_future.add_done_callback(lambda future: self._on_refit_done(future, shm))
+        return True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,271 @@
+"""Columnar archive of every cycle: raw DexScreener payloads and normalized pairs.
+
+`raw` holds every pair DexScreener returned to this worker, before the
+pre-filter and the change detector (one JSON payload per pair). `pairs`
+holds the normalized rows of the pairs the cycle actually processed: new
+or changed pairs that passed the filters. Unchanged pairs are not in
+`pairs`, so backtests needing complete snapshots rebuild them from `raw`.
+
+Files are zstd-compressed Parquet, partitioned by UTC day:
+
+    <path>/raw/date=2026-10-17/part-<first cycle>-<worker>.parquet
+    <path>/pairs/date=2026-10-17/part-<first cycle>-<worker>.parquet
+    <path>/manifest.jsonl
+
+Cycles are buffered and written every `flush_interval` seconds (and on
+shutdown or day change), off the cycle thread. A timer thread flushes
+buffers that reached `flush_interval` even when no new cycle arrives. Every file gets a line in
+the manifest (kind, day, rows, first/last cycle), so readers pick files
+without listing directories and scan them memory-mapped:
+
+    archive = PayloadArchive(logger)
+    window = archive.frame("pairs", start=datetime(2026, 9, 1), columns=FEATURES)
+    for fetched_at, pairs in archive.raw_cycles(start=...):
+        bot.run_cycle(prefetched=(list(bot.prefilter.filter(pairs)), 0.0))
+
+pyarrow is listed in requirements.txt; without it the archive logs a
+warning and stays off.
+"""
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.config import CONFIG
+
+MANIFEST = "manifest.jsonl"
+
+PAIR_COLUMNS = ['pair_address', 'base_token_name', 'base_token_address', 'quote_token_address',
+                'price', 'liquidity', 'volume_24h', 'chain', 'exchange', 'created_at', 'timestamp',
+                'creator_address']
+
+
+def _schemas(pa) -> Dict[str, "pa.Schema"]:
+    """Fixed schemas, so that files of different cycles always scan together."""
+    chain = pa.dictionary(pa.int32(), pa.string())
+    return {
+        # Payload brut en JSON : le schéma DexScreener varie d'une paire à l'autre
+        "raw": pa.schema([
+            ("fetched_at", pa.timestamp("us")),
+            ("chain", chain),
+            ("pair_address", pa.string()),
+            ("payload", pa.string()),
+        ]),
+        "pairs": pa.schema([
+            ("pair_address", pa.string()),
+            ("base_token_name", pa.string()),
+            ("base_token_address", pa.string()),
+            ("quote_token_address", pa.string()),
+            ("price", pa.float64()),
+            ("liquidity", pa.float64()),
+            ("volume_24h", pa.float64()),
+            ("chain", chain),
+            ("exchange", pa.dictionary(pa.int32(), pa.string())),
+            ("created_at", pa.timestamp("us")),
+            ("timestamp", pa.timestamp("us")),
+            ("creator_address", pa.string()),
+        ]),
+    }
+
+
+class PayloadArchive:
+    """Optional Parquet archive of the raw payloads and normalized frames of each cycle."""
+
+    def __init__(self, logger, settings: Optional[Dict] = None, worker: Optional[str] = None):
+        self.logger = logger
+        self.settings = settings or CONFIG["ARCHIVE"]
+        self.path = self.settings["path"]
+        self.worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+        self.enabled = bool(self.settings["enabled"])
+        self._pa = self._pq = None
+        if self.enabled:
+            try:
+                import pyarrow
+                import pyarrow.compute
+                import pyarrow.parquet
+                self._pa, self._pq = pyarrow, pyarrow.parquet
+                self._schemas = _schemas(pyarrow)
+            except ImportError:
+                self.logger.warning("⚠️ ARCHIVE.enabled needs pyarrow (pip install pyarrow), archive disabled")
+                self.enabled = False
+
+        # (kind, day) -> tables of the buffered cycles
+        self._buffer: Dict[Tuple[str, str], List] = {}
+        self._buffer_started: Optional[float] = None
+        self._manifest_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive") if self.enabled else None
+        self._stopped = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if self.enabled:
+            self._timer = threading.Thread(target=self._flush_loop, name="archive-flush", daemon=True)
+            self._timer.start()
+
+    def _flush_loop(self):
+        # Bot inactif ou fetch à l'arrêt : les cycles en mémoire sont quand même écrits
+        flush_interval = float(self.settings["flush_interval"])
+        while not self._stopped.wait(min(60.0, flush_interval)):
+            try:
+                self._executor.submit(self._flush_if_due)
+            except RuntimeError:
+                return  # Exécuteur arrêté
+
+    def _flush_if_due(self):
+        try:
+            if (self._buffer_started is not None
+                    and time.monotonic() - self._buffer_started >= float(self.settings["flush_interval"])):
+                self._flush()
+        except Exception as e:
+            self.logger.error(f"❌ Archive error: {str(e)}")
+
+    def append_raw(self, raw_pairs: List[Dict], fetched_at: Optional[datetime] = None):
+        """Queue the raw payload of a fetch; encoding and writes happen on the archive thread."""
+        if not self.enabled or not self.settings["raw"] or not raw_pairs:
+            return
+        fetched_at = fetched_at or datetime.utcnow()
+        self._executor.submit(self._append, "raw", lambda: self._raw_table(raw_pairs, fetched_at), fetched_at)
+
+    def append_pairs(self, processed: pd.DataFrame):
+        """Queue the normalized pairs processed by a cycle."""
+        if not self.enabled or processed is None or processed.empty:
+            return
+        self._executor.submit(self._append, "pairs", lambda: self._pairs_table(processed), datetime.utcnow())
+
+    def _append(self, kind: str, build, appended_at: datetime):
+        try:
+            day = appended_at.strftime("%Y-%m-%d")
+            if any(buffered_day != day for _, buffered_day in self._buffer):
+                self._flush()  # Une partition par jour
+
+            table = build()
+            self._buffer.setdefault((kind, day), []).append(table)
+
+            if self._buffer_started is None:
+                self._buffer_started = time.monotonic()
+            elif time.monotonic() - self._buffer_started >= float(self.settings["flush_interval"]):
+                self._flush()
+        except Exception as e:
+            self.logger.error(f"❌ Archive error: {str(e)}")
+
+    def _raw_table(self, raw_pairs: List[Dict], fetched_at: datetime):
+        pa = self._pa
+        return pa.table({
+            "fetched_at": pa.array([fetched_at] * len(raw_pairs), pa.timestamp("us")),
+            "chain": pa.array([pair.get('chainId') for pair in raw_pairs], pa.string()).dictionary_encode(),
+            "pair_address": pa.array([pair.get('pairAddress') for pair in raw_pairs], pa.string()),
+            "payload": pa.array([json.dumps(pair, separators=(',', ':')) for pair in raw_pairs], pa.string()),
+        }, schema=self._schemas["raw"])
+
+    def _pairs_table(self, processed: pd.DataFrame):
+        frame = processed.reindex(columns=PAIR_COLUMNS)
+        for column in ('chain', 'exchange'):
+            frame[column] = frame[column].astype(object)
+        return self._pa.Table.from_pandas(frame, schema=self._schemas["pairs"], preserve_index=False)
+
+    def flush(self):
+        """Write the buffered cycles now (blocks until written)."""
+        if self.enabled:
+            self._executor.submit(self._flush).result()
+
+    def _flush(self):
+        buffer, self._buffer, self._buffer_started = self._buffer, {}, None
+        for (kind, day), tables in buffer.items():
+            table = self._pa.concat_tables(tables).unify_dictionaries()
+            time_column = "fetched_at" if kind == "raw" else "timestamp"
+            times = table.column(time_column)
+            first, last = self._pa.compute.min_max(times).values()
+            first, last = first.as_py(), last.as_py()
+
+            relative = os.path.join(kind, f"date={day}", f"part-{first:%H%M%S%f}-{self.worker}.parquet")
+            target = os.path.join(self.path, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.tmp"
+            self._pq.write_table(table, tmp, compression="zstd",
+                                 compression_level=int(self.settings["compression_level"]))
+            os.replace(tmp, target)
+            self._record(kind, day, relative, table.num_rows, first, last)
+        if buffer:
+            self.logger.info(f"🗃️ Archived {sum(len(tables) for tables in buffer.values())} cycle frames "
+                             f"to {self.path}")
+
+    def _record(self, kind: str, day: str, relative: str, rows: int, first: datetime, last: datetime):
+        line = json.dumps({"kind": kind, "date": day, "path": relative, "rows": rows,
+                           "first": first.isoformat(), "last": last.isoformat(), "worker": self.worker})
+        # Une ligne courte par écriture en O_APPEND : pas d'entrelacement entre workers
+        with self._manifest_lock, open(os.path.join(self.path, MANIFEST), "a", encoding="utf-8") as manifest:
+            manifest.write(line + "\n")
+
+    def close(self):
+        if not self.enabled:
+            return
+        self._stopped.set()
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error(f"❌ Error flushing the archive: {str(e)}")
+        self._executor.shutdown(wait=True)
+
+    def manifest(self) -> List[Dict]:
+        path = os.path.join(self.path, MANIFEST)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as manifest:
+            return [json.loads(line) for line in manifest if line.strip()]
+
+    def files(self, kind: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """Archive files of `kind` overlapping [start, end], oldest first."""
+        entries = []
+        for entry in self.manifest():
+            if entry["kind"] != kind:
+                continue
+            if start is not None and datetime.fromisoformat(entry["last"]) < start:
+                continue
+            if end is not None and datetime.fromisoformat(entry["first"]) > end:
+                continue
+            entries.append(entry)
+        entries.sort(key=lambda entry: entry["first"])
+        return [os.path.join(self.path, entry["path"]) for entry in entries]
+
+    def scan(self, kind: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             columns: Optional[Sequence[str]] = None):
+        """Memory-mapped Arrow table of the archived rows between `start` and `end`."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        schema = _schemas(pa)[kind]
+        files = self.files(kind, start, end)
+        if not files:
+            return schema.empty_table() if columns is None else schema.empty_table().select(list(columns))
+
+        time_column = "fetched_at" if kind == "raw" else "timestamp"
+        expression = None
+        if start is not None:
+            expression = pc.field(time_column) >= pa.scalar(start, pa.timestamp("us"))
+        if end is not None:
+            upper = pc.field(time_column) <= pa.scalar(end, pa.timestamp("us"))
+            expression = upper if expression is None else expression & upper
+        return pq.read_table(files, schema=schema, columns=list(columns) if columns else None,
+                             filters=expression, memory_map=True)
+
+    def frame(self, kind: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        return self.scan(kind, start, end, columns).to_pandas()
+
+    def raw_cycles(self, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Iterator[Tuple[datetime, List[Dict]]]:
+        """Raw payloads grouped by cycle, in order, for offline replays."""
+        table = self.scan("raw", start, end, columns=["fetched_at", "payload"])
+        fetched = table.column("fetched_at").to_pylist()
+        payloads = table.column("payload").to_pylist()
+        cycle_start = 0
+        for i in range(1, len(fetched) + 1):
+            if i == len(fetched) or fetched[i] != fetched[cycle_start]:
+                yield fetched[cycle_start], [json.loads(payload) for payload in payloads[cycle_start:i]]
+                cycle_start = i
+
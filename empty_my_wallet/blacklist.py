@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+from config.config import CONFIG
+
+BLACKLIST_TYPES = ('coin', 'dev')
+
+
+class BlacklistIndex:
+    """Resident copy of the `blacklist` table as one hash set per type.
+
+    The index is synced incrementally using the `listed_at` watermark, so a
+    sync only reads rows added since the last one. `listed_at` is the
+    transaction start time, so each sync re-reads `sync_overlap` seconds
+    before the watermark to catch rows other workers committed late. Rows
+    deleted by another worker are only seen by a full reload, done every
+    `full_sync_interval` seconds. Writes made through `add`/`add_many`
+    update the sets in place and `discard` drops rows deleted from the
+    table. Lookups never touch the database.
+    """
+
+    def __init__(self, engine, logger, settings: Optional[Dict] = None):
+        self.engine = engine
+        self.logger = logger
+        self.settings = settings or CONFIG["BLACKLIST"]
+        self._sets = {kind: set() for kind in BLACKLIST_TYPES}
+        self._listed_at: Dict[str, datetime] = {}
+        self._watermark: Optional[datetime] = None
+        self._last_full_sync: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._listed_at
+
+    def addresses(self, kind: str) -> frozenset:
+        """Snapshot of the addresses of a given type (coin/dev)."""
+        with self._lock:
+            return frozenset(self._sets[kind])
+
+    def _index(self, address: str, kind: str, listed_at: datetime):
+        if isinstance(listed_at, str):
+            listed_at = datetime.fromisoformat(listed_at)  # SQLite (offline replay)
+        self._sets[kind].add(address)
+        self._listed_at[address] = listed_at
+        if self._watermark is None or listed_at > self._watermark:
+            self._watermark = listed_at
+
+    def sync(self, full: bool = False):
+        """Pull rows listed since the last sync, or reload the whole table.
+
+        A full reload happens on the first call, when `full` is set and every
+        `full_sync_interval` seconds; it also drops the rows deleted since.
+        """
+        full = (full or self._watermark is None or self._last_full_sync is None or
+                time.monotonic() - self._last_full_sync >= float(self.settings["full_sync_interval"]))
+        if full:
+            query = text("SELECT address, type, listed_at FROM blacklist")
+            params = {}
+        else:
+            # Marge avant le watermark : listed_at est l'heure de début de la transaction
+            query = text("SELECT address, type, listed_at FROM blacklist WHERE listed_at >= :since")
+            params = {"since": self._watermark - timedelta(seconds=float(self.settings["sync_overlap"]))}
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        dropped = 0
+        with self._lock:
+            if full:
+                previous = self._listed_at
+                self._sets = {kind: set() for kind in BLACKLIST_TYPES}
+                self._listed_at = {}
+                self._watermark = None
+                self._last_full_sync = time.monotonic()
+            for address, kind, listed_at in rows:
+                if kind in self._sets:
+                    self._index(address, kind, listed_at)
+            if full:
+                dropped = sum(1 for address in previous if address not in self._listed_at)
+        if dropped:
+            self.logger.info(f"🧹 Blacklist reloaded: {dropped} expired entries dropped")
+        return len(rows)
+
+    def add_many(self, entries: Iterable[Tuple[str, str, str]]) -> int:
+        """Insert (address, type, reason) entries in a single statement."""
+        rows = []
+        seen = set()
+        for address, kind, reason in entries:
+            if not address or address in seen or address in self:
+                continue
+            seen.add(address)
+            rows.append({"address": address, "type": kind, "reason": reason})
+        if not rows:
+            return 0
+
+        with self.engine.begin() as conn:
+            inserted = self._insert_multi(conn, rows)
+
+        with self._lock:
+            for address, kind, listed_at in inserted:
+                self._index(address, kind, listed_at)
+        return len(inserted)
+
+    @staticmethod
+    def _insert_multi(conn, rows):
+        """Multi-row VALUES insert, returning the rows that were actually added."""
+        values = ", ".join(f"(:address_{i}, :type_{i}, :reason_{i})" for i in range(len(rows)))
+        params = {}
+        for i, row in enumerate(rows):
+            params.update({f"address_{i}": row["address"], f"type_{i}": row["type"], f"reason_{i}": row["reason"]})
+        query = text(f"""
+            INSERT INTO blacklist (address, type, reason)
+            VALUES {values}
+            ON CONFLICT (address) DO NOTHING
+            RETURNING address, type, listed_at
+        """)
+        return conn.execute(query, params).fetchall()
+
+    def add(self, address: str, kind: str, reason: str) -> bool:
+        return self.add_many([(address, kind, reason)]) > 0
+
+    def discard(self, addresses: Iterable[str]):
+        """Remove addresses deleted from the table."""
+        with self._lock:
+            for address in addresses:
+                self._listed_at.pop(address, None)
+                for kind_addresses in self._sets.values():
+                    kind_addresses.discard(address)
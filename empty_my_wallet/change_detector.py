@@ -0,0 +1,126 @@
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.config import CONFIG
+
+# (price, liquidity, volume_24h, hash of the descriptive fields, processed_at, seen_at)
+Fingerprint = Tuple[Optional[float], Optional[float], Optional[float], int, float, float]
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _moved(old: Optional[float], new: Optional[float], threshold: float) -> bool:
+    if old is None or new is None:
+        return old is not new
+    return abs(new - old) > threshold * max(abs(old), 1e-12)
+
+
+class ChangeDetector:
+    """Skip the raw pairs that did not move since they were last processed.
+
+    Keeps a compact fingerprint per pair address: the price, liquidity and
+    24h volume last sent through the pipeline and a hash of the descriptive
+    fields (tokens, dex, chain). A pair is processed again when it is new,
+    its hash changed, one of the metrics moved by more than its relative
+    threshold, or it was last processed more than `refresh_interval`
+    seconds ago.
+
+    The fingerprints of the selected pairs are only staged by `select`;
+    `commit` saves those of the pairs the cycle actually stored. A pair
+    that was filtered out, unresolved or whose cycle failed keeps its
+    previous fingerprint and is selected again on the next cycle. The
+    skipped pairs are kept in `last_unchanged` so the caller can still
+    record their snapshot and feature rows.
+    """
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = settings or CONFIG["CHANGE_DETECTION"]
+        self._fingerprints: Dict[str, Fingerprint] = {}
+        self._pending: Dict[str, Fingerprint] = {}
+        self.last_total = 0
+        self.last_skipped = 0
+        self.last_unchanged: List[Dict] = []
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.last_skipped / self.last_total if self.last_total else 0.0
+
+    def select(self, raw_pairs: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """Pairs that changed (or are new) since they were last processed."""
+        if not self.settings["enabled"]:
+            self.last_total, self.last_skipped, self.last_unchanged = len(raw_pairs), 0, []
+            return raw_pairs
+
+        now = time.monotonic() if now is None else now
+        price_threshold = self.settings["price_threshold"]
+        liquidity_threshold = self.settings["liquidity_threshold"]
+        volume_threshold = self.settings["volume_threshold"]
+        refresh_interval = self.settings["refresh_interval"]
+        fingerprints = self._fingerprints
+        # Un cycle précédent non validé est abandonné
+        self._pending = pending = {}
+
+        changed, unchanged = [], []
+        for pair in raw_pairs:
+            address = pair.get('pairAddress')
+            if not address:
+                changed.append(pair)
+                continue
+
+            base = pair.get('baseToken') or {}
+            price = _number(pair.get('priceUsd'))
+            liquidity = _number((pair.get('liquidity') or {}).get('usd'))
+            volume = _number((pair.get('volume') or {}).get('h24'))
+            content = hash((base.get('address'), base.get('name'), (pair.get('quoteToken') or {}).get('address'),
+                            pair.get('dexId'), pair.get('chainId'), pair.get('pairCreatedAt')))
+
+            previous = fingerprints.get(address)
+            if previous is not None:
+                fingerprints[address] = previous[:5] + (now,)
+            if (previous is None
+                    or previous[3] != content
+                    or now - previous[4] >= refresh_interval
+                    or _moved(previous[0], price, price_threshold)
+                    or _moved(previous[1], liquidity, liquidity_threshold)
+                    or _moved(previous[2], volume, volume_threshold)):
+                pending[address] = (price, liquidity, volume, content, now, now)
+                changed.append(pair)
+            else:
+                unchanged.append(pair)
+
+        self.last_total = len(raw_pairs)
+        self.last_skipped = len(unchanged)
+        self.last_unchanged = unchanged
+        self._prune(now)
+        return changed
+
+    def commit(self, processed: Iterable[str]) -> int:
+        """Save the fingerprints staged by the last `select` for the `processed` pair addresses."""
+        pending = self._pending
+        committed = 0
+        for address in set(processed):
+            fingerprint = pending.get(address)
+            if fingerprint is not None:
+                self._fingerprints[address] = fingerprint
+                committed += 1
+        self._pending = {}
+        return committed
+
+    def rollback(self):
+        """Drop the staged fingerprints: the selected pairs are processed again next cycle."""
+        self._pending = {}
+
+    def _prune(self, now: float):
+        """Forget the pairs DexScreener stopped returning."""
+        max_idle = self.settings["max_idle"]
+        stale = [address for address, fp in self._fingerprints.items() if now - fp[5] > max_idle]
+        for address in stale:
+            del self._fingerprints[address]
+
+    def __len__(self):
+        return len(self._fingerprints)
@@ -0,0 +1,264 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import bindparam, text
+
+from config.config import CONFIG, EXPLORERS, API_KEYS
+from empty_my_wallet.http_client import HttpClient
+from empty_my_wallet.ingestion import TokenBucket
+from empty_my_wallet.metrics import CACHE_REQUESTS, HTTP_ERRORS, RATE_LIMIT_WAIT_SECONDS
+
+UNKNOWN_CREATOR = "Unknown"
+
+CreatorKey = Tuple[str, str]
+
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with an optional expiry per entry."""
+
+    def __init__(self, max_size: int, name: str = ""):
+        self.max_size = max_size
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    CACHE_REQUESTS.inc(cache=self.name, result="hit")
+                    return value
+                del self._data[key]
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return None
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CreatorCache:
+    """Two-tier contract creator cache (in-process LRU + `contract_creators` table).
+
+    Contract creators never change, so resolved creators are kept forever.
+    Unresolved lookups are cached as "Unknown" for `negative_ttl` seconds.
+    Misses are resolved with batched `getcontractcreation` calls, one
+    worker per chain.
+    """
+
+    def __init__(self, engine, logger, http: Optional[HttpClient] = None,
+                 settings: Optional[Dict] = None):
+        self.engine = engine
+        self.logger = logger
+        self.settings = settings or CONFIG["CREATOR_CACHE"]
+        self.lru = LRUCache(int(self.settings["max_size"]), name="creator")
+        self._buckets = {
+            chain: TokenBucket(self.settings["requests_per_second"], self.settings["requests_per_second"])
+            for chain in EXPLORERS
+        }
+        self.api = (http or HttpClient(logger)).api("explorer")
+
+    @staticmethod
+    def key(chain: str, address: str) -> CreatorKey:
+        return chain.lower(), address.strip("'\"").lower()
+
+    def warm(self):
+        """Load persisted creators into the LRU (most recent first)."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.settings["negative_ttl"])
+        query = text("""
+            SELECT chain, contract_address, creator_address, resolved_at
+            FROM contract_creators
+            WHERE creator_address IS NOT NULL OR resolved_at > :cutoff
+            ORDER BY resolved_at DESC
+            LIMIT :limit
+        """)
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(query, {"cutoff": cutoff, "limit": self.lru.max_size}).fetchall()
+        except Exception as e:
+            self.logger.error(f"Error warming creator cache: {str(e)}")
+            return
+
+        # Insert oldest first so the most recent rows end up as most recently used
+        for chain, address, creator, resolved_at in reversed(rows):
+            self._remember((chain, address), creator, resolved_at)
+        self.logger.info(f"Creator cache warmed with {len(rows)} entries")
+
+    def _remember(self, key: CreatorKey, creator: Optional[str], resolved_at: Optional[datetime] = None):
+        if creator:
+            self.lru.set(key, creator)
+            return
+        ttl = self.settings["negative_ttl"]
+        if isinstance(resolved_at, str):  # SQLite returns timestamps as text
+            resolved_at = datetime.fromisoformat(resolved_at)
+        if resolved_at is not None:
+            ttl -= (datetime.utcnow() - resolved_at).total_seconds()
+        if ttl > 0:
+            self.lru.set(key, UNKNOWN_CREATOR, ttl)
+
+    def get(self, chain: str, address: str) -> str:
+        """Return the creator of a single contract ("Unknown" if unresolved)."""
+        return self.get_many([(chain, address)]).get(self.key(chain, address), UNKNOWN_CREATOR)
+
+    def get_many(self, items: Iterable[Tuple[str, str]]) -> Dict[CreatorKey, str]:
+        """Resolve creators for (chain, address) pairs, keyed by normalized (chain, address)."""
+        result = {}
+        misses = set()
+        for chain, address in items:
+            if not isinstance(chain, str) or not isinstance(address, str):
+                continue
+            key = self.key(chain, address)
+            if key in result or key in misses:
+                continue
+            cached = self.lru.get(key)
+            if cached is not None:
+                result[key] = cached
+            else:
+                misses.add(key)
+
+        if misses:
+            found = self._load_persisted(misses)
+            result.update(found)
+            misses -= found.keys()
+
+        if misses:
+            resolved = self._resolve_remote(misses)
+            self._persist(resolved)
+            result.update({key: creator or UNKNOWN_CREATOR for key, creator in resolved.items()})
+            for key in misses - resolved.keys():
+                result[key] = UNKNOWN_CREATOR
+
+        return result
+
+    def _load_persisted(self, keys: Iterable[CreatorKey]) -> Dict[CreatorKey, str]:
+        """Look up cache misses in the persistent table (one query per chain)."""
+        by_chain = defaultdict(list)
+        for chain, address in keys:
+            by_chain[chain].append(address)
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.settings["negative_ttl"])
+        query = text("""
+            SELECT contract_address, creator_address, resolved_at
+            FROM contract_creators
+            WHERE chain = :chain AND contract_address IN :addresses
+              AND (creator_address IS NOT NULL OR resolved_at > :cutoff)
+        """).bindparams(bindparam("addresses", expanding=True))
+
+        found = {}
+        try:
+            with self.engine.connect() as conn:
+                for chain, addresses in by_chain.items():
+                    rows = conn.execute(query, {"chain": chain, "addresses": addresses, "cutoff": cutoff})
+                    for address, creator, resolved_at in rows:
+                        key = (chain, address)
+                        self._remember(key, creator, resolved_at)
+                        found[key] = creator or UNKNOWN_CREATOR
+        except Exception as e:
+            self.logger.error(f"Error reading persisted creators: {str(e)}")
+        return found
+
+    def _resolve_remote(self, keys: Iterable[CreatorKey]) -> Dict[CreatorKey, Optional[str]]:
+        """Resolve misses via the explorers, batched per chain and concurrent across chains.
+
+        Returns None as creator for addresses the explorer answered without a
+        creator; transient failures are left out so they are retried next time.
+        """
+        by_chain = defaultdict(list)
+        for chain, address in keys:
+            if chain not in EXPLORERS:
+                self.logger.warning(f"Unsupported chain for contract lookup: {chain}")
+                continue
+            by_chain[chain].append(address)
+        if not by_chain:
+            return {}
+
+        resolved = {}
+        with ThreadPoolExecutor(max_workers=len(by_chain)) as executor:
+            for chain, creators in zip(by_chain, executor.map(lambda c: self._resolve_chain(c, by_chain[c]),
+                                                               by_chain)):
+                for address, creator in creators.items():
+                    key = (chain, address)
+                    self._remember(key, creator)
+                    resolved[key] = creator
+        return resolved
+
+    def _resolve_chain(self, chain: str, addresses: List[str]) -> Dict[str, Optional[str]]:
+        batch_size = int(self.settings["batch_size"])
+        creators = {}
+        for i in range(0, len(addresses), batch_size):
+            batch = addresses[i:i + batch_size]
+            try:
+                creators.update(self._fetch_batch(chain, batch))
+            except Exception as e:
+                HTTP_ERRORS.inc(api="explorer")
+                self.logger.error(f"Creator fetch error on {chain} for {len(batch)} contracts: {e}")
+        return creators
+
+    def _fetch_batch(self, chain: str, addresses: List[str]) -> Dict[str, Optional[str]]:
+        """One `getcontractcreation` call for up to `batch_size` contracts."""
+        RATE_LIMIT_WAIT_SECONDS.observe(self._buckets[chain].acquire(), host=urlparse(EXPLORERS[chain]).netloc)
+        params = {
+            "module": "contract",
+            "action": "getcontractcreation",
+            "contractaddresses": ",".join(addresses),
+            "apikey": API_KEYS[chain],
+        }
+        response = self.api.get(EXPLORERS[chain], params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        result = data.get("result")
+        if data.get("status") == "1" and isinstance(result, list):
+            creators = {address: None for address in addresses}
+            for item in result:
+                address = (item.get("contractAddress") or "").lower()
+                if address in creators:
+                    creators[address] = (item.get("contractCreator") or "")[:128] or None
+            return creators
+
+        # "No data found" means none of the addresses is a known contract;
+        # anything else (rate limit, invalid key...) is transient.
+        if data.get("message", "").lower().startswith("no data"):
+            return {address: None for address in addresses}
+        self.logger.warning(f"Explorer error on {chain}: {data.get('message')} - {result}")
+        return {}
+
+    def _persist(self, resolved: Dict[CreatorKey, Optional[str]]):
+        if not resolved:
+            return
+        upsert = text("""
+            INSERT INTO contract_creators (chain, contract_address, creator_address, resolved_at)
+            VALUES (:chain, :contract_address, :creator_address, :resolved_at)
+            ON CONFLICT (chain, contract_address) DO UPDATE
+            SET creator_address = EXCLUDED.creator_address,
+                resolved_at = EXCLUDED.resolved_at
+        """)
+        now = datetime.utcnow()
+        rows = [
+            {"chain": chain, "contract_address": address, "creator_address": creator, "resolved_at": now}
+            for (chain, address), creator in resolved.items()
+        ]
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(upsert, rows)
+        except Exception as e:
+            self.logger.error(f"Error persisting contract creators: {str(e)}")
@@ -3,29 +3,58 @@ import logging
 import sys
 import requests
 import pandas as pd
-from datetime import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.pool import QueuePool
 from sqlalchemy import text
-from typing import Dict, List
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import threading
 import time
-from sklearn.ensemble import IsolationForest
 from log.logging_config import setup_logging
 from db.db import get_db_config
-from binance.client import Client
-import matplotlib
-matplotlib.use('Agg')  # Required for headless environments
-import matplotlib.pyplot as plt
-from config.config import CONFIG, EXPLORERS, API_KEYS, CHAIN_IDS
+from db.bulk import upsert_pairs
+from db.snapshots import SnapshotStore
+from db.summary import ViabilitySummary
+from db.leases import ExecutorUnavailableError, ShardCoordinator
+from db.migrations import migrate
+from config.config import CONFIG, EXPLORERS, API_KEYS
+from empty_my_wallet.http_client import HttpClient
+from empty_my_wallet.ingestion import PairIngestor
+from empty_my_wallet.creator_cache import CreatorCache, UNKNOWN_CREATOR
+from empty_my_wallet.honeypot import HoneypotScreener
+from empty_my_wallet.blacklist import BlacklistIndex
+from empty_my_wallet.anomaly import AnomalyDetector, FEATURES
+from empty_my_wallet.feature_store import create_feature_store
+from empty_my_wallet.normalize import normalize_pairs
+from empty_my_wallet.scheduler import CycleScheduler
+from empty_my_wallet.symbol_index import SymbolIndex
+from empty_my_wallet.market_stream import MarketStream
+from empty_my_wallet.risk_gate import RiskGate
+from empty_my_wallet.change_detector import ChangeDetector
+from empty_my_wallet.prefilter import PreFilter
+from empty_my_wallet.archive import PayloadArchive
+from empty_my_wallet.metrics import (CYCLES, HTTP_ERRORS, HTTP_REQUEST_SECONDS, PAIRS, STAGE_SECONDS,
+                                     configure_metrics)
+
+RISK_REASONS = {
+    "bundled_supply": "Bundled supply",
+}
 
 class EmptyMyWallet:
-    def __init__(self, binance_api_key: str, binance_api_secret: str, test_mode: bool = False):
+    def __init__(self, binance_api_key: str, binance_api_secret: str, test_mode: bool = False,
+                 database_url: Optional[str] = None, session: Optional[requests.Session] = None,
+                 worker_id: Optional[str] = None, sharded: bool = False):
         self.binance_api_key = binance_api_key
         self.binance_api_secret = binance_api_secret
         self.test_mode = test_mode
         self.logger = setup_logging()
-        self.creator_cache = {}
+        # Shared HTTP session (record/replay harness) behind the pooled client used by every API
+        self.session = session
+        self.http = HttpClient(self.logger, session=session)
+        self.anomalies_history = []  # Historique des anomalies détectées
+        self.scores_history = []  # Historique des scores du modèle
+        configure_metrics(self.logger)
         
         # Log initialization mode
         if self.test_mode:
@@ -35,39 +64,96 @@ class EmptyMyWallet:
 
         # Database connection
         try:
-            db_config = get_db_config()
-            connection_string = (
-                f'postgresql+psycopg2://{db_config["user"]}:{db_config["password"]}'
-                f'@{db_config["host"]}:{db_config["port"]}/{db_config["dbname"]}'
-            )
-            
-            self.engine = create_engine(
-                connection_string,
-                poolclass=QueuePool,
-                pool_size=10,
-                max_overflow=20,
-                pool_timeout=30,
-                pool_recycle=3600,
-                connect_args={
-                    'sslmode': 'require'  # Required for Aiven PostgreSQL
-                }
-            )
+            if database_url:
+                # Local target (e.g. sqlite:///data/replay.db for offline benchmarks)
+                self.engine = create_engine(database_url)
+            else:
+                db_config = get_db_config()
+                connection_string = (
+                    f'postgresql+psycopg2://{db_config["user"]}:{db_config["password"]}'
+                    f'@{db_config["host"]}:{db_config["port"]}/{db_config["dbname"]}'
+                )
+                
+                self.engine = create_engine(
+                    connection_string,
+                    poolclass=QueuePool,
+                    pool_size=10,
+                    max_overflow=20,
+                    pool_timeout=30,
+                    pool_recycle=3600,
+                    connect_args={
+                        'sslmode': 'require'  # Required for Aiven PostgreSQL
+                    }
+                )
             self.logger.info("Database connection established successfully")
         except SQLAlchemyError as e:
             self.logger.error(f"❌ Database connection error: {e}")
             sys.exit(1)
 
+        # Mode multi-workers : leases de shards et écrivain unique des trades via PostgreSQL
+        sharding = {**CONFIG["SHARDING"], "enabled": True} if sharded else CONFIG["SHARDING"]
+        self.coordinator = ShardCoordinator(self.engine, self.logger, CONFIG["FILTERS"]["chain_whitelist"],
+                                            worker_id=worker_id, settings=sharding)
         self._init_db()
-        self.model = IsolationForest(n_estimators=100, contamination=0.01)
-        self.historical_data = pd.DataFrame()
+        self.blacklist = BlacklistIndex(self.engine, self.logger)
+        self.blacklist.sync()
+        self._seed_initial_blacklists()
+        self.creator_cache = CreatorCache(self.engine, self.logger, http=self.http)
+        self.creator_cache.warm()
+        self.anomaly_detector = AnomalyDetector(self.logger)
+        self.feature_store = create_feature_store()
+        self.ingestor = PairIngestor(self.logger, http=self.http)
+        self.prefilter = PreFilter(self.blacklist)
+        self.change_detector = ChangeDetector()
+        self.honeypot_screener = HoneypotScreener(self.logger, http=self.http)
+        token_budget = CONFIG["RISK_GATE"]["token_budget"]
+        self.risk_gate = RiskGate({
+            "bundled_supply": lambda row: self.bundled_supply_balance(
+                row['base_token_address'], row['chain'], timeout=token_budget) > 0,
+        }, self.logger)
         
-        # Initialize Binance client with test/prod mode
-        self.binance_client = self._initialize_binance_client()
+        # Initialize Binance client with test/prod mode, en arrière-plan pendant le reste de l'init ;
+        # run() l'attend avant le premier cycle et s'arrête si elle a échoué
+        self.binance_client = None
+        self.symbol_index: Optional[SymbolIndex] = None
+        self._exchange_error: Optional[Exception] = None
+        self._exchange_init = threading.Thread(target=self._init_exchange, name="exchange-init", daemon=True)
+        self._exchange_init.start()
+        self.archive = PayloadArchive(self.logger)
+        self.market_stream = MarketStream(self.logger)
+        if CONFIG["MARKET_STREAM"]["enabled"]:
+            self.market_stream.start()
+
+    def _init_exchange(self):
+        try:
+            self.binance_client = self._initialize_binance_client()
+            self.symbol_index = SymbolIndex(self.binance_client, self.logger)
+            if not self.symbol_index.refresh():
+                # Index vide : aucun trade tant qu'un rechargement n'a pas réussi
+                self.logger.warning(f"⚠️ Trading paused until the Binance symbol index loads "
+                                    f"(retry in {self.symbol_index.retry_delay():.0f}s)")
+        except Exception as e:
+            self._exchange_error = e  # Remontée au thread principal par _wait_exchange
+
+    def _wait_exchange(self):
+        """Wait for the background Binance init (only the trading path needs it)."""
+        self._exchange_init.join()
+        if self.symbol_index is None:
+            # Pas de sys.exit : appelé aussi depuis le thread du coordinateur
+            raise ExecutorUnavailableError(f"Binance client is not initialized: {self._exchange_error}")
 
     def _initialize_binance_client(self):
         """Initialize Binance client with appropriate endpoint based on mode"""
+        from binance.client import Client
+
         try:
-            client = Client(self.binance_api_key, self.binance_api_secret)
+            if self.session is not None:
+                # Route REST calls through the shared session, no startup ping
+                client = Client(self.binance_api_key, self.binance_api_secret, ping=False)
+                self.session.headers.update(client.session.headers)
+                client.session = self.session
+            else:
+                client = Client(self.binance_api_key, self.binance_api_secret)
             if self.test_mode:
                 client.API_URL = 'https://testnet.binance.vision'
                 self.logger.info("📡 Connected to Binance TestNet API")
@@ -76,107 +162,45 @@ class EmptyMyWallet:
             return client
         except Exception as e:
             self.logger.error(f"❌ Failed to initialize Binance client: {e}")
-            sys.exit(1)
+            raise
 
     def _init_db(self):
-        """Initialize database with tables for blacklists and pair data."""
-        
-        create_blacklist_table = text("""
-            CREATE TABLE IF NOT EXISTS blacklist (
-                address VARCHAR(128) PRIMARY KEY,
-                type VARCHAR(20) CHECK (type IN ('coin', 'dev')) NOT NULL,
-                reason TEXT NOT NULL,
-                listed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
-            );
-        """)
-        
-        create_blacklist_index = text("""
-            CREATE INDEX IF NOT EXISTS idx_blacklist_type ON blacklist(type);
-        """)
-        
-        create_pairs_table = text("""
-            CREATE TABLE IF NOT EXISTS pairs (
-                pair_address VARCHAR(128) PRIMARY KEY,
-                base_token_name TEXT NOT NULL,
-                base_token_address VARCHAR(128) NOT NULL,
-                quote_token_address VARCHAR(128) NOT NULL,
-                price NUMERIC CHECK (price >= 0),
-                liquidity NUMERIC CHECK (liquidity >= 0),
-                volume_24h NUMERIC CHECK (volume_24h >= 0),
-                chain TEXT NOT NULL,
-                exchange TEXT NOT NULL,
-                created_at TIMESTAMP,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                creator_address VARCHAR(128)
-            );
-        """)
-
-        with self.engine.begin() as conn:
-            try:
-                # Execute each statement separately  
-                conn.execute(create_blacklist_table)
-                conn.execute(create_blacklist_index)
-                conn.execute(create_pairs_table)
-                self.logger.info("Database tables created successfully")
-            except Exception as e:
-                self.logger.error(f"Error creating database tables: {str(e)}")
-                raise
+        """Bring the schema up to date (a single version check when already current)."""
+        try:
+            applied = migrate(self.engine, self.logger)
+            if applied:
+                self.logger.info(f"Database schema migrated ({applied} migrations)")
+        except Exception as e:
+            self.logger.error(f"Error migrating database schema: {str(e)}")
+            raise
 
-        self._seed_initial_blacklists()
+        # Les partitions de snapshots sont créées au premier append
+        self.snapshots = SnapshotStore(self.engine, self.logger)
+        self.summary = ViabilitySummary(self.engine, self.logger)
+        self.coordinator.register_shards()
 
     def _seed_initial_blacklists(self):
-        """Seed the database with initial blacklists from the config file."""
-        
-        insert_query = text("""
-            INSERT INTO blacklist (address, type, reason)
-            VALUES (:address, :type, :reason)
-            ON CONFLICT (address) DO NOTHING
-        """)
-
-        with self.engine.begin() as conn:
-            try:
-                # Insert coin blacklist
-                for address in CONFIG["FILTERS"]["coin_blacklist"]:
-                    conn.execute(insert_query, {
-                        "address": address,
-                        "type": "coin",
-                        "reason": "Predefined blacklist"
-                    })
-
-                # Insert dev blacklist
-                for address in CONFIG["FILTERS"]["dev_blacklist"]:
-                    conn.execute(insert_query, {
-                        "address": address,
-                        "type": "dev",
-                        "reason": "Predefined blacklist"
-                    })
-                    
-                self.logger.info("Initial blacklists seeded successfully")
-            except Exception as e:
-                self.logger.error(f"Error seeding blacklists: {str(e)}")
-                raise
+        """Seed the database with initial blacklists from the config file (one multi-row insert)."""
+        entries = [(address, 'coin', "Predefined blacklist") for address in CONFIG["FILTERS"]["coin_blacklist"]]
+        entries += [(address, 'dev', "Predefined blacklist") for address in CONFIG["FILTERS"]["dev_blacklist"]]
+        try:
+            # Les adresses déjà présentes dans l'index ne sont pas renvoyées en base
+            added = self.blacklist.add_many(entries)
+            if added:
+                self.logger.info(f"Initial blacklists seeded successfully ({added} new entries)")
+        except Exception as e:
+            self.logger.error(f"Error seeding blacklists: {str(e)}")
+            raise
 
     def add_to_blacklist(self, address: str, blacklist_type: str, reason: str) -> bool:
         """Add an address to the blacklist with a reason."""
-        insert_query = text("""
-            INSERT INTO blacklist (address, type, reason)
-            VALUES (:address, :type, :reason)
-            ON CONFLICT (address) DO NOTHING
-        """)
-        
-        with self.engine.begin() as conn:
-            try:
-                conn.execute(insert_query, {
-                    "address": address,
-                    "type": blacklist_type,
-                    "reason": reason
-                })
-                self.logger.info(f"Added {address} to blacklist ({blacklist_type}): {reason}")
-                return True
-            except Exception as e:
-                self.logger.error(f"Error adding to blacklist: {str(e)}")
-                return False
-            
+        try:
+            self.blacklist.add(address, blacklist_type, reason)
+            self.logger.info(f"Added {address} to blacklist ({blacklist_type}): {reason}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error adding to blacklist: {str(e)}")
+            return False
 
     def apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
         """Enhanced filtering with None handling."""
@@ -192,17 +216,9 @@ class EmptyMyWallet:
         df.loc[:, 'creator_address'] = df['creator_address'].fillna('')
         df.loc[:, 'base_token_name'] = df['base_token_name'].fillna('').str.lower()
 
-        # Get fresh blacklist data
-        with self.engine.begin() as conn:
-            coin_blacklist = pd.read_sql(
-                "SELECT address FROM blacklist WHERE type = 'coin'", 
-                conn
-            )['address'].tolist()
-            
-            dev_blacklist = pd.read_sql(
-                "SELECT address FROM blacklist WHERE type = 'dev'", 
-                conn
-            )['address'].tolist()
+        # Resident blacklist index (no database round-trip)
+        coin_blacklist = self.blacklist.addresses('coin')
+        dev_blacklist = self.blacklist.addresses('dev')
 
         # Address-based filtering
         mask = (
@@ -219,38 +235,13 @@ class EmptyMyWallet:
         return df
     
     def get_contract_creator(self, chain: str, contract_address: str) -> str:
-        """Retrieve contract creator with proper parsing"""
-        contract_address = contract_address.strip("'\"")
-        
+        """Retrieve contract creator through the two-tier creator cache"""
         chain = chain.lower()
         if chain not in EXPLORERS:
             self.logger.warning(f"Unsupported chain for contract lookup: {chain}")
-            return "Unknown"
-        
-        url = EXPLORERS[chain]
-        api_key = API_KEYS[chain]
-        params = {
-            "module": "contract",
-            "action": "getcontractcreation",
-            "contractaddresses": contract_address,
-            "apikey": api_key,
-        }
+            return UNKNOWN_CREATOR
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data and data.get("status") == "1" and isinstance(data.get("result"), list):
-                    creator = data["result"][0].get("contractCreator")
-                    return creator if creator else "Unknown"
-            
-            return "Unknown"
-        
-        except Exception as e:
-            self.logger.error(f"Creator fetch error for {contract_address}: {e}")
-            return "Unknown"
+        return self.creator_cache.get(chain, contract_address)
 
     def process_data(self, raw_data: List[Dict]) -> pd.DataFrame:
         """Vectorized data processing with address validation"""
@@ -258,43 +249,23 @@ class EmptyMyWallet:
             return pd.DataFrame()
             
         try:
-            df = pd.json_normalize(raw_data, sep='_')
-            
-            # Add address validation and trimming
-            def validate_address(addr):
-                if not isinstance(addr, str):
-                    return None
-                clean_addr = addr.strip()[:128]
-                if len(clean_addr) not in (42, 44) or not clean_addr.startswith(('0x', 'osmo')):
-                    return None
-                return clean_addr
+            # Extraction directe des colonnes + validation vectorisée des adresses
+            processed = normalize_pairs(raw_data)
             
-            # Column renaming and type conversion
-            processed = pd.DataFrame({
-                'pair_address': df['pairAddress'].apply(validate_address),
-                'base_token_name': df['baseToken_name'],
-                'base_token_address': df['baseToken_address'].apply(validate_address),
-                'quote_token_address': df['quoteToken_address'].apply(validate_address),
-                'price': pd.to_numeric(df['priceUsd'], errors='coerce'),
-                'liquidity': pd.to_numeric(df['liquidity_usd'], errors='coerce'),
-                'volume_24h': pd.to_numeric(df['volume_h24'], errors='coerce'),
-                'chain': df['chainId'],
-                'exchange': df['dexId'],
-                'created_at': pd.to_datetime(df['pairCreatedAt'], unit='ms'),
-                'timestamp': datetime.utcnow()
-            })
-            
-            # Add creator address with validation
-            processed['creator_address'] = processed.apply(
-                lambda row: (self.get_contract_creator(row['chain'], row['base_token_address'])[:128] 
-                            if pd.notnull(row['base_token_address']) else None), 
-                axis=1
-            )
+            # Add creator address (cached, misses resolved in batches per chain)
+            has_address = processed['base_token_address'].notnull()
+            lookups = list(zip(processed.loc[has_address, 'chain'], processed.loc[has_address, 'base_token_address']))
+            creators = self.creator_cache.get_many(lookups)
+            processed['creator_address'] = [
+                creators.get(CreatorCache.key(chain, address), UNKNOWN_CREATOR) if present else None
+                for chain, address, present in zip(processed['chain'], processed['base_token_address'], has_address)
+            ]
             
             return self.apply_filters(processed.dropna())
             
         except Exception as e:
             self.logger.error(f"Error processing data: {str(e)}")
+            self.change_detector.rollback()  # Paires rejouées au prochain cycle
             return pd.DataFrame()
         
     # TODO : Fix les calls API (https://api.rugcheck.xyz/swagger/index.html)
@@ -350,30 +321,12 @@ class EmptyMyWallet:
     #         return True
 
     def check_honeypot(self, chain, address):
-        if chain.lower() not in EXPLORERS:
-            return {'honeypot': False, 'error': 'Unsupported chain'}
-        
-        params = {
-            'address': address,
-            'chainId': CHAIN_IDS[chain.lower()]
-        }
-        
-        try:
-            response = requests.get(
-                "https://api.honeypot.is/v2/IsHoneypot",
-                params=params,
-                timeout=10
-            )
-            return response.json()
-        except Exception as e:
-            self.logger.error(f"Honeypot check error: {str(e)}")
-            return {'error': str(e)}
+        return self.honeypot_screener.check(chain, address)
 
-    def check_bundled_supply(self, contract_address: str, chain: str) -> bool:
-        """Check if the token supply is bundled for a given blockchain."""
+    def bundled_supply_balance(self, contract_address: str, chain: str, timeout: Optional[float] = None) -> int:
+        """Token balance held by the dead address (raises if it cannot be checked)."""
         if chain not in EXPLORERS or chain not in API_KEYS or not API_KEYS[chain]:
-            print(f"Unsupported or missing API key for chain: {chain}")
-            return False
+            raise ValueError(f"Unsupported or missing API key for chain: {chain}")
 
         url = (
             f"{EXPLORERS[chain]}?module=account&action=tokenbalance"
@@ -383,12 +336,19 @@ class EmptyMyWallet:
         )
 
         try:
-            response = requests.get(url)
+            response = self.http.api("explorer_balance").get(url, timeout=timeout)
             response.raise_for_status()  # Lève une exception si le statut HTTP est >= 400
-            data = response.json()
-            return int(data.get("result", 0)) > 0  # Vérifie si un solde est présent
-        except requests.exceptions.RequestException as e:
-            print(f"Error checking bundled supply on {chain}: {e}")
+            return int(response.json().get("result", 0))
+        except (requests.exceptions.RequestException, ValueError):
+            HTTP_ERRORS.inc(api="explorer_balance")
+            raise
+
+    def check_bundled_supply(self, contract_address: str, chain: str) -> bool:
+        """Check if the token supply is bundled for a given blockchain."""
+        try:
+            return self.bundled_supply_balance(contract_address, chain) > 0  # Vérifie si un solde est présent
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.error(f"Error checking bundled supply on {chain}: {e}")
             return False
 
     def detect_anomalies(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -398,52 +358,108 @@ class EmptyMyWallet:
             logging.warning("Aucune donnée à analyser pour les anomalies.")
             return df
 
-        features = ["price", "liquidity", "volume_24h"]
-
         # Remplacement des valeurs NaN par la médiane pour éviter les erreurs du modèle
-        df[features] = df[features].fillna(df[features].median())
+        df[FEATURES] = df[FEATURES].fillna(df[FEATURES].median())
 
-        # Détection des anomalies avec Isolation Forest
-        predictions = self.model.fit_predict(df[features])
+        # Inférence seule avec le modèle déjà entraîné (ré-entraînement en arrière-plan)
+        is_anomaly = self.anomaly_detector.predict(df)
 
-        # -1 = anomalie, on les filtre
-        df_anomalies = df.loc[predictions == -1]
+        df_anomalies = df.loc[is_anomaly]
 
         logging.info(f"Nombre d'anomalies détectées : {len(df_anomalies)}")
         
         return df_anomalies
 
     def analyze_market_events(self, anomalous_data: pd.DataFrame):
-        """Analyze market events and log suspicious activity."""
-        for _, row in anomalous_data.iterrows():
-            # Check RugCheck.xyz and bundled supply
-            # if not self.check_rugcheck(row['base_token_address']):
-            #     self.add_to_blacklist(row['base_token_address'], 'coin', 'Failed RugCheck')
-            #     continue
-            if self.check_bundled_supply(row['base_token_address']):
-                self.add_to_blacklist(row['base_token_address'], 'coin', 'Bundled supply')
-                self.add_to_blacklist(row['creator_address'], 'dev', 'Bundled supply')
-                continue
-
-            # If all checks pass, place a trade
-            self.place_trade(row)
+        """Run the pre-trade risk gate on the anomalies, blacklist flagged tokens and trade the rest."""
+        verdicts = self.risk_gate.evaluate(anomalous_data)
+
+        # Check RugCheck.xyz and bundled supply (en parallèle, budget de latence par token)
+        entries = []
+        for verdict in verdicts:
+            row = anomalous_data.loc[verdict.index]
+            if verdict.flagged:
+                reason = ", ".join(RISK_REASONS.get(name, name) for name in verdict.flagged)
+                entries.append((row['base_token_address'], 'coin', reason))
+                if row['creator_address'] not in (None, UNKNOWN_CREATOR):
+                    entries.append((row['creator_address'], 'dev', reason))
+            elif verdict.failed:
+                self.logger.warning(f"🚧 Risk checks incomplete for {row['base_token_address']}: "
+                                    f"{'; '.join(verdict.failed)}")
+
+        # Une seule requête pour toutes les entrées de la blacklist
+        if entries:
+            try:
+                added = self.blacklist.add_many(entries)
+                self.logger.info(f"Added {added} addresses to blacklist")
+            except Exception as e:
+                self.logger.error(f"Error adding to blacklist: {str(e)}")
+
+        # If all checks pass, place a trade (queued for the leader when sharded)
+        approved = [verdict.index for verdict in verdicts if verdict.approved]
+        if self.coordinator.enabled:
+            queued = self.coordinator.enqueue_trades(anomalous_data.loc[approved])
+            if queued:
+                self.logger.info(f"📨 Queued {queued} trades for the leader worker")
+            return
+        for index in approved:
+            self.place_trade(anomalous_data.loc[index])
+
+    def _execute_intents(self, intents: List[Dict]) -> List[Optional[Dict]]:
+        """Leader side of the trade queue: place the trades queued by every worker."""
+        rows = [pd.Series({**intent, 'price': float(intent['price']) if intent['price'] is not None else None})
+                for intent in intents]
+        self._wait_exchange()
+        if self.market_stream.enabled:
+            symbols = set()
+            for row in rows:
+                rule = self.symbol_index.route(row['base_token_address'], row['base_token_name'])
+                if rule is not None:
+                    symbols.add(rule.symbol)
+            self.market_stream.watch(symbols, extend=True)
+        return [self.place_trade(row) for row in rows]
 
     def place_trade(self, row: pd.Series):
         """Place a trade with test mode awareness"""
-        symbol = row['base_token_name'] + 'USDT'
-        quantity = 10  # Adjust based on your budget
+        self._wait_exchange()
+        # Rejet local des tokens non listés / ordres hors filtres (pas d'aller-retour Binance)
+        rule = self.symbol_index.route(row.get('base_token_address'), row.get('base_token_name'))
+        if rule is None:
+            self.logger.info(f"⏭️ No {self.symbol_index.quote_asset} market on Binance for {row['base_token_name']}")
+            return None
+        symbol = rule.symbol
+        price = row.get('price')
+
+        # Prix Binance en temps réel (bookTicker) : contrôle du spread avant l'ordre
+        if self.market_stream.enabled:
+            stream_settings = CONFIG["MARKET_STREAM"]
+            quote = self.market_stream.wait_quote(symbol, stream_settings["quote_timeout"],
+                                                  stream_settings["max_quote_age"])
+            if quote is None:
+                self.logger.info(f"⏭️ No fresh Binance quote for {symbol}, order skipped")
+                return None
+            if quote.spread_bps > stream_settings["max_spread_bps"]:
+                self.logger.info(f"⏭️ Spread too wide on {symbol} ({quote.spread_bps:.0f} bps), order skipped")
+                return None
+            price = quote.ask
+
+        quantity = self.symbol_index.shape_quantity(rule, CONFIG["TRADING"]["quantity"], price)
+        if quantity is None:
+            self.logger.info(f"⏭️ Order for {symbol} rejected locally (LOT_SIZE / MIN_NOTIONAL)")
+            return None
 
         try:
             if self.test_mode:
                 self.logger.info(f"🔬 TEST MODE - Simulated trade for {symbol}: {quantity} units")
                 return {"status": "success", "message": "Test trade simulated"}
             
-            order = self.binance_client.create_order(
-                symbol=symbol,
-                side='BUY',
-                type='MARKET',
-                quantity=quantity
-            )
+            with HTTP_REQUEST_SECONDS.time(api="binance"):
+                order = self.binance_client.create_order(
+                    symbol=symbol,
+                    side='BUY',
+                    type='MARKET',
+                    quantity=f"{quantity:f}"
+                )
             self.logger.info(f"✅ Trade executed: {symbol}, Quantity: {quantity}")
             return order
             
@@ -451,42 +467,31 @@ class EmptyMyWallet:
             self.logger.error(f"❌ Trade failed for {symbol}: {str(e)}")
             return None
         
-    def fetch_pair_data(self) -> List[Dict]:
-        """Fetch trading pair data from DexScreener API using the /search endpoint."""
-        base_url = "https://api.dexscreener.com/latest/dex/search"
-        all_pairs = []
+    def _watch_candidates(self, df: pd.DataFrame):
+        """Stream live quotes for the screened pairs that have a Binance market."""
+        if not self.market_stream.enabled:
+            return
+        self._wait_exchange()
+        symbols = set()
+        for address, name in zip(df['base_token_address'], df['base_token_name']):
+            rule = self.symbol_index.route(address, name)
+            if rule is not None:
+                symbols.add(rule.symbol)
+        self.market_stream.watch(symbols)
 
+    def fetch_pair_data(self) -> List[Dict]:
+        """Fetch trading pair data from DexScreener for all whitelisted chains concurrently."""
         try:
-            for chain in CONFIG["FILTERS"]["chain_whitelist"]:
-                self.logger.info(f"Fetching pairs for chain: {chain}")
-
-                query = chain  #  A simple search for the chain name.  Improve as needed.
-                params = {'q': query, 'limit': 500} # Added a limit, Dexscreener defaults to 25
-
-                response = requests.get(
-                    base_url,
-                    params=params,
-                    headers={'Accept': 'application/json'},
-                    timeout=10
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    # Dexscreener API returns the pairs inside the "pairs" key
-                    pairs = data.get('pairs', [])  # Make sure to access the 'pairs' key.
-                    all_pairs.extend(pairs)
-                    self.logger.info(f"Found {len(pairs)} pairs for {chain}") # Log how many we found
-                elif response.status_code == 429:
-                    self.logger.warning(f"Rate limit hit for {chain}. Waiting before retry...")
-                    time.sleep(60)
-                    continue # Retry the same chain after waiting
-                else:
-                    self.logger.error(f"Error fetching {chain} pairs: Status {response.status_code} - {response.text}") # Include response text for debugging
-                    continue # Move onto the next chain
-
-                time.sleep(1)  # Rate limiting
-                
-            self.logger.info(f"Total pairs fetched: {len(all_pairs)}")
+            # Pré-filtrage au fil de l'eau, avant toute requête coûteuse
+            pairs = self.coordinator.select(self.ingestor.iter_pairs(self.coordinator.owned_chains()))
+            raw_pairs = []
+            if self.archive.enabled:
+                pairs = self._tap(pairs, raw_pairs)  # Archive du payload complet, avant le pré-filtre
+            all_pairs = list(self.prefilter.filter(pairs))
+            self.archive.append_raw(raw_pairs)
+            drops = ", ".join(f"{rule}: {count}" for rule, count in self.prefilter.drops.items())
+            self.logger.info(f"Total pairs fetched: {self.prefilter.seen}, "
+                             f"{len(all_pairs)} kept after pre-filter ({drops})")
             return all_pairs
             
         except requests.RequestException as e:
@@ -496,38 +501,181 @@ class EmptyMyWallet:
             self.logger.error(f"Unexpected error in fetch_pair_data: {str(e)}")
             return []
 
-    def _filter_minimum_pairs(self, pairs: List[Dict]) -> List[Dict]:
-        """Filter pairs based on minimum requirements"""
-        filtered_pairs = []
-        
+    @staticmethod
+    def _tap(pairs: Iterable[Dict], sink: List[Dict]) -> Iterator[Dict]:
         for pair in pairs:
-            # Basic validation of required fields
-            required_fields = ['pairAddress', 'baseToken', 'quoteToken', 
-                            'priceUsd', 'liquidity', 'volume']
-                            
-            if all(field in pair for field in required_fields):
-                # Check minimum liquidity
-                try:
-                    liquidity = float(pair.get('liquidity', 0))
-                    if liquidity >= CONFIG["FILTERS"]["min_liquidity"]:
-                        filtered_pairs.append(pair)
-                except (ValueError, TypeError):
-                    continue
-                    
-        return filtered_pairs
-    
+            sink.append(pair)
+            yield pair
+
     def _refresh_blacklists(self):
-        """Refresh blacklists using proper SQLAlchemy text() wrapper"""
+        """Expire old blacklist entries and sync the in-memory index incrementally"""
         try:
-            with self.engine.begin() as conn:
-                conn.execute(text("""
-                    DELETE FROM blacklist 
-                    WHERE listed_at < NOW() - INTERVAL '7 days'
-                """))
+            if self.engine.dialect.name == 'postgresql':
+                cutoff = "NOW() - INTERVAL '7 days'"
+            else:
+                cutoff = "datetime('now', '-7 days')"  # SQLite (offline replay)
+            # Seul le leader purge ; les autres workers voient la purge au prochain rechargement complet
+            if self.coordinator.is_leader:
+                with self.engine.begin() as conn:
+                    expired = conn.execute(text(f"""
+                        DELETE FROM blacklist 
+                        WHERE listed_at < {cutoff}
+                        RETURNING address
+                    """)).scalars().all()
+                self.blacklist.discard(expired)
+            self.blacklist.sync()
             self.logger.info("Blacklists refreshed successfully")
         except Exception as e:
             self.logger.error(f"Error refreshing blacklists: {str(e)}")
 
+    @contextmanager
+    def _stage(self, name: str, timings: Dict[str, float]):
+        """Time a pipeline stage into `timings` (seconds) and the stage histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = time.perf_counter() - start
+            STAGE_SECONDS.observe(timings[name], stage=name)
+
+    def _history_rows(self, raw_pairs: List[Dict]) -> pd.DataFrame:
+        """Snapshot/feature rows of the unchanged pairs (fresh metrics, no lookups)."""
+        if not raw_pairs:
+            return pd.DataFrame()
+        rows = normalize_pairs(raw_pairs)
+        return rows[rows['pair_address'].notnull()]
+
+    def fetch_stage(self) -> Tuple[List[Dict], float]:
+        """Fetch step of a cycle, returning the raw pairs and its duration."""
+        timings = {}
+        with self._stage("fetch", timings):
+            raw_data = self.fetch_pair_data()
+        return raw_data, timings["fetch"]
+
+    def run_cycle(self, prefetched: Optional[Tuple[List[Dict], float]] = None) -> Dict:
+        """Run one fetch → process → honeypot → detect → store → trade cycle.
+
+        `prefetched` is the output of `fetch_stage` when the fetch already
+        ran ahead (pipelined scheduler). Returns the duration of each stage
+        (seconds) and the pair counts.
+        """
+        timings = {}
+        stats = {"stages": timings, "pairs_fetched": 0, "pairs_skipped": 0, "pairs_processed": 0}
+        cycle_start = time.perf_counter()
+
+        # Récupération des données
+        raw_data, timings["fetch"] = prefetched if prefetched is not None else self.fetch_stage()
+        if prefetched is not None:
+            cycle_start -= timings["fetch"]
+        stats["pairs_fetched"] = len(raw_data)
+        PAIRS.inc(len(raw_data), step="fetched")
+        self.logger.info(f"📊 Fetched {len(raw_data)} pairs")
+
+        # Seules les paires nouvelles ou qui ont bougé repassent dans le pipeline
+        with self._stage("changes", timings):
+            raw_data = self.change_detector.select(raw_data)
+            # Les paires inchangées gardent leur ligne d'historique (snapshots, fenêtre du modèle)
+            unchanged = self._history_rows(self.change_detector.last_unchanged)
+        stats["pairs_skipped"] = self.change_detector.last_skipped
+        PAIRS.inc(self.change_detector.last_skipped, step="unchanged")
+        self.logger.info(f"♻️ Skipped {self.change_detector.last_skipped} unchanged pairs "
+                         f"({self.change_detector.skip_ratio:.0%})")
+
+        # Traitement des données
+        with self._stage("process", timings):
+            processed_data = self.process_data(raw_data)
+        stats["pairs_processed"] = len(processed_data)
+        PAIRS.inc(len(processed_data), step="processed")
+        self.logger.info(f"✨ Processed {len(processed_data)} valid pairs")
+
+        # Archive Parquet des paires normalisées du cycle (le payload brut est archivé au fetch)
+        with self._stage("archive", timings):
+            self.archive.append_pairs(processed_data)
+
+        if not processed_data.empty:
+            # Debug: Afficher les colonnes et échantillon des données
+            self.logger.debug(f"Columns in processed_data: {processed_data.columns.tolist()}")
+            self.logger.debug("Sample of base_token_addresses:")
+            self.logger.debug(processed_data["base_token_address"].head())
+
+            # Vérification Honeypot (parallèle, avec cache des verdicts)
+            try:
+                with self._stage("honeypot", timings):
+                    processed_data = self.honeypot_screener.screen(processed_data)
+                self.logger.info(f"🛡️ Filtered {len(processed_data)} pairs after Honeypot check")
+            except Exception as e:
+                self.logger.error(f"Honeypot check error: {str(e)}")
+                timings["total"] = time.perf_counter() - cycle_start
+                return stats
+
+            # Détection des anomalies
+            with self._stage("detect", timings):
+                anomalies = self.detect_anomalies(processed_data)
+            self.logger.info(f"🔍 Detected {len(anomalies)} anomalies")
+            self._watch_candidates(processed_data)
+            PAIRS.inc(len(processed_data), step="screened")
+            PAIRS.inc(len(anomalies), step="anomalies")
+
+            # Stockage des données
+            history = processed_data
+            if not unchanged.empty:
+                history = pd.concat([processed_data, unchanged], ignore_index=True)
+            with self._stage("store", timings):
+                upsert_pairs(self.engine, processed_data)
+                self.snapshots.append(history)
+                if self.coordinator.is_leader:
+                    self.summary.maybe_refresh()  # En arrière-plan, au plus une fois par refresh_interval
+            self.logger.info("💾 Data stored in database")
+            # Empreintes enregistrées seulement pour les paires stockées : filtrées,
+            # non résolues ou en échec, elles repassent au prochain cycle
+            self.change_detector.commit(processed_data['pair_address'])
+
+            # Analyse et trading
+            with self._stage("trade", timings):
+                self.analyze_market_events(anomalies)
+
+            with self._stage("model", timings):
+                # Mise à jour de la fenêtre historique (ring buffer)
+                self.feature_store.append(history)
+                self.feature_store.flush()
+
+                # Re-training du modèle en arrière-plan sur la fenêtre glissante
+                if self.anomaly_detector.schedule_refit(self.feature_store.features()):
+                    self.logger.info("🤖 Re-training the model in background...")
+                if self.anomaly_detector.last_mean_score is not None:
+                    self.scores_history.append(self.anomaly_detector.last_mean_score)
+
+            # Enregistrement des anomalies
+            self.anomalies_history.append(len(anomalies))
+
+            # Sauvegarde périodique des graphiques (un seul fichier, écrit par le leader)
+            with self._stage("plots", timings):
+                try:
+                    if self.coordinator.is_leader:
+                        self.save_training_plots(self.anomalies_history, self.scores_history)
+                except Exception as e:
+                    self.logger.error(f"❌ Error saving periodic graphs: {str(e)}")
+        else:
+            self.change_detector.rollback()  # Aucune paire stockée : toutes repassent au prochain cycle
+            with self._stage("store", timings):
+                self.snapshots.append(unchanged)
+            with self._stage("model", timings):
+                self.feature_store.append(unchanged)
+                self.feature_store.flush()
+
+        # Rafraîchissement des blacklists et rétention de l'historique
+        with self._stage("maintenance", timings):
+            self._refresh_blacklists()
+            if self.coordinator.is_leader:
+                self.snapshots.apply_retention()
+            if self.symbol_index is not None:
+                self.symbol_index.maybe_refresh()
+
+        timings["total"] = time.perf_counter() - cycle_start
+        STAGE_SECONDS.observe(timings["total"], stage="total")
+        CYCLES.inc()
+        return stats
+
     def run(self):
         """Enhanced main loop with saved plots."""
         import signal
@@ -535,9 +683,14 @@ class EmptyMyWallet:
         def signal_handler(signum, frame):
             """Gestionnaire de signal pour sauvegarder les graphiques avant de quitter"""
             self.logger.info("🛑 Arrêt du programme détecté, sauvegarde des graphiques...")
+            self.coordinator.stop()
+            self.archive.close()
+            # Arrêt des pools de workers : checks en attente et re-training annulés
+            self.honeypot_screener.shutdown()
+            self.risk_gate.shutdown()
+            self.anomaly_detector.shutdown()
             try:
-                if 'anomalies_history' in locals() and 'scores_history' in locals():
-                    self.save_training_plots(anomalies_history, scores_history)
+                self.save_training_plots(self.anomalies_history, self.scores_history)
                 self.logger.info("✅ Graphiques sauvegardés avec succès")
             except Exception as e:
                 self.logger.error(f"❌ Erreur lors de la sauvegarde finale: {str(e)}")
@@ -549,94 +702,47 @@ class EmptyMyWallet:
 
         self.logger.info("🚀 Starting DexScreener Bot")
         self.logger.info(f"Mode: {'TEST' if self.test_mode else 'PRODUCTION'}")
+        # Comme avant l'init en arrière-plan : pas de cycle sans client Binance
+        try:
+            self._wait_exchange()
+        except ExecutorUnavailableError as e:
+            self.logger.error(f"❌ {str(e)}, exiting")
+            sys.exit(1)
 
-        anomalies_history = []  # Historique des anomalies détectées
-        scores_history = []  # Historique des scores du modèle
-
-        while True:
-            try:
-                self.logger.info("🔄 Starting new analysis cycle")
-
-                # Récupération des données
-                raw_data = self.fetch_pair_data()
-                self.logger.info(f"📊 Fetched {len(raw_data)} pairs")
-
-                # Traitement des données
-                processed_data = self.process_data(raw_data)
-                self.logger.info(f"✨ Processed {len(processed_data)} valid pairs")
-
-                if not processed_data.empty:
-                    # Debug: Afficher les colonnes et échantillon des données
-                    self.logger.debug(f"Columns in processed_data: {processed_data.columns.tolist()}")
-                    self.logger.debug("Sample of base_token_addresses:")
-                    self.logger.debug(processed_data["base_token_address"].head())
-
-                    # Vérification Honeypot avec gestion d'erreur détaillée
-                    try:
-                        honeypot_results = []
-                        for _, row in processed_data.iterrows():
-                            chain = row['chain']
-                            address = row['base_token_address']
-                            
-                            result = self.check_honeypot(chain, address)
-                            
-                            # Check if the result indicates a honeypot
-                            is_honeypot = result.get('isHoneypot', True)  # Default to True if key is missing
-                            honeypot_results.append(is_honeypot)
-                        
-                        # Filter out honeypots
-                        processed_data = processed_data[~pd.Series(honeypot_results, index=processed_data.index)]
-                        self.logger.info(f"🛡️ Filtered {len(processed_data)} pairs after Honeypot check")
-                    except Exception as e:
-                        self.logger.error(f"Honeypot check error: {str(e)}")
-                        continue
-
-                    # Détection des anomalies
-                    anomalies = self.detect_anomalies(processed_data)
-                    self.logger.info(f"🔍 Detected {len(anomalies)} anomalies")
-
-                    # Stockage des données
-                    processed_data.to_sql('pairs', self.engine, if_exists='append', index=False)
-                    self.logger.info("💾 Data stored in database")
-
-                    # Analyse et trading
-                    self.analyze_market_events(anomalies)
-
-                    # Mise à jour des données historiques
-                    self.historical_data = pd.concat([self.historical_data, processed_data]).tail(100000)
-
-                    # Re-training du modèle si suffisamment de données
-                    if len(self.historical_data) >= 100_000:
-                        self.logger.info("🤖 Re-training the model...")
-                        self.model.fit(self.historical_data[["price", "liquidity", "volume_24h"]])
-                        scores = self.model.decision_function(self.historical_data[["price", "liquidity", "volume_24h"]])
-                        scores_history.append(scores.mean())
-
-                    # Enregistrement des anomalies
-                    anomalies_history.append(len(anomalies))
-
-                    # Sauvegarde périodique des graphiques
-                    try:
-                        self.save_training_plots(anomalies_history, scores_history)
-                    except Exception as e:
-                        self.logger.error(f"❌ Error saving periodic graphs: {str(e)}")
-
-                # Rafraîchissement des blacklists
-                self._refresh_blacklists()
-                self.logger.info("😴 Waiting for next cycle...")
-                time.sleep(60)
-
-            except Exception as e:
-                self.logger.error(f"❌ Runtime error: {str(e)}")
-                import traceback
-                self.logger.error(f"Traceback: {traceback.format_exc()}")
-                time.sleep(60)
+        if self.coordinator.enabled:
+            self.logger.info(f"🧩 Sharded worker {self.coordinator.worker_id} ({self.coordinator.mode} mode)")
+            if self.coordinator.mode == 'hash':
+                self.logger.warning("⚠️ Hash mode: every worker fetches every chain, the cadence is "
+                                    "stretched by the worker count to stay within the API budget")
+        self.coordinator.start(self._execute_intents)
+
+        def process(prefetched):
+            self.logger.info("🔄 Starting new analysis cycle")
+            stats = self.run_cycle(prefetched)
+            self.logger.info(f"😴 Cycle done in {stats['stages']['total']:.1f}s "
+                             f"(cadence: every {scheduler.cadence.interval:.0f}s)")
+
+        def budget():
+            # Appels par paire (explorers, honeypot) inclus : ils suivent aussi la cadence.
+            # En mode hash, les mêmes requêtes DexScreener partent de chaque worker : budget partagé
+            requests_sent = self.http.take_request_counts()
+            requests_sent["dexscreener"] = self.ingestor.last_requests * self.coordinator.fetch_copies
+            return requests_sent, self.ingestor.last_rate_limited
+
+        # Le cycle N+1 est récupéré pendant que le cycle N est traité.
+        scheduler = CycleScheduler(self.fetch_stage, process, self.logger, budget=budget)
+        scheduler.run_forever()
 
     def save_training_plots(self, anomalies_history, scores_history):
         """Méthode séparée pour sauvegarder les graphiques d'entraînement"""
         if not anomalies_history:  # Si pas de données, ne rien faire
             return
 
+        # Import différé : matplotlib n'est chargé qu'à la première sauvegarde
+        import matplotlib
+        matplotlib.use('Agg')  # Required for headless environments
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(1, 2, figsize=(15, 5))
         fig.suptitle("Modèle IA - Évolution de l'Entraînement")
         
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.config import CONFIG
+from empty_my_wallet.anomaly import FEATURES
+
+CATEGORICAL_COLUMNS = ["chain", "exchange"]
+
+
+class FeatureRingBuffer:
+    """Fixed-capacity columnar window of the last `capacity` pairs.
+
+    Features are float64, timestamps int64 (ns) and chain/exchange interned
+    int32 codes. Every row is written twice (at `i` and `i + capacity`), so
+    the window is always one contiguous slice and `features()` is a
+    zero-copy view that can be fed to `IsolationForest.fit` as is. Appends
+    are O(batch).
+
+    With `path`, the arrays are memory-mapped `.npy` files plus a small JSON
+    header, so the window survives restarts.
+    """
+
+    def __init__(self, capacity: int, path: Optional[str] = None,
+                 features: Sequence[str] = FEATURES, categoricals: Sequence[str] = CATEGORICAL_COLUMNS):
+        self.capacity = int(capacity)
+        self.path = path
+        self.feature_names = list(features)
+        self.categorical_names = list(categoricals)
+        self.categories: Dict[str, List[str]] = {name: [] for name in self.categorical_names}
+        self._codes_by_value: Dict[str, Dict[str, int]] = {name: {} for name in self.categorical_names}
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        shapes = {
+            "features": ((2 * self.capacity, len(self.feature_names)), np.float64),
+            "timestamps": ((2 * self.capacity,), np.int64),
+            "codes": ((2 * self.capacity, len(self.categorical_names)), np.int32),
+        }
+        if path:
+            os.makedirs(path, exist_ok=True)
+            arrays = self._open_memmaps(shapes)
+        else:
+            arrays = {name: np.zeros(shape, dtype) for name, (shape, dtype) in shapes.items()}
+        self._features = arrays["features"]
+        self._timestamps = arrays["timestamps"]
+        self._codes = arrays["codes"]
+
+    def _header_path(self) -> str:
+        return os.path.join(self.path, "header.json")
+
+    def _open_memmaps(self, shapes) -> Dict[str, np.ndarray]:
+        header = None
+        if os.path.exists(self._header_path()):
+            with open(self._header_path()) as f:
+                header = json.load(f)
+            if (header.get("capacity") != self.capacity or header.get("features") != self.feature_names
+                    or header.get("categoricals") != self.categorical_names):
+                header = None  # Layout changed: start from an empty window
+
+        arrays = {}
+        for name, (shape, dtype) in shapes.items():
+            file = os.path.join(self.path, f"{name}.npy")
+            mode = "r+" if header is not None and os.path.exists(file) else "w+"
+            arrays[name] = np.lib.format.open_memmap(file, mode=mode, dtype=dtype, shape=shape)
+
+        if header is not None:
+            self._head = header["head"]
+            self._size = header["size"]
+            for name, values in header["categories"].items():
+                self.categories[name] = list(values)
+                self._codes_by_value[name] = {value: code for code, value in enumerate(values)}
+        return arrays
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _intern(self, name: str, values) -> np.ndarray:
+        codes_by_value = self._codes_by_value[name]
+        categories = self.categories[name]
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).fillna(""))
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques):
+            code = codes_by_value.get(value)
+            if code is None:
+                code = codes_by_value[value] = len(categories)
+                categories.append(value)
+            mapping[i] = code
+        return mapping[codes]
+
+    def append(self, df: pd.DataFrame):
+        """Append a batch, overwriting the oldest rows once full."""
+        if df.empty:
+            return
+        df = df.tail(self.capacity)
+        n = len(df)
+        features = df[self.feature_names].to_numpy(dtype=np.float64)
+        timestamps = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+        with self._lock:
+            codes = np.column_stack([self._intern(name, df[name].to_numpy())
+                                     for name in self.categorical_names])
+            first = min(n, self.capacity - self._head)
+            for offset, start, stop in ((0, self._head, self._head + first), (first, 0, n - first)):
+                if stop <= start:
+                    continue
+                rows = slice(offset, offset + stop - start)
+                for base in (start, start + self.capacity):
+                    self._features[base:base + stop - start] = features[rows]
+                    self._timestamps[base:base + stop - start] = timestamps[rows]
+                    self._codes[base:base + stop - start] = codes[rows]
+            self._head = (self._head + n) % self.capacity
+            self._size = min(self.capacity, self._size + n)
+
+    def _window(self) -> slice:
+        start = (self._head - self._size) % self.capacity
+        return slice(start, start + self._size)
+
+    def features(self) -> np.ndarray:
+        """Zero-copy (rows, features) view of the window, oldest row first."""
+        return self._features[self._window()]
+
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[self._window()].view("datetime64[ns]")
+
+    def codes(self, name: str) -> np.ndarray:
+        return self._codes[self._window(), self.categorical_names.index(name)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the window as a DataFrame (copies; for analysis only)."""
+        frame = pd.DataFrame(self.features(), columns=self.feature_names)
+        frame["timestamp"] = self.timestamps()
+        for name in self.categorical_names:
+            frame[name] = pd.Categorical.from_codes(self.codes(name), categories=self.categories[name])
+        return frame
+
+    def flush(self):
+        """Persist the memory-mapped window and its header (no-op in memory)."""
+        if not self.path:
+            return
+        with self._lock:
+            for array in (self._features, self._timestamps, self._codes):
+                array.flush()
+            header = {
+                "capacity": self.capacity,
+                "features": self.feature_names,
+                "categoricals": self.categorical_names,
+                "head": self._head,
+                "size": self._size,
+                "categories": self.categories,
+            }
+        tmp_path = self._header_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(header, f)
+        os.replace(tmp_path, self._header_path())
+
+
+def create_feature_store(settings: Optional[Dict] = None) -> FeatureRingBuffer:
+    settings = settings or CONFIG["FEATURE_STORE"]
+    return FeatureRingBuffer(settings["capacity"], path=settings.get("path"))
@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from config.config import CONFIG, CHAIN_IDS
+from empty_my_wallet.creator_cache import LRUCache
+from empty_my_wallet.http_client import HttpClient
+from empty_my_wallet.metrics import HTTP_ERRORS
+
+VerdictKey = Tuple[str, str]
+
+
+class HoneypotScreener:
+    """Honeypot screening stage backed by honeypot.is.
+
+    Checks run on a bounded worker pool. Verdicts are cached per
+    (chain, token address): honeypots for `positive_ttl` seconds, clean
+    tokens for `negative_ttl` seconds. A token already being checked is
+    not requested twice; later callers wait on the pending check. Failed
+    checks are not cached: the token is dropped (fail closed) and listed in
+    `last_unresolved` so the caller can retry it next cycle. Tokens on a
+    chain honeypot.is does not cover are dropped without a request.
+    """
+
+    def __init__(self, logger, http: Optional[HttpClient] = None,
+                 settings: Optional[Dict] = None):
+        self.logger = logger
+        self.settings = settings or CONFIG["HONEYPOT"]
+        self.api_url = self.settings["api_url"]
+        max_workers = int(self.settings["max_workers"])
+        self.api = (http or HttpClient(logger)).api("honeypot")
+
+        self.verdicts = LRUCache(int(self.settings["max_size"]), name="honeypot")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="honeypot")
+        self._inflight: Dict[VerdictKey, Future] = {}
+        self._lock = threading.Lock()
+        self.last_unresolved: Set[VerdictKey] = set()
+        self._unsupported_logged: Set[str] = set()
+
+    @staticmethod
+    def supports(chain: str) -> bool:
+        return chain.lower() in CHAIN_IDS
+
+    def check(self, chain: str, address: str) -> Dict:
+        """Raw honeypot.is response for a token (uncached)."""
+        if not self.supports(chain):
+            return {'honeypot': False, 'error': 'Unsupported chain'}
+
+        params = {
+            'address': address,
+            'chainId': CHAIN_IDS[chain.lower()]
+        }
+
+        try:
+            response = self.api.get(self.api_url, params=params)
+            return response.json()
+        except Exception as e:
+            HTTP_ERRORS.inc(api="honeypot")
+            self.logger.error(f"Honeypot check error: {str(e)}")
+            return {'error': str(e)}
+
+    def _resolve(self, key: VerdictKey) -> Optional[bool]:
+        chain, address = key
+        try:
+            result = self.check(chain, address)
+            if 'error' in result:
+                return None  # Pas de verdict (non mis en cache)
+            # Default to True (honeypot) if the key is missing
+            is_honeypot = bool(result.get('isHoneypot', True))
+            ttl = self.settings["positive_ttl"] if is_honeypot else self.settings["negative_ttl"]
+            self.verdicts.set(key, is_honeypot, ttl)
+            return is_honeypot
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def submit(self, chain: str, address: str) -> Future:
+        """Future resolving to True if the token is a honeypot (or on an unsupported chain), None if the check failed.
+
+        Verdicts are cached and concurrent checks of a token de-duplicated.
+        """
+        key = (chain.lower(), address.lower())
+        if not self.supports(chain):
+            # Verdict définitif sans requête : jamais vérifiable, donc jamais retenté
+            if key[0] not in self._unsupported_logged:
+                self._unsupported_logged.add(key[0])
+                self.logger.warning(f"⚠️ Honeypot checks not supported on {key[0]}, its tokens are dropped")
+            future = Future()
+            future.set_result(True)
+            return future
+        cached = self.verdicts.get(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._resolve, key)
+                self._inflight[key] = future
+            return future
+
+    def screen(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the rows whose base token is a honeypot or could not be checked."""
+        self.last_unresolved = set()
+        if df.empty:
+            return df
+
+        futures = {
+            (chain, address): self.submit(chain, address)
+            for chain, address in set(zip(df['chain'], df['base_token_address']))
+        }
+        wait(futures.values())
+
+        verdicts = {key: future.result() for key, future in futures.items()}
+        self.last_unresolved = {key for key, verdict in verdicts.items() if verdict is None}
+        mask = [verdicts[(chain, address)] is False
+                for chain, address in zip(df['chain'], df['base_token_address'])]
+        return df[mask]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,182 @@
+"""Shared HTTP layer for every external API (DexScreener, explorers, honeypot.is).
+
+One keep-alive session (connection pool per host, gzip) is shared by all
+components. Each API gets its own timeout and retry budget from the `HTTP`
+config section, and a circuit breaker per (API, host): after
+`failure_threshold` consecutive failures the host is short-circuited for
+`reset_timeout` seconds (`CircuitOpenError`) instead of timing out once per
+row, then a single probe request decides whether it is closed again.
+
+    http = HttpClient()
+    response = http.api("honeypot").get(url, params=params)
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import CONFIG
+from empty_my_wallet.metrics import CIRCUIT_OPEN, HTTP_REQUEST_SECONDS
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed → open → half-open)."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def acquire(self) -> Tuple[bool, bool]:
+        """(allowed, probe): a probe is the single request let through while half-open."""
+        with self._lock:
+            if self.opened_at is None:
+                return True, False
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._probing:
+                return False, False
+            self._probing = True  # Single probe request while half-open
+            return True, True
+
+    def end_probe(self):
+        """Free the probe slot if the probe ended without a recorded outcome (unexpected error)."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if it (re)opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._probing = False
+                return True
+            return False
+
+
+class ApiClient:
+    """Requests to one external API through the shared session."""
+
+    def __init__(self, http: "HttpClient", name: str, settings: Dict):
+        self.http = http
+        self.name = name
+        self.timeout = settings["timeout"]
+        self.retries = int(settings["retries"])
+
+    def get(self, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """GET with the API timeout; connection errors are retried within the retry budget.
+
+        5xx responses and network errors count against the host's circuit
+        breaker; 429s are returned to the caller (rate limiting is handled
+        upstream) and do not trip it.
+        """
+        breaker = self.http.breaker(self.name, url)
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(self.retries + 1):
+            allowed, probe = breaker.acquire()
+            if not allowed:
+                raise CircuitOpenError(f"{self.name}: circuit open for {urlparse(url).netloc}")
+            self.http._count_request(self.name)
+            try:
+                with HTTP_REQUEST_SECONDS.time(api=self.name):
+                    response = self.http.session.get(url, timeout=timeout, **kwargs)
+                if response.status_code >= 500:
+                    self._failure(breaker, url)
+                else:
+                    breaker.record_success()
+                return response
+            except requests.ConnectionError:
+                self._failure(breaker, url)
+                if attempt < self.retries:
+                    continue
+                raise
+            except requests.RequestException:
+                # Timeouts are not retried: the retry would double the tail latency
+                self._failure(breaker, url)
+                raise
+            finally:
+                if probe:
+                    breaker.end_probe()  # Sinon une erreur inattendue laisse le circuit ouvert pour toujours
+
+    def _failure(self, breaker: CircuitBreaker, url: str):
+        if breaker.record_failure():
+            CIRCUIT_OPEN.inc(api=self.name)
+            if self.http.logger is not None:
+                self.http.logger.warning(f"⚡ Circuit opened for {self.name} ({urlparse(url).netloc}) "
+                                         f"for {breaker.reset_timeout:g}s")
+
+
+class HttpClient:
+    """Shared pooled session, per-API settings and circuit breakers.
+
+    `session` can be injected (e.g. the record/replay sessions); otherwise a
+    keep-alive session with a large per-host pool is created.
+    """
+
+    def __init__(self, logger=None, session: Optional[requests.Session] = None, settings: Optional[Dict] = None):
+        self.logger = logger
+        self.settings = settings or CONFIG["HTTP"]
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=int(self.settings["pool_connections"]),
+                                  pool_maxsize=int(self.settings["pool_maxsize"]))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.setdefault("Accept-Encoding", "gzip, deflate")
+        self.session = session
+        self._apis: Dict[str, ApiClient] = {}
+        self._breakers: Dict[tuple, CircuitBreaker] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _api_settings(self, name: str) -> Dict:
+        return {**self.settings["defaults"], **(self.settings["apis"].get(name) or {})}
+
+    def api(self, name: str) -> ApiClient:
+        with self._lock:
+            client = self._apis.get(name)
+            if client is None:
+                client = self._apis[name] = ApiClient(self, name, self._api_settings(name))
+            return client
+
+    def breaker(self, name: str, url: str) -> CircuitBreaker:
+        key = (name, urlparse(url).netloc)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                settings = self._api_settings(name)
+                breaker = self._breakers[key] = CircuitBreaker(int(settings["failure_threshold"]),
+                                                               float(settings["reset_timeout"]))
+            return breaker
+
+    def _count_request(self, name: str):
+        with self._lock:
+            self._request_counts[name] = self._request_counts.get(name, 0) + 1
+
+    def take_request_counts(self) -> Dict[str, int]:
+        """Requests sent per API since the previous call (adaptive cadence budget)."""
+        with self._lock:
+            counts, self._request_counts = self._request_counts, {}
+        return counts
@@ -0,0 +1,185 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config.config import CONFIG
+from empty_my_wallet.http_client import HttpClient
+from empty_my_wallet.metrics import HTTP_ERRORS, RATE_LIMITED, RATE_LIMIT_WAIT_SECONDS
+
+DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to rate limit requests to a single host."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PairIngestor:
+    """Fetch DexScreener pairs for every chain and search query concurrently.
+
+    Requests go through the shared HTTP client (keep-alive pool, circuit
+    breaker). Each host has its own token bucket, and a 429 only pauses the
+    queries of the chain that was throttled.
+    """
+
+    def __init__(self, logger, http: Optional[HttpClient] = None,
+                 base_url: str = DEXSCREENER_SEARCH_URL, settings: Optional[Dict] = None):
+        self.logger = logger
+        self.base_url = base_url
+        self.settings = settings or CONFIG["INGESTION"]
+        self.max_workers = int(self.settings["max_workers"])
+        self.api = (http or HttpClient(logger)).api("dexscreener")
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._chain_blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Requests sent / throttled during the last iter_pairs (API budget accounting)
+        self.last_requests = 0
+        self.last_rate_limited = 0
+        self._requests = 0
+        self._rate_limited = 0
+
+    def _bucket_for(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.settings["requests_per_second"], self.settings["burst"])
+                self._buckets[host] = bucket
+            return bucket
+
+    def _wait_for_chain(self, chain: str):
+        with self._lock:
+            blocked_until = self._chain_blocked_until.get(chain, 0.0)
+        delay = blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _block_chain(self, chain: str, delay: float):
+        with self._lock:
+            until = time.monotonic() + delay
+            self._chain_blocked_until[chain] = max(self._chain_blocked_until.get(chain, 0.0), until)
+
+    def queries_for(self, chain: str) -> List[str]:
+        """Search queries to run for a chain (defaults to the chain name)."""
+        return list(self.settings.get("queries", {}).get(chain) or [chain])
+
+    def fetch_query(self, chain: str, query: str) -> List[Dict]:
+        """Run a single search query, retrying with backoff on 429 / 5xx."""
+        params = {'q': query, 'limit': 500}  # Dexscreener defaults to 25
+        max_retries = int(self.settings["max_retries"])
+        max_backoff = float(self.settings["max_backoff"])
+        host = urlparse(self.base_url).netloc
+
+        for attempt in range(max_retries + 1):
+            self._wait_for_chain(chain)
+            RATE_LIMIT_WAIT_SECONDS.observe(self._bucket_for(host).acquire(), host=host)
+
+            with self._lock:
+                self._requests += 1
+            response = self.api.get(
+                self.base_url,
+                params=params,
+                headers={'Accept': 'application/json'}
+            )
+
+            if response.status_code == 200:
+                pairs = response.json().get('pairs') or []
+                self.logger.info(f"Found {len(pairs)} pairs for {chain} (q={query})")
+                return pairs
+
+            if response.status_code == 429:
+                RATE_LIMITED.inc(api="dexscreener")
+                with self._lock:
+                    self._rate_limited += 1
+            if response.status_code == 429 or response.status_code >= 500:
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = 2 ** attempt
+                delay = min(delay, max_backoff)
+                if attempt < max_retries:
+                    self.logger.warning(
+                        f"Status {response.status_code} for {chain} (q={query}), "
+                        f"backing off {delay:.1f}s ({attempt + 1}/{max_retries})"
+                    )
+                    self._block_chain(chain, delay)
+                    continue
+
+            HTTP_ERRORS.inc(api="dexscreener")
+            self.logger.error(
+                f"Error fetching {chain} pairs (q={query}): Status {response.status_code} - {response.text}"
+            )
+            return []
+
+        return []
+
+    def iter_pairs(self, chains: Iterable[str]) -> Iterator[Dict]:
+        """Yield de-duplicated pairs as each (chain, query) request completes."""
+        jobs = [(chain, query) for chain in chains for query in self.queries_for(chain)]
+        with self._lock:
+            self._requests = self._rate_limited = 0
+        if not jobs:
+            self.last_requests = self.last_rate_limited = 0
+            return
+
+        seen = set()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            futures = {executor.submit(self.fetch_query, chain, query): (chain, query)
+                       for chain, query in jobs}
+            for future in as_completed(futures):
+                chain, query = futures[future]
+                try:
+                    pairs = future.result()
+                except requests.RequestException as e:
+                    HTTP_ERRORS.inc(api="dexscreener")
+                    self.logger.error(f"Network error while fetching {chain} pairs (q={query}): {str(e)}")
+                    continue
+
+                for pair in pairs:
+                    key = (pair.get('chainId'), pair.get('pairAddress'))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield pair
+
+        with self._lock:
+            self.last_requests, self.last_rate_limited = self._requests, self._rate_limited
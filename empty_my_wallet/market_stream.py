@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from config.config import CONFIG
+
+
+class Quote(NamedTuple):
+    """Best bid/ask of a symbol from its bookTicker stream."""
+    bid: float
+    bid_qty: float
+    ask: float
+    ask_qty: float
+    updated_at: float  # time.monotonic()
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread_bps(self) -> float:
+        return (self.ask - self.bid) / self.mid * 10000 if self.mid > 0 else float('inf')
+
+
+class MarketStream:
+    """Latest best bid/ask of the watched symbols, fed by Binance bookTicker streams.
+
+    A background thread runs python-binance's `BinanceSocketManager` on its
+    own event loop and keeps one multiplexed `<symbol>@bookTicker`
+    connection for the current watch list; changing the list reconnects
+    with the new streams. A dropped or failed connection is retried with
+    exponential backoff (up to `max_backoff` seconds); meanwhile `enabled`
+    is False so callers fall back to the REST path. Reads are plain dict
+    lookups. `url` can point at a local WebSocket stand-in.
+    """
+
+    def __init__(self, logger, settings: Optional[Dict] = None):
+        self.logger = logger
+        self.settings = settings or CONFIG["MARKET_STREAM"]
+        self.url = self.settings["url"]
+        self.max_streams = int(self.settings["max_streams"])
+        self._quotes: Dict[str, Quote] = {}
+        self._symbols = frozenset()
+        self._generation = 0
+        self._updated = threading.Condition()
+        self._running = False
+        self._connected = True  # Faux pendant le backoff après une erreur de connexion
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._running and self._connected
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._connected = True
+        self._thread = threading.Thread(target=self._thread_main, name="market-stream", daemon=True)
+        self._thread.start()
+        self.logger.info(f"📡 Market stream started ({self.url})")
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def watch(self, symbols: Iterable[str], extend: bool = False):
+        """Replace (or `extend`) the watched symbols; reconnects only if the set changed."""
+        symbols = {s.upper() for s in symbols}
+        if extend:
+            symbols |= self._symbols
+        symbols = frozenset(sorted(symbols)[:self.max_streams])
+        if symbols != self._symbols:
+            self._symbols = symbols
+            self._generation += 1
+
+    def quote(self, symbol: str, max_age: Optional[float] = None) -> Optional[Quote]:
+        """Latest quote of a symbol, or None if missing or older than `max_age` seconds."""
+        quote = self._quotes.get(symbol.upper())
+        if quote is None:
+            return None
+        if max_age is not None and time.monotonic() - quote.updated_at > max_age:
+            return None
+        return quote
+
+    def wait_quote(self, symbol: str, timeout: float, max_age: Optional[float] = None) -> Optional[Quote]:
+        """Like `quote`, waiting up to `timeout` seconds for a first/fresh update."""
+        deadline = time.monotonic() + timeout
+        with self._updated:
+            while True:
+                quote = self.quote(symbol, max_age)
+                remaining = deadline - time.monotonic()
+                if quote is not None or remaining <= 0:
+                    return quote
+                self._updated.wait(remaining)
+
+    def _on_message(self, message: Dict):
+        data = message.get('data', message)
+        symbol = data.get('s')
+        if not symbol:
+            return
+        quote = Quote(float(data['b']), float(data['B']), float(data['a']), float(data['A']), time.monotonic())
+        with self._updated:
+            self._quotes[symbol] = quote
+            self._updated.notify_all()
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._run())
+        except Exception as e:
+            # Erreur hors connexion (import, client) : arrêt, les appelants repassent en REST
+            self._running = False
+            self.logger.error(f"❌ Market stream stopped: {str(e)}")
+
+    async def _run(self):
+        from binance import AsyncClient, BinanceSocketManager
+
+        # Only the socket manager is used: no REST ping, no API key
+        client = AsyncClient()
+        manager = BinanceSocketManager(client)
+        manager.STREAM_URL = manager.STREAM_TESTNET_URL = self.url
+        max_backoff = float(self.settings["max_backoff"])
+        backoff = 1.0
+        try:
+            while self._running:
+                generation, symbols = self._generation, self._symbols
+                if not symbols:
+                    await asyncio.sleep(0.2)
+                    continue
+
+                try:
+                    await self._stream(manager, generation, symbols)
+                    backoff = 1.0
+                except Exception as e:
+                    self._connected = False
+                    self.logger.error(f"❌ Market stream connection error, retrying in {backoff:g}s: {str(e)}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(max_backoff, backoff * 2)
+                    continue
+
+                # Drop the quotes of the symbols no longer watched
+                with self._updated:
+                    for symbol in list(self._quotes):
+                        if symbol not in self._symbols:
+                            del self._quotes[symbol]
+        finally:
+            await client.close_connection()
+
+    async def _stream(self, manager, generation: int, symbols: frozenset):
+        """Read one multiplexed connection until the watch list changes or the stream stops."""
+        socket = manager.multiplex_socket([f"{s.lower()}@bookTicker" for s in sorted(symbols)])
+        async with socket as stream:
+            if not self._connected:
+                self.logger.info("📡 Market stream reconnected")
+            self._connected = True
+            while self._running and generation == self._generation:
+                try:
+                    message = await asyncio.wait_for(stream.recv(), 0.5)
+                except asyncio.TimeoutError:
+                    continue
+                if message.get('e') == 'error':
+                    # Reconnexions internes de python-binance épuisées : backoff côté MarketStream
+                    raise ConnectionError(message.get('m'))
+                try:
+                    self._on_message(message)
+                except (KeyError, TypeError, ValueError) as e:
+                    self.logger.debug(f"Ignoring malformed market stream message: {e}")
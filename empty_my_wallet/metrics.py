@@ -0,0 +1,253 @@
+"""Lightweight hot-path instrumentation exposed in the Prometheus text format.
+
+Metrics are declared once at module level and updated from the pipeline:
+
+    with STAGE_SECONDS.time(stage="fetch"):
+        ...
+    CACHE_REQUESTS.inc(cache="creator", result="hit")
+
+Everything is a no-op until `configure_metrics` enables the registry, so the
+disabled cost is one attribute check per call.
+"""
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+from config.config import CONFIG
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: "Histogram", labels: LabelValues):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram._observe(self._labels, time.perf_counter() - self._start)
+        return False
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labels: Sequence[str]):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> str:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = list(self._values.items())
+        return "".join(f"{self.name}{self._format_labels(key)} {value}\n" for key, value in items)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, list] = {}
+
+    def _observe(self, key: LabelValues, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def observe(self, value: float, **labels):
+        if not self._registry.enabled:
+            return
+        self._observe(self._key(labels), value)
+
+    def time(self, **labels):
+        """Context manager timing its block into the histogram."""
+        if not self._registry.enabled:
+            return _NOOP_TIMER
+        return _Timer(self, self._key(labels))
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[:-1]) if state else 0
+
+    def render(self) -> str:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = self._format_labels(key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}\n")
+            cumulative += state[len(self.buckets)]
+            labels = self._format_labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}\n")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {state[-1]}\n")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}\n")
+        return "".join(lines)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.enabled = False
+        self._metrics = []
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labels, buckets=buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        chunks = []
+        for metric in self._metrics:
+            chunks.append(f"# HELP {metric.name} {metric.documentation}\n# TYPE {metric.name} {metric.kind}\n")
+            chunks.append(metric.render())
+        return "".join(chunks)
+
+    def serve(self, host: str, port: int):
+        """Expose `/metrics` on a background HTTP server."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+
+
+METRICS = MetricsRegistry()
+
+STAGE_SECONDS = METRICS.histogram(
+    "emptymywallet_stage_seconds", "Duration of each cycle stage", ("stage",))
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "emptymywallet_http_request_seconds", "Latency of external API calls", ("api",))
+HTTP_ERRORS = METRICS.counter(
+    "emptymywallet_http_errors_total", "Failed external API calls", ("api",))
+CIRCUIT_OPEN = METRICS.counter(
+    "emptymywallet_circuit_open_total", "Circuit breaker trips per external API", ("api",))
+RATE_LIMITED = METRICS.counter(
+    "emptymywallet_rate_limited_total", "Throttled responses (429) from external APIs", ("api",))
+RATE_LIMIT_WAIT_SECONDS = METRICS.histogram(
+    "emptymywallet_rate_limit_wait_seconds", "Time spent waiting on client-side rate limiters", ("host",))
+CACHE_REQUESTS = METRICS.counter(
+    "emptymywallet_cache_requests_total", "Cache lookups by result (hit/miss)", ("cache", "result"))
+PAIRS = METRICS.counter(
+    "emptymywallet_pairs_total", "Pairs seen per pipeline step", ("step",))
+CYCLES = METRICS.counter(
+    "emptymywallet_cycles_total", "Completed analysis cycles")
+PREFILTER_DROPS = METRICS.counter(
+    "emptymywallet_prefilter_drops_total", "Raw pairs dropped by each pre-filter rule", ("rule",))
+RISK_CHECKS = METRICS.counter(
+    "emptymywallet_risk_checks_total", "Pre-trade risk check outcomes", ("check", "result"))
+CYCLE_OVERRUNS = METRICS.counter(
+    "emptymywallet_cycle_overruns_total", "Cycles that overran the scheduler interval", ("side",))
+CYCLE_INTERVAL_SECONDS = METRICS.gauge(
+    "emptymywallet_cycle_interval_seconds", "Current scheduler interval")
+SHARD_LEASES = METRICS.gauge(
+    "emptymywallet_shard_leases", "Shards leased by the worker", ("worker",))
+TRADE_INTENTS = METRICS.counter(
+    "emptymywallet_trade_intents_total", "Trade intents queued and executed by the leader", ("status",))
+
+
+def configure_metrics(logger, settings: Optional[Dict] = None):
+    """Enable the registry and start the `/metrics` endpoint if configured."""
+    settings = settings or CONFIG["METRICS"]
+    if not settings["enabled"] or METRICS.enabled:
+        return
+    METRICS.enabled = True
+    METRICS.serve(settings["host"], int(settings["port"]))
+    logger.info(f"📈 Metrics exposed on http://{settings['host']}:{settings['port']}/metrics")
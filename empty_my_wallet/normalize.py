@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# EVM addresses (0x + 40 hex = 42 chars) and Osmosis addresses (44 chars)
+ADDRESS_LENGTHS = (42, 44)
+ADDRESS_PREFIX_PATTERN = r'^(?:0x|osmo)'
+
+
+def validate_addresses(values) -> pd.Series:
+    """Strip/trim addresses and null out the malformed ones (vectorized)."""
+    addresses = pd.Series(values, dtype=object).str.strip().str.slice(0, 128)
+    valid = addresses.str.len().isin(ADDRESS_LENGTHS) & addresses.str.contains(ADDRESS_PREFIX_PATTERN, na=False)
+    return addresses.where(valid, None)
+
+
+def normalize_pairs(raw_data: List[Dict], now: Optional[datetime] = None) -> pd.DataFrame:
+    """Build the `pairs` frame from raw DexScreener pair dicts.
+
+    Columns are pulled straight out of the dicts in a single pass instead of
+    going through `pd.json_normalize`, and get explicit dtypes (float64
+    metrics, categorical chain/exchange).
+    """
+    n = len(raw_data)
+    pair_address = [None] * n
+    base_name = [None] * n
+    base_address = [None] * n
+    quote_address = [None] * n
+    price = [None] * n
+    liquidity = [None] * n
+    volume = [None] * n
+    chain = [None] * n
+    exchange = [None] * n
+    created_at = [None] * n
+
+    for i, pair in enumerate(raw_data):
+        base = pair.get('baseToken') or {}
+        quote = pair.get('quoteToken') or {}
+        pair_address[i] = pair.get('pairAddress')
+        base_name[i] = base.get('name')
+        base_address[i] = base.get('address')
+        quote_address[i] = quote.get('address')
+        price[i] = pair.get('priceUsd')
+        liquidity[i] = (pair.get('liquidity') or {}).get('usd')
+        volume[i] = (pair.get('volume') or {}).get('h24')
+        chain[i] = pair.get('chainId')
+        exchange[i] = pair.get('dexId')
+        created_at[i] = pair.get('pairCreatedAt')
+
+    timestamp = np.datetime64(now or datetime.utcnow(), 'ns')
+    return pd.DataFrame({
+        'pair_address': validate_addresses(pair_address),
+        'base_token_name': pd.Series(base_name, dtype=object),
+        'base_token_address': validate_addresses(base_address),
+        'quote_token_address': validate_addresses(quote_address),
+        'price': pd.to_numeric(pd.Series(price, dtype=object), errors='coerce').astype('float64'),
+        'liquidity': pd.to_numeric(pd.Series(liquidity, dtype=object), errors='coerce').astype('float64'),
+        'volume_24h': pd.to_numeric(pd.Series(volume, dtype=object), errors='coerce').astype('float64'),
+        'chain': pd.Categorical(chain),
+        'exchange': pd.Categorical(exchange),
+        'created_at': pd.to_datetime(pd.Series(created_at, dtype='float64'), unit='ms', errors='coerce'),
+        'timestamp': np.full(n, timestamp),
+    })
@@ -0,0 +1,82 @@
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config.config import CONFIG
+from empty_my_wallet.metrics import PREFILTER_DROPS
+
+Rule = Tuple[str, Callable[[Dict], bool]]
+
+MS_PER_DAY = 86400 * 1000
+
+
+def _liquidity_usd(pair: Dict) -> float:
+    liquidity = pair.get('liquidity')
+    try:
+        return float(liquidity.get('usd') or 0) if isinstance(liquidity, dict) else float(liquidity or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PreFilter:
+    """Streaming filter on raw DexScreener pairs, applied before any lookup.
+
+    Rules run cheapest first and a pair is dropped by the first rule it
+    fails: chain whitelist, minimum liquidity, minimum age, then the coin
+    blacklists (resident index + symbol names). The dev blacklist needs the
+    creator and stays in `apply_filters`. Drops are counted per rule.
+    """
+
+    def __init__(self, blacklist, settings: Optional[Dict] = None):
+        self.blacklist = blacklist
+        self.settings = settings or CONFIG["FILTERS"]
+        self.seen = 0
+        self.drops: Dict[str, int] = {}
+
+    def rules(self, now_ms: Optional[int] = None) -> List[Rule]:
+        chains = frozenset(chain.lower() for chain in self.settings["chain_whitelist"])
+        min_liquidity = float(self.settings["min_liquidity"])
+        min_age_days = self.settings.get("min_age_days") or 0
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        newest_allowed = now_ms - min_age_days * MS_PER_DAY
+        coin_blacklist = self.blacklist.addresses('coin')
+        symbol_blacklist = frozenset(s.lower() for s in self.settings["coin_blacklist"])
+
+        def blacklisted(pair):
+            base = pair.get('baseToken') or {}
+            return (pair.get('pairAddress') in coin_blacklist
+                    or base.get('address') in coin_blacklist
+                    or (base.get('name') or '').lower() in symbol_blacklist)
+
+        def too_young(pair):
+            created_at = pair.get('pairCreatedAt')
+            return not isinstance(created_at, (int, float)) or created_at > newest_allowed
+
+        return [
+            ("chain", lambda pair: (pair.get('chainId') or '').lower() not in chains),
+            ("liquidity", lambda pair: _liquidity_usd(pair) < min_liquidity),
+            ("age", too_young),
+            ("blacklist", blacklisted),
+        ]
+
+    def filter(self, pairs: Iterable[Dict], now_ms: Optional[int] = None) -> Iterator[Dict]:
+        """Yield the pairs passing every rule; counts are complete once exhausted."""
+        rules = self.rules(now_ms)
+        drops = {name: 0 for name, _ in rules}
+        seen = 0
+        try:
+            for pair in pairs:
+                seen += 1
+                for name, rejects in rules:
+                    if rejects(pair):
+                        drops[name] += 1
+                        break
+                else:
+                    yield pair
+        finally:
+            self.seen, self.drops = seen, drops
+            for name, count in drops.items():
+                PREFILTER_DROPS.inc(count, rule=name)
+
+    @property
+    def kept(self) -> int:
+        return self.seen - sum(self.drops.values())
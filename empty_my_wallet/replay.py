@@ -0,0 +1,343 @@
+"""Offline record/replay harness for end-to-end cycle benchmarks.
+
+Record the raw HTTP traffic of a few live cycles (DexScreener, explorers,
+honeypot.is, Binance) to a gzip-compressed JSON-lines file:
+
+    python -m empty_my_wallet.replay record --cycles 3 --out recordings/live.jsonl.gz
+
+Replay it against a local stub HTTP server and a local database, and report
+per-stage latency and pairs/sec:
+
+    python -m empty_my_wallet.replay bench --recording recordings/live.jsonl.gz \\
+        --cycles 20 --speed 0 --database-url sqlite:///data/replay.db
+
+Or replay days of archived raw payloads (ARCHIVE, needs pyarrow) through the
+pipeline, without recorded HTTP traffic for the other APIs:
+
+    python -m empty_my_wallet.replay archive --path data/archive --start 2026-10-01 --end 2026-10-02
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Query parameters that carry credentials: never written to recordings
+SECRET_PARAMS = {"apikey", "signature", "timestamp", "recvWindow"}
+
+# Response headers worth replaying (rate limiting / content type)
+KEPT_HEADERS = {"content-type", "retry-after"}
+
+RequestKey = Tuple[str, str, str, str]
+
+
+def request_key(method: str, url: str) -> RequestKey:
+    """Identity of a request for matching recordings: method, host, path and non-secret query."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return method.upper(), parts.netloc, parts.path, urlencode(query)
+
+
+def _pool_adapter() -> HTTPAdapter:
+    return HTTPAdapter(pool_connections=8, pool_maxsize=32)
+
+
+class RecordingSession(requests.Session):
+    """requests.Session that appends every response to a gzip JSON-lines file."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.mount("https://", _pool_adapter())
+        self.mount("http://", _pool_adapter())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.cycle = 0
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        method, host, path, query = request_key(request.method, request.url)
+        record = {
+            "cycle": self.cycle,
+            "method": method,
+            "host": host,
+            "path": path,
+            "query": query,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "elapsed": response.elapsed.total_seconds(),
+            "body": response.text,
+        }
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+        return response
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        super().close()
+
+
+def load_recording(path: str) -> Dict[RequestKey, List[Dict]]:
+    """Recorded responses grouped by request key, in recording order."""
+    responses = defaultdict(list)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            responses[(record["method"], record["host"], record["path"], record["query"])].append(record)
+    return responses
+
+
+class StubServer:
+    """Local HTTP server answering with recorded responses.
+
+    Requests arrive as `/<original host><original path>?<query>` (see
+    `ReplaySession`). Responses for the same request are served in recording
+    order, and the last one is repeated once exhausted. Unknown requests get
+    a 404. With `speed > 0`, each response is delayed by its recorded
+    latency divided by `speed`.
+    """
+
+    def __init__(self, recording: Dict[RequestKey, List[Dict]], speed: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.speed = speed
+        self.misses = 0
+        self._queues = {key: deque(records) for key, records in recording.items()}
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self):
+                original_host, _, path = self.path.lstrip("/").partition("/")
+                key = request_key(self.command, f"http://{original_host}/{path}")
+                record = stub.next_response(key)
+                if record is None:
+                    body, status, headers = b'{"error": "not recorded"}', 404, {}
+                else:
+                    if stub.speed > 0:
+                        time.sleep(record["elapsed"] / stub.speed)
+                    body, status, headers = record["body"].encode("utf-8"), record["status"], record["headers"]
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _serve
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_response(self, key: RequestKey) -> Optional[Dict]:
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.misses += 1
+                return None
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ReplaySession(requests.Session):
+    """requests.Session that redirects every request to a `StubServer`."""
+
+    def __init__(self, stub_url: str):
+        super().__init__()
+        self.stub_url = stub_url.rstrip("/")
+        self.mount("http://", _pool_adapter())
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.stub_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def _create_bot(session: requests.Session, database_url: Optional[str]):
+    from dotenv import load_dotenv
+    from empty_my_wallet.empty_my_wallet import EmptyMyWallet
+
+    load_dotenv()
+    return EmptyMyWallet(
+        binance_api_key=os.getenv("BINANCE_API_KEY", "replay"),
+        binance_api_secret=os.getenv("BINANCE_API_SECRET", "replay"),
+        test_mode=True,  # Never trade from the harness
+        database_url=database_url,
+        session=session,
+    )
+
+
+def record(args):
+    session = RecordingSession(args.out)
+    try:
+        bot = _create_bot(session, args.database_url)
+        for cycle in range(args.cycles):
+            session.cycle = cycle
+            stats = bot.run_cycle()
+            print(f"cycle {cycle}: {stats['pairs_fetched']} pairs in {stats['stages']['total']:.2f}s")
+            if cycle + 1 < args.cycles:
+                time.sleep(args.interval)
+    finally:
+        session.close()
+    print(f"Recording written to {args.out}")
+
+
+def report(all_stats: List[Dict]):
+    stages = defaultdict(list)
+    for stats in all_stats:
+        for stage, seconds in stats["stages"].items():
+            stages[stage].append(seconds)
+
+    print(f"\n{'stage':<14}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+    for stage, samples in stages.items():
+        print(f"{stage:<14}{statistics.mean(samples) * 1000:>10.1f}"
+              f"{statistics.median(samples) * 1000:>10.1f}{max(samples) * 1000:>10.1f}")
+
+    total = sum(stats["stages"]["total"] for stats in all_stats)
+    fetched = sum(stats["pairs_fetched"] for stats in all_stats)
+    skipped = sum(stats.get("pairs_skipped", 0) for stats in all_stats)
+    processed = sum(stats["pairs_processed"] for stats in all_stats)
+    print(f"\n{len(all_stats)} cycles in {total:.2f}s: {fetched / total:,.0f} fetched pairs/s, "
+          f"{processed / total:,.0f} processed pairs/s")
+    if fetched:
+        print(f"unchanged pairs skipped: {skipped / fetched:.0%}")
+
+
+def _fresh_sqlite(database_url: str):
+    if database_url.startswith("sqlite:///"):
+        db_path = database_url[len("sqlite:///"):]
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+
+def bench(args):
+    if args.fresh:
+        _fresh_sqlite(args.database_url)
+
+    stub = StubServer(load_recording(args.recording), speed=args.speed).start()
+    try:
+        bot = _create_bot(ReplaySession(stub.url), args.database_url)
+        all_stats = []
+        for cycle in range(args.cycles):
+            all_stats.append(bot.run_cycle())
+            if args.speed > 0 and cycle + 1 < args.cycles:
+                time.sleep(args.interval / args.speed)
+        report(all_stats)
+        if stub.misses:
+            print(f"⚠️ {stub.misses} requests had no recorded response (served 404)")
+    finally:
+        stub.stop()
+
+
+def archive(args):
+    from config.config import CONFIG
+    from empty_my_wallet.archive import PayloadArchive
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("❌ Reading the archive needs pyarrow (pip install pyarrow)")
+        return 1
+
+    if args.fresh:
+        _fresh_sqlite(args.database_url)
+    source = PayloadArchive(logging.getLogger(__name__), settings={**CONFIG["ARCHIVE"], "path": args.path, "enabled": False})
+    CONFIG["ARCHIVE"]["enabled"] = False  # Ne pas ré-archiver les cycles rejoués
+
+    # Pas d'enregistrement HTTP pour les autres APIs : réponses 404 servies par le stub
+    stub = StubServer({}).start()
+    try:
+        bot = _create_bot(ReplaySession(stub.url), args.database_url)
+        all_stats = []
+        for fetched_at, pairs in source.raw_cycles(args.start, args.end):
+            # Payload archivé avant le pré-filtre : même chemin que fetch_pair_data
+            kept = list(bot.prefilter.filter(pairs))
+            all_stats.append(bot.run_cycle(prefetched=(kept, 0.0)))
+            print(f"{fetched_at:%Y-%m-%d %H:%M:%S}: {len(pairs)} pairs, {len(kept)} after pre-filter")
+            if args.cycles and len(all_stats) >= args.cycles:
+                break
+        if not all_stats:
+            print(f"❌ No archived cycles in {args.path} for this window")
+            return 1
+        report(all_stats)
+        return 0
+    finally:
+        stub.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record / replay bot cycles for offline benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Run live cycles and record every HTTP response")
+    record_parser.add_argument("--out", required=True, help="Output file (.jsonl.gz)")
+    record_parser.add_argument("--cycles", type=int, default=3)
+    record_parser.add_argument("--interval", type=float, default=60, help="Seconds between cycles")
+    record_parser.add_argument("--database-url", help="Database to use (default: PostgreSQL from .env)")
+    record_parser.set_defaults(func=record)
+
+    bench_parser = commands.add_parser("bench", help="Replay a recording and report per-stage latency")
+    bench_parser.add_argument("--recording", required=True)
+    bench_parser.add_argument("--cycles", type=int, default=10)
+    bench_parser.add_argument("--speed", type=float, default=0.0,
+                              help="Replay speed: 1 = recorded latencies and interval, 0 = no delays")
+    bench_parser.add_argument("--interval", type=float, default=60, help="Recorded seconds between cycles")
+    bench_parser.add_argument("--database-url", default="sqlite:///data/replay.db",
+                              help="SQLAlchemy URL of the local target (SQLite file or local PostgreSQL)")
+    bench_parser.add_argument("--no-fresh", dest="fresh", action="store_false",
+                              help="Keep the existing SQLite database (warm caches)")
+    bench_parser.set_defaults(func=bench)
+
+    archive_parser = commands.add_parser("archive", help="Replay archived raw payloads through the pipeline")
+    archive_parser.add_argument("--path", default="data/archive", help="Archive directory (ARCHIVE.path)")
+    archive_parser.add_argument("--start", type=datetime.fromisoformat, help="First cycle (ISO date/time, UTC)")
+    archive_parser.add_argument("--end", type=datetime.fromisoformat, help="Last cycle (ISO date/time, UTC)")
+    archive_parser.add_argument("--cycles", type=int, default=0, help="Stop after N cycles (0 = whole window)")
+    archive_parser.add_argument("--database-url", default="sqlite:///data/replay.db",
+                                help="SQLAlchemy URL of the local target (SQLite file or local PostgreSQL)")
+    archive_parser.add_argument("--no-fresh", dest="fresh", action="store_false",
+                                help="Keep the existing SQLite database")
+    archive_parser.set_defaults(func=archive)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
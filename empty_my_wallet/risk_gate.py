@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+from config.config import CONFIG
+from empty_my_wallet.metrics import RISK_CHECKS
+
+# A check returns True when the token is flagged (e.g. bundled supply) and
+# raises when it cannot answer.
+RiskCheck = Callable[[pd.Series], bool]
+
+
+class RiskVerdict(NamedTuple):
+    index: object
+    approved: bool
+    flagged: List[str]   # checks that flagged the token
+    failed: List[str]    # checks that errored or missed the deadline
+
+
+class RiskGate:
+    """Pre-trade gate running every check of every candidate concurrently.
+
+    All (token, check) pairs are submitted at once to a pool of
+    `max_workers` threads. Each token gets `token_budget` seconds from the
+    moment its first check starts running, so tokens queued behind a full
+    pool are not timed out before they were checked. A check that raises
+    or misses its token's deadline counts as failed; with `fail_closed`
+    (the default) the token is then not traded.
+    """
+
+    def __init__(self, checks: Dict[str, RiskCheck], logger, settings: Optional[Dict] = None):
+        self.checks = checks
+        self.logger = logger
+        self.settings = settings or CONFIG["RISK_GATE"]
+        self._executor = ThreadPoolExecutor(max_workers=int(self.settings["max_workers"]),
+                                            thread_name_prefix="risk-gate")
+
+    def evaluate(self, candidates: pd.DataFrame) -> List[RiskVerdict]:
+        if candidates.empty:
+            return []
+
+        budget = float(self.settings["token_budget"])
+        started: Dict[object, float] = {}
+        futures = {}
+        for index, row in candidates.iterrows():
+            for name, check in self.checks.items():
+                futures[self._executor.submit(self._run, check, row, index, started)] = (index, name)
+
+        # Échéance par token, à partir du démarrage de ses checks (pas de la soumission du lot)
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = {future: started[futures[future][0]] + budget
+                         for future in pending if futures[future][0] in started}
+            pending -= {future for future, deadline in deadlines.items() if deadline <= now}
+            if not pending:
+                break
+            timeout = min((deadline for future, deadline in deadlines.items() if future in pending),
+                          default=now + budget) - now
+            # Un check qui se termine libère un worker : réveil pour compter le token suivant
+            _, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+
+        flagged = {index: [] for index in candidates.index}
+        failed = {index: [] for index in candidates.index}
+        for future, (index, name) in futures.items():
+            if not future.done():
+                future.cancel()
+                failed[index].append(f"{name}: timeout")
+                RISK_CHECKS.inc(check=name, result="timeout")
+            elif future.exception() is not None:
+                failed[index].append(f"{name}: {future.exception()}")
+                RISK_CHECKS.inc(check=name, result="error")
+            elif future.result():
+                flagged[index].append(name)
+                RISK_CHECKS.inc(check=name, result="flagged")
+            else:
+                RISK_CHECKS.inc(check=name, result="passed")
+
+        fail_closed = self.settings["fail_closed"]
+        return [
+            RiskVerdict(index, not flagged[index] and not (fail_closed and failed[index]),
+                        flagged[index], failed[index])
+            for index in candidates.index
+        ]
+
+    @staticmethod
+    def _run(check: RiskCheck, row: pd.Series, index, started: Dict[object, float]) -> bool:
+        started.setdefault(index, time.monotonic())
+        return check(row)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,137 @@
+import math
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config.config import CONFIG
+from empty_my_wallet.metrics import CYCLE_INTERVAL_SECONDS, CYCLE_OVERRUNS
+
+
+class AdaptiveCadence:
+    """Cycle interval derived from the measured API budgets.
+
+    A cycle that sends `n` requests to an API may run at most every
+    `n / (budget_per_minute * utilization / 60)` seconds; the most loaded
+    API sets the target. The interval is kept within [min_interval,
+    max_interval], doubles after a throttled cycle and then decays back
+    towards the budget-derived target.
+    """
+
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.min_interval = float(settings["min_interval"])
+        self.max_interval = float(settings["max_interval"])
+        self.interval = float(settings["interval"])
+
+    def target(self, requests_per_cycle: Dict[str, int]) -> float:
+        if not self.settings["adaptive"]:
+            return float(self.settings["interval"])
+        utilization = self.settings["budget_utilization"] / 60.0
+        budgets = self.settings["api_budgets_per_minute"]
+        # Les API sans budget configuré ne contraignent pas la cadence
+        needed = max((count / (budgets[api] * utilization)
+                      for api, count in requests_per_cycle.items() if budgets.get(api)), default=0.0)
+        return max(self.min_interval, min(self.max_interval, needed))
+
+    def update(self, requests_per_cycle: Dict[str, int], rate_limited: int) -> float:
+        target = self.target(requests_per_cycle)
+        if rate_limited:
+            self.interval = min(self.max_interval, max(self.interval, target) * 2)
+        elif self.interval > target:
+            # Back off quickly, recover gradually
+            self.interval = max(target, self.interval * 0.75)
+        else:
+            self.interval = target
+        return self.interval
+
+
+class CycleScheduler:
+    """Pipelined, fixed-rate cycle scheduler.
+
+    A fetcher thread calls `fetch` at fixed-rate ticks (start + k * interval,
+    not interval after the previous cycle ended) and hands the result to
+    the main thread, which runs `process` on it. Cycle N+1 is therefore
+    fetched while cycle N is being scored and stored.
+
+    Overruns are detected on both sides: a fetch lasting past the next tick
+    skips the missed ticks, and a batch that is still waiting when a newer
+    one arrives (processing slower than the cadence) is dropped in favour of
+    the fresher one. With `adaptive`, the interval follows the API request
+    budgets measured on each fetch (`budget` callback returning
+    `({api: requests}, rate_limited)`).
+    """
+
+    def __init__(self, fetch: Callable[[], object], process: Callable[[object], None], logger,
+                 budget: Optional[Callable[[], tuple]] = None, settings: Optional[Dict] = None):
+        self.fetch = fetch
+        self.process = process
+        self.logger = logger
+        self.budget = budget
+        self.settings = settings or CONFIG["SCHEDULER"]
+        self.cadence = AdaptiveCadence(self.settings)
+        self._batches = queue.Queue(maxsize=1)
+        self._stopped = threading.Event()
+        self._fetcher: Optional[threading.Thread] = None
+
+    def _publish(self, batch):
+        try:
+            self._batches.put_nowait(batch)
+        except queue.Full:
+            try:
+                self._batches.get_nowait()
+                CYCLE_OVERRUNS.inc(side="process")
+                self.logger.warning("⏱️ Processing overran the cycle interval, dropping the stale batch")
+            except queue.Empty:
+                pass
+            self._batches.put_nowait(batch)
+
+    def _fetch_loop(self):
+        next_tick = time.monotonic()
+        while not self._stopped.is_set():
+            delay = next_tick - time.monotonic()
+            if delay > 0 and self._stopped.wait(delay):
+                break
+
+            try:
+                self._publish(self.fetch())
+            except Exception as e:
+                self.logger.error(f"❌ Fetch error: {str(e)}")
+
+            interval = self.cadence.interval
+            if self.budget is not None:
+                requests_sent, rate_limited = self.budget()
+                interval = self.cadence.update(requests_sent, rate_limited)
+            CYCLE_INTERVAL_SECONDS.set(interval)
+
+            next_tick += interval
+            now = time.monotonic()
+            if now > next_tick:
+                missed = math.ceil((now - next_tick) / interval)
+                CYCLE_OVERRUNS.inc(missed, side="fetch")
+                self.logger.warning(f"⏱️ Fetch overran the cycle interval, skipping {missed} tick(s)")
+                next_tick += missed * interval
+
+    def start(self):
+        self._stopped.clear()
+        self._fetcher = threading.Thread(target=self._fetch_loop, name="cycle-fetcher", daemon=True)
+        self._fetcher.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run_forever(self):
+        """Process the fetched batches until `stop()` is called."""
+        if self._fetcher is None:
+            self.start()
+        while not self._stopped.is_set():
+            try:
+                batch = self._batches.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                self.process(batch)
+            except Exception as e:
+                self.logger.error(f"❌ Runtime error: {str(e)}")
+                import traceback
+                self.logger.error(f"Traceback: {traceback.format_exc()}")
@@ -0,0 +1,170 @@
+import threading
+import time
+from decimal import ROUND_DOWN, Decimal
+from typing import Dict, NamedTuple, Optional
+
+from config.config import CONFIG
+
+
+class SymbolRule(NamedTuple):
+    """Tradable Binance symbol with the order filters that matter for market buys."""
+    symbol: str
+    base_asset: str
+    step_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    min_notional: Decimal
+
+
+def _lot_size(filters: Dict[str, Dict]) -> Dict:
+    # MARKET_LOT_SIZE applies to market orders; a zero step means "use LOT_SIZE"
+    market = filters.get('MARKET_LOT_SIZE')
+    if market and Decimal(market.get('stepSize', '0')) > 0:
+        return market
+    return filters.get('LOT_SIZE', {})
+
+
+def parse_symbol(info: Dict) -> SymbolRule:
+    filters = {f['filterType']: f for f in info.get('filters', [])}
+    lot = _lot_size(filters)
+    notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+    return SymbolRule(
+        symbol=info['symbol'],
+        base_asset=info['baseAsset'].upper(),
+        step_size=Decimal(lot.get('stepSize', '0')),
+        min_qty=Decimal(lot.get('minQty', '0')),
+        max_qty=Decimal(lot.get('maxQty', '0')),
+        min_notional=Decimal(notional.get('minNotional', '0')),
+    )
+
+
+class SymbolIndex:
+    """In-memory index of the Binance symbols trades can be routed to.
+
+    Built from an `exchangeInfo` snapshot (TRADING symbols quoted in
+    `quote_asset`) and refreshed every `refresh_interval` seconds in a
+    background thread. Tokens are matched by contract address when Binance
+    publishes it (all-coins network list, needs a signed call) or
+    `contract_symbols` maps it. Once the network list is loaded, an address
+    missing from it is not routed: a clone named like a listed token must
+    not reach the real symbol. Without the list, tokens are matched by base
+    asset name only if `name_fallback` is set. Lookups never touch the
+    network.
+
+    Until a refresh succeeds (and after a failed one), the next attempt
+    comes after `refresh_retry_interval` seconds, doubling up to
+    `refresh_interval`.
+    """
+
+    def __init__(self, client, logger, settings: Optional[Dict] = None):
+        self.client = client
+        self.logger = logger
+        self.settings = settings or CONFIG["TRADING"]
+        self.quote_asset = self.settings["quote_asset"].upper()
+        self._by_base: Dict[str, SymbolRule] = {}
+        self._overrides: Dict[str, str] = {
+            address.lower(): symbol.upper()
+            for address, symbol in (self.settings.get("contract_symbols") or {}).items()
+        }
+        self._by_contract: Dict[str, str] = dict(self._overrides)
+        self._contracts_loaded = False
+        self._refreshed_at = 0.0
+        self._attempted_at = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._refreshed_at > 0
+
+    def __len__(self):
+        return len(self._by_base)
+
+    def refresh(self) -> bool:
+        """Rebuild the index from exchangeInfo (and the coin network list if available)."""
+        self._attempted_at = time.monotonic()
+        try:
+            info = self.client.get_exchange_info()
+        except Exception as e:
+            self._failures += 1
+            self.logger.error(f"❌ Failed to load Binance exchangeInfo (retry in {self.retry_delay():.0f}s): {str(e)}")
+            return False
+
+        by_base = {}
+        for symbol in info.get('symbols', []):
+            if symbol.get('status') != 'TRADING' or symbol.get('quoteAsset', '').upper() != self.quote_asset:
+                continue
+            if 'MARKET' not in symbol.get('orderTypes', ['MARKET']):
+                continue
+            rule = parse_symbol(symbol)
+            by_base[rule.base_asset] = rule
+
+        by_contract = {}
+        contracts_loaded = False
+        if self.settings.get("resolve_contracts"):
+            try:
+                for coin in self.client.get_all_coins_info():
+                    for network in coin.get('networkList', []):
+                        address = (network.get('contractAddress') or '').lower()
+                        if address:
+                            by_contract[address] = coin['coin'].upper()
+                contracts_loaded = True
+            except Exception as e:
+                fallback = " and token name" if self.settings.get("name_fallback") else ""
+                self.logger.warning(f"⚠️ Binance coin networks unavailable, routing by contract overrides"
+                                    f"{fallback} only: {str(e)}")
+        by_contract.update(self._overrides)
+
+        with self._lock:
+            self._by_base = by_base
+            self._by_contract = by_contract
+            self._contracts_loaded = contracts_loaded
+            self._refreshed_at = time.monotonic()
+        self._failures = 0
+        self.logger.info(f"📇 Binance symbol index: {len(by_base)} {self.quote_asset} symbols, "
+                         f"{len(by_contract)} contract addresses")
+        return True
+
+    def retry_delay(self) -> float:
+        """Seconds before the next refresh: `refresh_interval` only once the last one succeeded."""
+        interval = float(self.settings["refresh_interval"])
+        if self._failures == 0:
+            return interval
+        return min(interval, float(self.settings["refresh_retry_interval"]) * 2 ** (self._failures - 1))
+
+    def maybe_refresh(self) -> bool:
+        """Start a background refresh when `refresh_interval` elapsed (never blocks the cycle)."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return False
+        if time.monotonic() - self._attempted_at < self.retry_delay():
+            return False
+        self._attempted_at = time.monotonic()
+        self._refresh_thread = threading.Thread(target=self.refresh, name="symbol-index-refresh", daemon=True)
+        self._refresh_thread.start()
+        return True
+
+    def route(self, token_address: Optional[str], token_name: Optional[str]) -> Optional[SymbolRule]:
+        """Binance symbol for a DEX token, or None if it cannot be traded."""
+        by_base, by_contract = self._by_base, self._by_contract
+        if token_address:
+            base = by_contract.get(token_address.lower())
+            if base is not None:
+                return by_base.get(base)
+            if self._contracts_loaded:
+                return None  # Adresse connue comme non listée : pas de repli sur le nom
+        if token_name and self.settings.get("name_fallback"):
+            return by_base.get(token_name.replace(' ', '').upper())
+        return None
+
+    @staticmethod
+    def shape_quantity(rule: SymbolRule, quantity, price) -> Optional[Decimal]:
+        """Round a quantity down to the lot step, or None if it breaks a filter."""
+        quantity = Decimal(str(quantity))
+        if rule.step_size > 0:
+            quantity = (quantity / rule.step_size).to_integral_value(rounding=ROUND_DOWN) * rule.step_size
+        if quantity <= 0 or quantity < rule.min_qty or (rule.max_qty > 0 and quantity > rule.max_qty):
+            return None
+        if price is not None and price == price and quantity * Decimal(str(price)) < rule.min_notional:
+            return None
+        return quantity
@@ -0,0 +1,204 @@
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import text
+
+SUMMARY_VIEW = 'pair_viability'
+
+VIABILITY_COLUMNS = ['pair_address', 'base_token_name', 'price', 'liquidity',
+                     'volume_24h', 'chain', 'exchange', 'created_at']
+
+FILTER_OPERATORS = [
+    ('datestartswith ', 'datestartswith'), ('contains ', 'contains'),
+    ('ge ', '>='), ('le ', '<='), ('lt ', '<'), ('gt ', '>'), ('ne ', '!='), ('eq ', '='),
+    ('>=', '>='), ('<=', '<='), ('!=', '!='), ('<', '<'), ('>', '>'), ('=', '='),
+]
+
+
+def split_filter_part(filter_part):
+    """Parse one `{column} op value` clause of a DataTable filter_query."""
+    start, end = filter_part.find('{'), filter_part.find('}')
+    if start == -1 or end == -1:
+        return None, None, None
+    name = filter_part[start + 1:end]
+    rest = filter_part[end + 1:].strip()
+    for operator, sql_operator in FILTER_OPERATORS:
+        if rest.startswith(operator):
+            value_part = rest[len(operator):].strip()
+            if len(value_part) > 1 and value_part[0] == value_part[-1] and value_part[0] in ("'", '"', '`'):
+                value = value_part[1:-1].replace('\\' + value_part[0], value_part[0])
+            elif sql_operator in ('contains', 'datestartswith'):
+                value = value_part  # Motif texte : pas de conversion en nombre
+            else:
+                try:
+                    value = float(value_part)
+                except ValueError:
+                    value = value_part
+            return name, sql_operator, value
+    return None, None, None
+
+
+def build_page_query(table_name, columns, allowed_columns, page_current, page_size, sort_by, filter_query):
+    """Translate DataTable paging/sorting/filtering into one parameterized SQL query."""
+    allowed = set(allowed_columns)
+    selected = [c for c in columns if c in allowed] or list(allowed_columns)
+    where, params = [], {}
+
+    for i, part in enumerate((filter_query or '').split(' && ')):
+        name, operator, value = split_filter_part(part)
+        if name not in allowed:
+            continue
+        column = f'"{name}"'
+        param = f"f{i}"
+        if operator == 'contains':
+            where.append(f"CAST({column} AS TEXT) ILIKE :{param}")
+            params[param] = f"%{value}%"
+        elif operator == 'datestartswith':
+            where.append(f"CAST({column} AS TEXT) LIKE :{param}")
+            params[param] = f"{value}%"
+        else:
+            where.append(f"{column} {operator} :{param}")
+            params[param] = value
+
+    select_list = ", ".join(f'"{c}"' for c in selected)
+    query = f'SELECT {select_list} FROM "{table_name}"'
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    order = [f'"{s["column_id"]}" {"ASC" if s["direction"] == "asc" else "DESC"}'
+             for s in (sort_by or []) if s.get("column_id") in allowed]
+    if order:
+        query += " ORDER BY " + ", ".join(order)
+    query += " LIMIT :limit OFFSET :offset"
+    params["limit"] = page_size
+    params["offset"] = page_current * page_size
+    return text(query), params
+
+
+class DashboardData:
+    """Cached read access for the dashboard.
+
+    Results are cached until the bot refreshes the `pair_viability` view.
+    The refresh stamp in `summary_refreshes` is read at most once every
+    `ttl` seconds; when it is unchanged, cached entries are kept.
+    Concurrent callbacks asking for the same missing entry run one query;
+    the others wait for its result.
+    """
+
+    def __init__(self, engine, ttl=60):
+        self.engine = engine
+        self.ttl = ttl
+        self._cache = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._generation = 0  # Incrémenté à chaque vidage du cache
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _current_version(self):
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(
+                    text("SELECT refreshed_at FROM summary_refreshes WHERE name = :name"),
+                    {"name": SUMMARY_VIEW}
+                ).scalar()
+        except Exception:
+            # View not created yet (bot never started): fall back to plain TTL expiry
+            return time.monotonic() // self.ttl
+
+    def _validate(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.ttl:
+            return
+        self._checked_at = now
+        version = self._current_version()
+        if version != self._version:
+            self._version = version
+            self._clear()
+
+    def _clear(self):
+        self._cache.clear()
+        self._generation += 1
+
+    def _cached(self, key, loader):
+        with self._lock:
+            self._validate()
+            if key in self._cache:
+                return self._cache[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Une seule requête par clé ; les autres clés ne sont pas bloquées
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    return self._cache[key]
+                generation = self._generation
+            value = loader()
+            with self._lock:
+                if generation == self._generation:  # Pas de résultat d'avant un vidage
+                    self._cache[key] = value
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._clear()
+            self._checked_at = 0.0
+
+    def table_names(self):
+        def load():
+            with self.engine.connect() as connection:
+                # Sans les partitions journalières (pair_snapshots_YYYYMMDD) : le parent suffit
+                result = connection.execute(text("""
+                    SELECT c.relname
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'public'
+                      AND c.relkind IN ('r', 'p')
+                      AND NOT c.relispartition
+                    ORDER BY c.relname
+                """))
+                return [row[0] for row in result]
+        return self._cached(('tables',), load)
+
+    def table_columns(self, table_name):
+        """Column names of a public table (also the whitelist for SQL identifiers)."""
+        def load():
+            with self.engine.connect() as connection:
+                result = connection.execute(text("""
+                    SELECT column_name
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public' AND table_name = :table
+                    ORDER BY ordinal_position
+                """), {"table": table_name})
+                return [row[0] for row in result]
+        return self._cached(('columns', table_name), load)
+
+    def chains(self):
+        def load():
+            with self.engine.connect() as connection:
+                result = connection.execute(text(f"SELECT DISTINCT chain FROM {SUMMARY_VIEW} ORDER BY chain"))
+                return [row[0] for row in result]
+        return self._cached(('chains',), load)
+
+    def viability(self, chain=None):
+        """Top pairs by volume with their viability score, for one chain or overall."""
+        def load():
+            columns = ", ".join(VIABILITY_COLUMNS)
+            if chain:
+                query = text(f"""
+                    SELECT {columns}, viability_score
+                    FROM {SUMMARY_VIEW}
+                    WHERE chain = :chain
+                    ORDER BY chain_rank
+                """)
+                params = {"chain": chain}
+            else:
+                query = text(f"""
+                    SELECT {columns}, global_viability_score AS viability_score
+                    FROM {SUMMARY_VIEW}
+                    WHERE global_top
+                    ORDER BY volume_24h DESC
+                """)
+                params = {}
+            with self.engine.connect() as connection:
+                return pd.read_sql(query, connection, params=params)
+        return self._cached(('viability', chain), load)
@@ -2,12 +2,13 @@
 import dash
 from dash import dcc
 from dash import html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import plotly.express as px
 import pandas as pd
 from sqlalchemy import create_engine, text
 from dash import dash_table
 import os
+from frontend.data_access import DashboardData, build_page_query
 # Récupération des informations via les variables d'environnement
 DB_NAME = os.getenv("POSTGRES_DB")
 DB_USER = os.getenv("POSTGRES_USER")
@@ -19,41 +20,32 @@ DB_PORT = os.getenv("POSTGRES_PORT")
 DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 engine = create_engine(DATABASE_URL)
 
-def get_table_names():
-    with engine.connect() as connection:
-        result = connection.execute(text("""
-            SELECT tablename 
-            FROM pg_tables 
-            WHERE schemaname = 'public'
-        """))
-        return [row[0] for row in result]
+# Cached reads, invalidated when the bot refreshes the pair_viability view
+data = DashboardData(engine, ttl=int(os.getenv("DASHBOARD_CACHE_TTL", "60")))
 
-def load_data(table_name):
-    query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql(query, engine)
-    return df
+def estimate_row_count(table_name):
+    """Planner row estimate (avoids a full COUNT(*) scan on large tables)."""
+    with engine.connect() as connection:
+        estimate = connection.execute(text(
+            "SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"
+        ), {"table": f'public."{table_name}"'}).scalar()
+    return int(estimate) if estimate and estimate > 0 else None
 
-def load_crypto_data():
-    query = """
-    SELECT 
-        pair_address, 
-        base_token_name, 
-        price, 
-        liquidity, 
-        volume_24h, 
-        chain, 
-        exchange,
-        created_at
-    FROM pairs
-    ORDER BY volume_24h DESC
-    LIMIT 100
-    """
-    return pd.read_sql(query, engine)
+def load_page(table_name, columns, page_current, page_size, sort_by, filter_query):
+    """Load a single page of a table, reading only the requested columns."""
+    allowed_columns = data.table_columns(table_name)
+    if not allowed_columns:  # Unknown table
+        return pd.DataFrame()
+    query, params = build_page_query(table_name, columns, allowed_columns,
+                                     page_current, page_size, sort_by, filter_query)
+    with engine.connect() as connection:
+        return pd.read_sql(query, connection, params=params)
 
 # Initialize Dash App
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 
 # App Layout
+table_names = data.table_names()
 app.layout = html.Div([
     html.H1("Database Analytics & Crypto Viability Dashboard", style={'textAlign': 'center'}),
     
@@ -62,8 +54,8 @@ app.layout = html.Div([
         html.Label('Select Table:'),
         dcc.Dropdown(
             id='table-dropdown',
-            options=[{'label': table, 'value': table} for table in get_table_names()],
-            value=get_table_names()[0] if get_table_names() else None
+            options=[{'label': table, 'value': table} for table in table_names],
+            value=table_names[0] if table_names else None
         )
     ], style={'padding': '20px', 'width': '50%'}),
     
@@ -77,7 +69,7 @@ app.layout = html.Div([
                 dcc.Dropdown(
                     id='chain-dropdown',
                     options=[{'label': chain, 'value': chain} 
-                             for chain in load_crypto_data()['chain'].unique()],
+                             for chain in data.chains()],
                     placeholder='Select Chain'
                 ),
                 dcc.Graph(id='viability-scatter')
@@ -86,7 +78,7 @@ app.layout = html.Div([
     ])
 ])
 
-# Callback for table display
+# Callback for table display (paging, sorting and filtering are done in SQL)
 @app.callback(
     Output('table-display', 'children'),
     [Input('table-dropdown', 'value')]
@@ -95,33 +87,58 @@ def update_table_display(selected_table):
     if not selected_table:
         return "No table selected"
     
-    df = load_data(selected_table)
+    columns = data.table_columns(selected_table)
+    if not columns:
+        return "Unknown table"
+    
+    page_size = 10
+    row_count = estimate_row_count(selected_table)
     
     return dash_table.DataTable(
         id='table-data',
-        columns=[{"name": i, "id": i} for i in df.columns],
-        data=df.to_dict('records'),
-        page_size=10,
+        columns=[{"name": c, "id": c, "hideable": True} for c in columns],
+        page_current=0,
+        page_size=page_size,
+        page_count=-(-row_count // page_size) if row_count else None,
+        page_action='custom',
+        sort_action='custom',
+        sort_mode='single',
+        sort_by=[],
+        filter_action='custom',
+        filter_query='',
+        hidden_columns=[],
         style_table={'overflowX': 'auto'},
         style_cell={'textOverflow': 'ellipsis', 'maxWidth': 0}
     )
 
+# Callback for the current table page
+@app.callback(
+    Output('table-data', 'data'),
+    [Input('table-data', 'page_current'),
+     Input('table-data', 'page_size'),
+     Input('table-data', 'sort_by'),
+     Input('table-data', 'filter_query'),
+     Input('table-data', 'hidden_columns')],
+    [State('table-dropdown', 'value'),
+     State('table-data', 'columns')]
+)
+def update_table_page(page_current, page_size, sort_by, filter_query, hidden_columns, selected_table, columns):
+    if not selected_table:
+        return []
+    
+    hidden = set(hidden_columns or [])
+    visible = [c['id'] for c in columns if c['id'] not in hidden]
+    df = load_page(selected_table, visible, page_current or 0, page_size, sort_by, filter_query)
+    return df.to_dict('records')
+
 # Callback for crypto viability graph
 @app.callback(
     Output('viability-scatter', 'figure'),
     [Input('chain-dropdown', 'value')]
 )
 def update_viability_graph(selected_chain):
-    df = load_crypto_data()
-    
-    if selected_chain:
-        df = df[df['chain'] == selected_chain]
-    
-    # Viability Score Calculation
-    df['viability_score'] = (
-        df['volume_24h'] / df['volume_24h'].max() * 0.5 +
-        df['liquidity'] / df['liquidity'].max() * 0.5
-    ) * 100
+    # Scores are precomputed per chain (and over the global top) by the bot
+    df = data.viability(selected_chain)
 
     fig = px.scatter(
         df, 
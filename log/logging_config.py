@@ -1,26 +1,124 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
 
-def setup_logging():
-    """Setup logging with UTF-8 encoding support"""
-    logger = logging.getLogger("DexScreenerBot")
-    logger.setLevel(logging.INFO)
-
-    # File handler with UTF-8 encoding
-    file_handler = logging.FileHandler("log/dex_screener_bot.log", encoding='utf-8')
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s"
-    )
-    file_handler.setFormatter(file_formatter)
-
-    # Console handler with UTF-8 encoding
-    console_handler = logging.StreamHandler(sys.stdout)  # Use stdout instead of stderr
-    console_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s: %(message)s"
-    )
-    console_handler.setFormatter(console_formatter)
-
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-
-    return logger
\ No newline at end of file
+from config.config import CONFIG
+
+# One queue listener (writer thread) per configured logger
+_listeners = {}
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Compact JSON-lines formatter: one object per record."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a same-process listener.
+
+    The stock `prepare` formats and copies every record so that it can be
+    pickled; here the record only needs its arguments merged, and
+    formatting is left to the writer thread.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def build_file_handler(settings):
+    """File handler with the configured rotation (size, time or none)."""
+    path = settings["file"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    rotation = settings.get("rotation")
+    if rotation == "size":
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=int(settings["max_bytes"]), backupCount=int(settings["backup_count"]), encoding='utf-8'
+        )
+    elif rotation == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=settings["when"], backupCount=int(settings["backup_count"]), encoding='utf-8', utc=True
+        )
+    else:
+        handler = logging.FileHandler(path, encoding='utf-8')
+
+    if settings.get("json"):
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    return handler
+
+
+def setup_logging(settings=None, name="DexScreenerBot"):
+    """Setup non-blocking logging with UTF-8 encoding support.
+
+    Log calls only enqueue the record; a dedicated listener thread writes to
+    the file and console handlers. Calling it again returns the already
+    configured logger instead of adding handlers.
+    """
+    settings = settings or CONFIG["LOGGING"]
+    logger = logging.getLogger(name)
+
+    with _lock:
+        if name in _listeners:
+            return logger
+
+        logger.setLevel(settings["level"])
+        logger.propagate = False
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+        handlers = [build_file_handler(settings)]
+        if settings.get("console", True):
+            # Console handler (stdout instead of stderr)
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s"))
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(_InProcessQueueHandler(log_queue))
+
+    return logger
+
+
+def stop_logging(name=None):
+    """Flush the queued records and stop the writer thread(s)."""
+    with _lock:
+        names = [name] if name else list(_listeners)
+        for logger_name in names:
+            listener = _listeners.pop(logger_name, None)
+            if listener is None:
+                continue
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            logger = logging.getLogger(logger_name)
+            for handler in list(logger.handlers):
+                if isinstance(handler, logging.handlers.QueueHandler):
+                    logger.removeHandler(handler)
+
+
+atexit.register(stop_logging)
@@ -1,10 +1,39 @@
-
+import argparse
+import multiprocessing
 import os
+import signal
 import sys
 from dotenv import load_dotenv
+from config.config import CONFIG
 from empty_my_wallet.empty_my_wallet import EmptyMyWallet
 
+
+def run_worker(index: int, binance_api_key: str, binance_api_secret: str, test_mode: bool, sharded: bool):
+    """Run one bot instance; sharded workers coordinate through PostgreSQL leases."""
+    if index:
+        # Un fichier de log par worker (la rotation n'est pas multi-process)
+        root, ext = os.path.splitext(CONFIG["LOGGING"]["file"])
+        CONFIG["LOGGING"]["file"] = f"{root}.{index}{ext}"
+        # Et un port de métriques par worker (METRICS.port + index)
+        CONFIG["METRICS"]["port"] = int(CONFIG["METRICS"]["port"]) + index
+
+    bot = EmptyMyWallet(
+        binance_api_key=binance_api_key,
+        binance_api_secret=binance_api_secret,
+        test_mode=test_mode,
+        sharded=sharded
+    )
+    bot.run()
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DexScreener anomaly trading bot")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes sharing the chains / pair hash ranges through PostgreSQL leases")
+    parser.add_argument("--sharded", action="store_true",
+                        help="join a sharded worker pool even with a single local worker (multi-node)")
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv()
 
@@ -16,11 +45,29 @@ if __name__ == "__main__":
         print("❌ Binance API keys missing in .env file")
         sys.exit(1)
 
-    # Initialize and run bot
-    bot = EmptyMyWallet(
-        binance_api_key=binance_api_key,
-        binance_api_secret=binance_api_secret,
-        test_mode=test_mode
-    )
-    
-    bot.run()
\ No newline at end of file
+    sharded = args.sharded or args.workers > 1 or CONFIG["SHARDING"]["enabled"]
+    if args.workers <= 1:
+        # Initialize and run bot
+        run_worker(0, binance_api_key, binance_api_secret, test_mode, sharded)
+        sys.exit(0)
+
+    # Un process par worker ; les shards d'un worker mort sont repris à l'expiration de ses leases
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker, name=f"worker-{index}",
+                        args=(index, binance_api_key, binance_api_secret, test_mode, sharded))
+        for index in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def stop_workers(signum, frame):
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()  # SIGTERM: each worker saves its plots and releases its leases
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    for worker in workers:
+        worker.join()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+# Les modules s'importent depuis la racine du dépôt (pas de package installé)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def pg_engine():
+    """Disposable PostgreSQL database (`TEST_DATABASE_URL`), migrated to the latest version."""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from sqlalchemy import create_engine
+
+    from db.migrations import migrate
+
+    engine = create_engine(url)
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """Migrated SQLite database (the schema the offline replay uses)."""
+    from sqlalchemy import create_engine
+
+    from db.migrations import migrate
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
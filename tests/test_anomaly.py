@@ -0,0 +1,52 @@
+import numpy as np
+
+from empty_my_wallet.anomaly import RobustZScoreDetector
+
+
+def test_empty_window_scores_zero_and_flags_nothing():
+    detector = RobustZScoreDetector(window=10, threshold=3.0)
+    X = np.array([[1.0, 100.0, 50.0], [1e9, 1e9, 1e9]])
+
+    assert not detector.predict(X).any()
+
+
+def test_outlier_is_flagged_against_the_window():
+    detector = RobustZScoreDetector(window=100, threshold=3.0, recompute_every=1)
+    rng = np.random.default_rng(0)
+    detector.predict(rng.uniform(90, 110, size=(50, 3)))
+
+    flags = detector.predict(np.array([[100.0, 100.0, 100.0], [100.0, 1e7, 100.0]]))
+
+    assert flags.tolist() == [False, True]
+
+
+def test_ring_buffer_keeps_the_latest_rows_in_order():
+    detector = RobustZScoreDetector(window=4, threshold=3.0)
+    detector._append(np.arange(3, dtype=float).reshape(3, 1))
+    detector._append(np.arange(3, 6, dtype=float).reshape(3, 1))
+
+    assert detector._size == 4
+    latest = np.roll(detector._buffer[:, 0], -detector._head)
+    assert latest.tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_batch_larger_than_the_window_keeps_its_tail():
+    detector = RobustZScoreDetector(window=3, threshold=3.0)
+    detector._append(np.arange(5, dtype=float).reshape(5, 1))
+
+    assert detector._size == 3
+    assert sorted(detector._buffer[:, 0].tolist()) == [2.0, 3.0, 4.0]
+
+
+def test_stats_are_reused_between_recomputes():
+    detector = RobustZScoreDetector(window=100, threshold=3.0, recompute_every=3)
+    detector.predict(np.full((5, 1), 100.0))
+    detector.predict(np.full((5, 1), 100.0))
+    median = detector._median.copy()
+
+    # Troisième lot: pas de recalcul, la médiane ignore les nouvelles lignes
+    detector.predict(np.full((20, 1), 1e6))
+    assert np.array_equal(detector._median, median)
+
+    detector.predict(np.full((1, 1), 1e6))
+    assert not np.array_equal(detector._median, median)
@@ -0,0 +1,68 @@
+import logging
+import time
+from datetime import datetime
+
+import pytest
+
+from empty_my_wallet.archive import PayloadArchive
+from empty_my_wallet.normalize import normalize_pairs
+
+pytest.importorskip("pyarrow")
+
+LOGGER = logging.getLogger("tests")
+
+
+def settings(path, flush_interval=600):
+    return {"enabled": True, "path": str(path), "raw": True, "compression_level": 1,
+            "flush_interval": flush_interval}
+
+
+def raw_pair(i, chain="ethereum"):
+    return {"chainId": chain, "pairAddress": "0x" + f"{i:040x}", "priceUsd": str(i),
+            "baseToken": {"address": "0x" + f"{i + 1000:040x}", "name": f"T{i}"},
+            "quoteToken": {"address": "0x" + f"{i + 2000:040x}"},
+            "liquidity": {"usd": 10000 + i}, "volume": {"h24": 500 + i},
+            "dexId": "uniswap", "pairCreatedAt": 1700000000000}
+
+
+def test_raw_cycles_round_trip(tmp_path):
+    archive = PayloadArchive(LOGGER, settings(tmp_path), worker="w1")
+    first, second = datetime(2026, 10, 17, 12, 0), datetime(2026, 10, 17, 12, 1)
+    archive.append_raw([raw_pair(1), raw_pair(2, "bsc")], fetched_at=first)
+    archive.append_raw([raw_pair(3)], fetched_at=second)
+    archive.close()
+
+    cycles = list(archive.raw_cycles())
+    assert [fetched_at for fetched_at, _ in cycles] == [first, second]
+    assert cycles[0][1] == [raw_pair(1), raw_pair(2, "bsc")]
+    assert [entry["kind"] for entry in archive.manifest()] == ["raw"]
+    assert list(archive.raw_cycles(start=second)) == [(second, [raw_pair(3)])]
+
+
+def test_pairs_frame_reads_selected_columns(tmp_path):
+    archive = PayloadArchive(LOGGER, settings(tmp_path), worker="w1")
+    archive.append_pairs(normalize_pairs([raw_pair(i) for i in range(5)]))
+    archive.flush()
+    frame = archive.frame("pairs", columns=["pair_address", "price"])
+    assert frame.columns.tolist() == ["pair_address", "price"]
+    assert frame["price"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    archive.close()
+
+
+def test_idle_buffer_is_flushed_by_the_timer(tmp_path):
+    archive = PayloadArchive(LOGGER, settings(tmp_path, flush_interval=0.2), worker="w1")
+    archive.append_raw([raw_pair(1)])
+    # Aucun autre cycle n'arrive : le timer écrit quand même le buffer
+    deadline = time.monotonic() + 5
+    while not archive.manifest() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert [entry["rows"] for entry in archive.manifest()] == [1]
+    archive.close()
+
+
+def test_disabled_archive_writes_nothing(tmp_path):
+    archive = PayloadArchive(LOGGER, dict(settings(tmp_path), enabled=False))
+    archive.append_raw([raw_pair(1)])
+    archive.close()
+    assert archive.manifest() == []
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,82 @@
+import logging
+
+from sqlalchemy import text
+
+from empty_my_wallet.blacklist import BlacklistIndex
+
+SETTINGS = {"full_sync_interval": 600, "sync_overlap": 60}
+
+
+def index(engine, **settings):
+    return BlacklistIndex(engine, logging.getLogger("tests"), {**SETTINGS, **settings})
+
+
+def insert(engine, address, kind, listed_at="2026-10-17 12:00:00"):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO blacklist (address, type, reason, listed_at) VALUES (:a, :t, 'test', :l)"),
+                     {"a": address, "t": kind, "l": listed_at})
+
+
+def test_sync_loads_each_type(sqlite_engine):
+    insert(sqlite_engine, "0xcoin", "coin")
+    insert(sqlite_engine, "0xdev", "dev")
+    blacklist = index(sqlite_engine)
+    assert blacklist.sync() == 2
+    assert blacklist.addresses("coin") == {"0xcoin"}
+    assert blacklist.addresses("dev") == {"0xdev"}
+    assert "0xcoin" in blacklist
+
+
+def test_incremental_sync_reads_from_the_watermark(sqlite_engine):
+    insert(sqlite_engine, "0xold", "coin", "2026-10-17 10:00:00")
+    insert(sqlite_engine, "0xrecent", "coin", "2026-10-17 12:00:00")
+    blacklist = index(sqlite_engine)
+    blacklist.sync()
+    # Ligne validée en retard, dans la marge de recouvrement
+    insert(sqlite_engine, "0xlate", "coin", "2026-10-17 11:59:30")
+    assert blacklist.sync() == 2  # 0xrecent relue + 0xlate
+    assert blacklist.addresses("coin") == {"0xold", "0xrecent", "0xlate"}
+
+
+def test_full_reload_drops_rows_deleted_elsewhere(sqlite_engine):
+    insert(sqlite_engine, "0xa", "coin")
+    insert(sqlite_engine, "0xb", "coin")
+    blacklist = index(sqlite_engine)
+    blacklist.sync()
+    with sqlite_engine.begin() as conn:
+        conn.execute(text("DELETE FROM blacklist WHERE address = '0xa'"))  # Purge par un autre worker
+    blacklist.sync()
+    assert "0xa" in blacklist  # Incrémental : la suppression n'est pas visible
+    blacklist.sync(full=True)
+    assert blacklist.addresses("coin") == {"0xb"}
+
+
+def test_periodic_full_reload(sqlite_engine):
+    insert(sqlite_engine, "0xa", "coin")
+    blacklist = index(sqlite_engine, full_sync_interval=0)
+    blacklist.sync()
+    with sqlite_engine.begin() as conn:
+        conn.execute(text("DELETE FROM blacklist"))
+    blacklist.sync()
+    assert blacklist.addresses("coin") == frozenset()
+
+
+def test_add_many_skips_known_and_repeated_addresses(sqlite_engine):
+    insert(sqlite_engine, "0xknown", "coin")
+    blacklist = index(sqlite_engine)
+    blacklist.sync()
+    added = blacklist.add_many([("0xknown", "coin", "dup"), ("0xnew", "dev", "rug"),
+                                ("0xnew", "dev", "rug"), ("", "coin", "empty")])
+    assert added == 1
+    assert blacklist.addresses("dev") == {"0xnew"}
+    assert blacklist.add("0xnew", "dev", "again") is False
+
+
+def test_discard_removes_from_every_type(sqlite_engine):
+    blacklist = index(sqlite_engine)
+    blacklist.sync()
+    blacklist.add_many([("0xa", "coin", "x"), ("0xb", "dev", "y")])
+    blacklist.discard(["0xa", "0xb", "0xunknown"])
+    assert blacklist.addresses("coin") == frozenset()
+    assert blacklist.addresses("dev") == frozenset()
+    assert "0xa" not in blacklist
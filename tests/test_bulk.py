@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+from db.bulk import NULL_MARKER, frame_to_csv, upsert_pairs
+
+
+def pairs(*rows):
+    return pd.DataFrame([{
+        "pair_address": address, "base_token_name": "Token", "base_token_address": "0xbase",
+        "quote_token_address": "0xquote", "price": price, "liquidity": 1000.0, "volume_24h": None,
+        "chain": "ethereum", "exchange": "uniswap", "created_at": datetime(2026, 10, 1),
+        "timestamp": timestamp, "creator_address": None,
+    } for address, price, timestamp in rows])
+
+
+def stored(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT pair_address, price FROM pairs ORDER BY pair_address")).all()
+
+
+def test_frame_to_csv_marks_nulls():
+    buffer = frame_to_csv(pd.DataFrame({"a": ["x", None], "b": [1.5, None]}), ["a", "b"])
+    assert buffer.read().splitlines() == ["x,1.5", f"{NULL_MARKER},{NULL_MARKER}"]
+
+
+def test_upsert_keeps_the_latest_row_per_pair(sqlite_engine):
+    first, later = datetime(2026, 10, 17, 12, 0), datetime(2026, 10, 17, 12, 1)
+    assert upsert_pairs(sqlite_engine, pairs(("0xa", 1.0, first), ("0xb", 2.0, first))) == 2
+    upsert_pairs(sqlite_engine, pairs(("0xa", 3.0, first), ("0xa", 4.0, later)))
+    assert [(a, float(p)) for a, p in stored(sqlite_engine)] == [("0xa", 4.0), ("0xb", 2.0)]
+
+
+def test_copy_upsert_on_postgres(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(text("DELETE FROM pairs WHERE pair_address LIKE '0xtest%'"))
+    first, later = datetime(2026, 10, 17, 12, 0), datetime(2026, 10, 17, 12, 1)
+    upsert_pairs(pg_engine, pairs(("0xtesta", 1.0, first), ("0xtestb", 2.0, first)))
+    # Même clé deux fois dans le lot : la ligne la plus récente gagne, sans conflit
+    upsert_pairs(pg_engine, pairs(("0xtesta", 4.0, later), ("0xtesta", 3.0, first)))
+    with pg_engine.connect() as conn:
+        rows = conn.execute(text("SELECT pair_address, price, volume_24h FROM pairs "
+                                 "WHERE pair_address LIKE '0xtest%' ORDER BY pair_address")).all()
+    assert [(a, float(p), v) for a, p, v in rows] == [("0xtesta", 4.0, None), ("0xtestb", 2.0, None)]
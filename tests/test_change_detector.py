@@ -0,0 +1,91 @@
+from empty_my_wallet.change_detector import ChangeDetector
+
+SETTINGS = {
+    "enabled": True,
+    "price_threshold": 0.005,
+    "liquidity_threshold": 0.01,
+    "volume_threshold": 0.02,
+    "refresh_interval": 900,
+    "max_idle": 3600,
+}
+
+
+def pair(address, price=1.0, liquidity=10000.0, volume=5000.0, name="Token"):
+    return {
+        "pairAddress": address,
+        "chainId": "ethereum",
+        "dexId": "uniswap",
+        "priceUsd": str(price),
+        "liquidity": {"usd": liquidity},
+        "volume": {"h24": volume},
+        "baseToken": {"address": "0xbase" + address, "name": name},
+        "quoteToken": {"address": "0xquote"},
+        "pairCreatedAt": 1700000000000,
+    }
+
+
+def addresses(pairs):
+    return [p["pairAddress"] for p in pairs]
+
+
+def test_unchanged_pairs_are_skipped_after_commit():
+    detector = ChangeDetector(SETTINGS)
+    assert addresses(detector.select([pair("a"), pair("b")], now=0)) == ["a", "b"]
+    assert detector.commit(["a", "b"]) == 2
+    assert detector.select([pair("a"), pair("b", price=1.001)], now=10) == []
+    assert detector.skip_ratio == 1.0
+    # Les paires sautées restent disponibles pour l'historique
+    assert addresses(detector.last_unchanged) == ["a", "b"]
+
+
+def test_moves_above_threshold_and_content_changes_are_selected():
+    detector = ChangeDetector(SETTINGS)
+    detector.select([pair("a"), pair("b"), pair("c"), pair("d")], now=0)
+    detector.commit(["a", "b", "c", "d"])
+    selected = detector.select([pair("a", price=1.01), pair("b", volume=5200.0),
+                                pair("c", name="Renamed"), pair("d")], now=10)
+    assert addresses(selected) == ["a", "b", "c"]
+
+
+def test_refresh_interval_forces_reprocessing():
+    detector = ChangeDetector(SETTINGS)
+    detector.select([pair("a")], now=0)
+    detector.commit(["a"])
+    assert detector.select([pair("a")], now=899) == []
+    assert addresses(detector.select([pair("a")], now=900)) == ["a"]
+
+
+def test_only_processed_pairs_are_committed():
+    detector = ChangeDetector(SETTINGS)
+    detector.select([pair("a"), pair("b")], now=0)
+    detector.rollback()
+    assert addresses(detector.select([pair("a"), pair("b")], now=1)) == ["a", "b"]
+    # "b" filtrée ou non résolue : pas stockée, donc réévaluée au cycle suivant
+    assert detector.commit(["a", "unknown"]) == 1
+    assert addresses(detector.select([pair("a"), pair("b")], now=2)) == ["b"]
+    assert addresses(detector.last_unchanged) == ["a"]
+
+
+def test_moved_pair_that_is_not_stored_keeps_its_old_fingerprint():
+    detector = ChangeDetector(SETTINGS)
+    detector.select([pair("a")], now=0)
+    detector.commit(["a"])
+    assert addresses(detector.select([pair("a", price=2.0)], now=1)) == ["a"]
+    detector.commit([])
+    assert addresses(detector.select([pair("a", price=2.0)], now=2)) == ["a"]
+
+
+def test_idle_pairs_are_pruned():
+    detector = ChangeDetector(SETTINGS)
+    detector.select([pair("a"), pair("b")], now=0)
+    detector.commit(["a", "b"])
+    detector.select([pair("a")], now=3000)
+    detector.select([pair("a")], now=3700)
+    assert len(detector) == 1
+
+
+def test_disabled_detector_returns_everything():
+    detector = ChangeDetector(dict(SETTINGS, enabled=False))
+    pairs = [pair("a"), pair("a")]
+    assert detector.select(pairs) is pairs
+    assert detector.last_unchanged == []
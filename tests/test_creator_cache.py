@@ -0,0 +1,46 @@
+from empty_my_wallet import creator_cache
+from empty_my_wallet.creator_cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" devient le moins récent
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_overwrite_refreshes_entry():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_lru_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(creator_cache.time, "time", lambda: now[0])
+    cache = LRUCache(max_size=10)
+    cache.set("short", "x", ttl=5)
+    cache.set("forever", "y")
+    now[0] += 4
+    assert cache.get("short") == "x"
+    now[0] += 2
+    assert cache.get("short") is None
+    assert len(cache) == 1
+    assert cache.get("forever") == "y"
+
+
+def test_lru_counts_hits_and_misses():
+    cache = LRUCache(max_size=1)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    assert (cache.hits, cache.misses) == (1, 1)
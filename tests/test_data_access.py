@@ -0,0 +1,96 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+
+from frontend.data_access import DashboardData, build_page_query, split_filter_part
+
+COLUMNS = ["pair_address", "price", "chain", "created_at"]
+
+
+def test_split_filter_part_operators():
+    assert split_filter_part("{price} ge 10") == ("price", ">=", 10.0)
+    assert split_filter_part("{price} > 2.5") == ("price", ">", 2.5)
+    assert split_filter_part("{chain} eq bsc") == ("chain", "=", "bsc")
+    assert split_filter_part("{chain} contains eth") == ("chain", "contains", "eth")
+    assert split_filter_part("{chain} contains 42") == ("chain", "contains", "42")
+    assert split_filter_part("{created_at} datestartswith 2024-01") == ("created_at", "datestartswith", "2024-01")
+
+
+def test_split_filter_part_quoted_values():
+    assert split_filter_part('{chain} eq "bsc"') == ("chain", "=", "bsc")
+    assert split_filter_part("{price} eq '10'") == ("price", "=", "10")
+    assert split_filter_part(r"{chain} contains 'it\'s'") == ("chain", "contains", "it's")
+
+
+def test_split_filter_part_invalid():
+    assert split_filter_part("price > 3") == (None, None, None)
+    assert split_filter_part("{price} ~ 3") == (None, None, None)
+
+
+def test_build_page_query_paging_sorting_filtering():
+    query, params = build_page_query(
+        "pairs", ["price", "chain"], COLUMNS, page_current=2, page_size=50,
+        sort_by=[{"column_id": "price", "direction": "desc"}],
+        filter_query="{price} >= 10 && {chain} contains eth")
+    assert str(query) == ('SELECT "price", "chain" FROM "pairs" '
+                          'WHERE "price" >= :f0 AND CAST("chain" AS TEXT) ILIKE :f1 '
+                          'ORDER BY "price" DESC LIMIT :limit OFFSET :offset')
+    assert params == {"f0": 10.0, "f1": "%eth%", "limit": 50, "offset": 100}
+
+
+def test_build_page_query_ignores_unknown_columns():
+    query, params = build_page_query(
+        "pairs", ["price", 'x"; DROP TABLE pairs; --'], COLUMNS, page_current=0, page_size=10,
+        sort_by=[{"column_id": "evil", "direction": "asc"}],
+        filter_query='{evil} eq 1 && {created_at} datestartswith 2024')
+    assert str(query) == ('SELECT "price" FROM "pairs" WHERE CAST("created_at" AS TEXT) LIKE :f1 '
+                          'LIMIT :limit OFFSET :offset')
+    assert params == {"f1": "2024%", "limit": 10, "offset": 0}
+
+
+def test_build_page_query_defaults_to_all_columns():
+    query, params = build_page_query("pairs", [], COLUMNS, 0, 25, None, None)
+    assert str(query) == ('SELECT "pair_address", "price", "chain", "created_at" FROM "pairs" '
+                          'LIMIT :limit OFFSET :offset')
+    assert params == {"limit": 25, "offset": 0}
+
+
+def test_concurrent_misses_run_a_single_query():
+    # Sans table summary_refreshes : expiration par TTL seulement
+    data = DashboardData(create_engine("sqlite://"), ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["pairs"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(data._cached("tables", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [["pairs"]] * 8
+    assert len(calls) == 1
+
+
+def test_invalidate_drops_cached_entries():
+    data = DashboardData(create_engine("sqlite://"), ttl=60)
+    values = iter([1, 2])
+    assert data._cached("k", lambda: next(values)) == 1
+    assert data._cached("k", lambda: next(values)) == 1
+    data.invalidate()
+    assert data._cached("k", lambda: next(values)) == 2
+
+
+def test_result_loaded_before_an_invalidation_is_not_cached():
+    data = DashboardData(create_engine("sqlite://"), ttl=60)
+
+    def stale_loader():
+        data.invalidate()  # Le bot a rafraîchi la vue pendant la requête
+        return "stale"
+
+    assert data._cached("k", stale_loader) == "stale"
+    assert data._cached("k", lambda: "fresh") == "fresh"
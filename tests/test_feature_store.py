@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from empty_my_wallet.feature_store import FeatureRingBuffer
+
+
+def batch(start, n):
+    values = np.arange(start, start + n, dtype=float)
+    return pd.DataFrame({
+        "price": values,
+        "liquidity": values * 10,
+        "volume_24h": values * 100,
+        "timestamp": pd.to_datetime(values, unit="s"),
+        "chain": ["ethereum" if int(v) % 2 else "bsc" for v in values],
+        "exchange": "uniswap",
+    })
+
+
+def test_window_fills_then_wraps_around():
+    store = FeatureRingBuffer(5)
+    store.append(batch(0, 3))
+    assert len(store) == 3
+    assert store.features()[:, 0].tolist() == [0, 1, 2]
+
+    store.append(batch(3, 4))  # Déborde : les deux plus anciennes lignes sont écrasées
+    assert len(store) == 5
+    assert store.features()[:, 0].tolist() == [2, 3, 4, 5, 6]
+    assert store.features()[:, 2].tolist() == [200, 300, 400, 500, 600]
+    assert (store.timestamps() == pd.to_datetime([2, 3, 4, 5, 6], unit="s").to_numpy()).all()
+
+
+def test_window_is_a_contiguous_view():
+    store = FeatureRingBuffer(4)
+    for start in range(0, 11, 3):
+        store.append(batch(start, 3))
+    window = store.features()
+    assert window.base is not None  # Vue, pas de copie
+    assert window.flags["C_CONTIGUOUS"]
+    assert window[:, 0].tolist() == [8, 9, 10, 11]
+
+
+def test_batch_larger_than_capacity_keeps_the_tail():
+    store = FeatureRingBuffer(3)
+    store.append(batch(0, 7))
+    assert store.features()[:, 0].tolist() == [4, 5, 6]
+
+
+def test_categoricals_are_interned():
+    store = FeatureRingBuffer(4)
+    store.append(batch(0, 6))
+    frame = store.to_frame()
+    assert store.categories["chain"] == ["bsc", "ethereum"]
+    assert frame["chain"].tolist() == ["bsc", "ethereum", "bsc", "ethereum"]
+    assert frame["exchange"].tolist() == ["uniswap"] * 4
+
+
+def test_memmap_window_survives_reopen(tmp_path):
+    store = FeatureRingBuffer(4, path=str(tmp_path))
+    store.append(batch(0, 6))
+    store.flush()
+    reopened = FeatureRingBuffer(4, path=str(tmp_path))
+    assert reopened.features()[:, 0].tolist() == [2, 3, 4, 5]
+    assert reopened.categories == store.categories
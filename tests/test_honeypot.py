@@ -0,0 +1,103 @@
+import logging
+import threading
+
+import pandas as pd
+
+from empty_my_wallet.honeypot import HoneypotScreener
+from empty_my_wallet.http_client import HttpClient
+
+SETTINGS = {
+    "api_url": "https://honeypot.example/v2/IsHoneypot",
+    "max_workers": 4,
+    "positive_ttl": 86400,
+    "negative_ttl": 900,
+    "max_size": 100,
+}
+
+HTTP_SETTINGS = {
+    "pool_connections": 1,
+    "pool_maxsize": 1,
+    "defaults": {"timeout": 1, "retries": 0, "failure_threshold": 100, "reset_timeout": 30},
+    "apis": {},
+}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+
+class FakeHoneypotApi:
+    """honeypot.is stand-in: `verdicts` maps token address -> isHoneypot (or an exception)."""
+
+    def __init__(self, verdicts, gate=None):
+        self.verdicts = verdicts
+        self.gate = gate
+        self.headers = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        with self._lock:
+            self.requests.append(params["address"])
+        if self.gate is not None:
+            self.gate.wait(1)
+        verdict = self.verdicts[params["address"]]
+        return FakeResponse(verdict if isinstance(verdict, Exception) else {"isHoneypot": verdict})
+
+
+def screener(api):
+    http = HttpClient(session=api, settings=HTTP_SETTINGS)
+    return HoneypotScreener(logging.getLogger("tests"), http=http, settings=SETTINGS)
+
+
+def rows(*tokens):
+    return pd.DataFrame([{"pair_address": f"0xpair-{address}", "chain": chain, "base_token_address": address}
+                         for chain, address in tokens])
+
+
+def test_screen_keeps_only_clean_tokens():
+    api = FakeHoneypotApi({"0xclean": False, "0xtrap": True, "0xdown": ValueError("bad json")})
+    hp = screener(api)
+    kept = hp.screen(rows(("ethereum", "0xclean"), ("bsc", "0xtrap"), ("ethereum", "0xdown")))
+    assert kept["base_token_address"].tolist() == ["0xclean"]
+    assert hp.last_unresolved == {("ethereum", "0xdown")}
+    hp.shutdown()
+
+
+def test_verdicts_are_cached_but_failures_are_retried():
+    api = FakeHoneypotApi({"0xclean": False, "0xdown": ValueError("bad json")})
+    hp = screener(api)
+    df = rows(("ethereum", "0xclean"), ("ethereum", "0xdown"))
+    hp.screen(df)
+    hp.screen(df)
+    assert sorted(api.requests) == ["0xclean", "0xdown", "0xdown"]
+    hp.shutdown()
+
+
+def test_concurrent_checks_of_a_token_share_one_request():
+    gate = threading.Event()
+    api = FakeHoneypotApi({"0xclean": False}, gate=gate)
+    hp = screener(api)
+    futures = [hp.submit("ethereum", "0xCLEAN") for _ in range(5)]
+    gate.set()
+    assert [future.result() for future in futures] == [False] * 5
+    assert api.requests == ["0xclean"]
+    hp.shutdown()
+
+
+def test_unsupported_chain_is_dropped_without_a_request():
+    api = FakeHoneypotApi({})
+    hp = screener(api)
+    for _ in range(2):
+        assert hp.screen(rows(("solana", "0xsol"))).empty
+        assert hp.last_unresolved == set()  # Verdict définitif : pas retenté
+    assert api.requests == []
+    hp.shutdown()
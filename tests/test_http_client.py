@@ -0,0 +1,127 @@
+import pytest
+import requests
+
+from empty_my_wallet import http_client
+from empty_my_wallet.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+SETTINGS = {
+    "pool_connections": 1,
+    "pool_maxsize": 1,
+    "defaults": {"timeout": 1, "retries": 1, "failure_threshold": 2, "reset_timeout": 30},
+    "apis": {},
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Plays back a list of responses (or exceptions to raise)."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.headers = {}
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    assert breaker.record_failure() is False
+    breaker.record_success()  # Remet le compteur à zéro
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.state == "open"
+    assert breaker.acquire() == (False, False)
+
+
+def test_half_open_lets_a_single_probe_through(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 30
+    assert breaker.state == "half-open"
+    assert breaker.acquire() == (True, True)
+    assert breaker.acquire() == (False, False)
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.acquire() == (True, False)
+
+
+def test_failed_probe_reopens(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    now[0] += 31
+    assert breaker.acquire() == (True, True)
+    assert breaker.record_failure() is True
+    assert breaker.state == "open"
+    assert breaker.acquire() == (False, False)
+
+
+def test_end_probe_frees_the_slot(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 30
+    assert breaker.acquire() == (True, True)
+    breaker.end_probe()  # Erreur inattendue, aucun résultat enregistré
+    assert breaker.acquire() == (True, True)
+
+
+def test_connection_errors_are_retried_within_the_budget():
+    session = FakeSession([requests.ConnectionError("reset"), 200])
+    api = HttpClient(session=session, settings=SETTINGS).api("dex")
+    assert api.get("https://api.example/x").status_code == 200
+    assert session.calls == 2
+
+
+def test_5xx_trip_the_breaker_and_429_do_not():
+    session = FakeSession([429, 429, 429, 503, 503])
+    http = HttpClient(session=session, settings=SETTINGS)
+    api = http.api("dex")
+    for _ in range(5):
+        api.get("https://api.example/x")
+    assert http.breaker("dex", "https://api.example/y").state == "open"
+    with pytest.raises(CircuitOpenError):
+        api.get("https://api.example/x")
+    assert session.calls == 5
+    assert http.breaker("dex", "https://other.example/").state == "closed"  # Un disjoncteur par hôte
+
+
+def test_unexpected_error_frees_the_probe(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    session = FakeSession([503, 503, ValueError("bad payload"), 200])
+    http = HttpClient(session=session, settings=SETTINGS)
+    api = http.api("dex")
+    api.get("https://api.example/x")
+    api.get("https://api.example/x")
+    now[0] += 30
+    with pytest.raises(ValueError):
+        api.get("https://api.example/x")
+    assert api.get("https://api.example/x").status_code == 200
+    assert http.breaker("dex", "https://api.example/x").state == "closed"
+
+
+def test_request_counts_include_retries_and_reset():
+    session = FakeSession([requests.ConnectionError("reset"), 200, 200])
+    http = HttpClient(session=session, settings=SETTINGS)
+    http.api("dex").get("https://api.example/x")
+    http.api("honeypot").get("https://honeypot.example/x")
+    assert http.take_request_counts() == {"dex": 2, "honeypot": 1}
+    assert http.take_request_counts() == {}
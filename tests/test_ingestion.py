@@ -0,0 +1,43 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from empty_my_wallet.ingestion import TokenBucket, parse_retry_after
+
+
+def test_token_bucket_burst_then_waits():
+    bucket = TokenBucket(rate=50, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    started = time.monotonic()
+    waited = bucket.acquire()
+    assert waited > 0
+    assert time.monotonic() - started >= 0.015
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=1000, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    time.sleep(0.05)
+    assert bucket.acquire() == 0.0
+    assert bucket._tokens <= bucket.capacity
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "Mon, 99 Foo 2024"])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value) is None
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0.0
+
+
+def test_parse_retry_after_http_date():
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
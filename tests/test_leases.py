@@ -0,0 +1,102 @@
+import logging
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from db.leases import ExecutorUnavailableError, ShardCoordinator
+from db.migrations import migrate
+
+SETTINGS = {
+    "enabled": True,
+    "mode": "chain",
+    "hash_buckets": 16,
+    "lease_ttl": 30,
+    "heartbeat_interval": 5,
+    "trade_poll_interval": 1,
+}
+
+LOGGER = logging.getLogger("tests")
+
+
+def trades(*tokens):
+    return pd.DataFrame([{"pair_address": f"0xpair{token}", "chain": "ethereum", "base_token_name": token,
+                          "base_token_address": f"0x{token}", "price": 1.0} for token in tokens])
+
+
+@pytest.fixture
+def workers(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(text("TRUNCATE trade_intents"))
+    return [ShardCoordinator(pg_engine, LOGGER, ["ethereum"], worker_id=name, settings=SETTINGS)
+            for name in ("worker-a", "worker-b")]
+
+
+def statuses(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT base_token_address, status FROM trade_intents ORDER BY id")).all()
+
+
+def test_pending_token_is_queued_once(workers):
+    a, b = workers
+    assert a.enqueue_trades(trades("aaa", "aaa", "bbb")) == 2
+    assert b.enqueue_trades(trades("aaa")) == 0
+
+
+def test_executed_token_is_not_bought_again(workers, pg_engine):
+    a, b = workers
+    a.enqueue_trades(trades("aaa"))
+    bought = []
+    assert a.drain_trades(lambda intents: [bought.append(i["base_token_address"]) or {"orderId": 1}
+                                           for i in intents]) == 1
+    # Un autre worker voit le même token au cycle suivant : pas de second achat
+    assert b.enqueue_trades(trades("aaa")) == 0
+    assert a.drain_trades(lambda intents: [bought.append(i["base_token_address"]) for i in intents]) == 0
+    assert bought == ["0xaaa"]
+    assert statuses(pg_engine) == [("0xaaa", "executed")]
+
+
+def test_token_being_executed_is_not_queued(workers):
+    a, b = workers
+
+    def executor(intents):
+        assert b.enqueue_trades(trades("aaa")) == 0  # Intent 'claimed' pendant l'exécution
+        return [{"orderId": 1}] * len(intents)
+
+    a.enqueue_trades(trades("aaa"))
+    a.drain_trades(executor)
+
+
+def test_failed_and_skipped_tokens_can_be_queued_again(workers, pg_engine):
+    a, b = workers
+    a.enqueue_trades(trades("aaa", "bbb"))
+    a.drain_trades(lambda intents: [RuntimeError("rejected"), None])
+    assert statuses(pg_engine) == [("0xaaa", "failed"), ("0xbbb", "skipped")]
+    assert b.enqueue_trades(trades("aaa", "bbb")) == 2
+
+
+def test_unavailable_executor_releases_the_intents(workers, pg_engine):
+    a, _ = workers
+
+    def unavailable(intents):
+        raise ExecutorUnavailableError("Binance client is not initialized")
+
+    a.enqueue_trades(trades("aaa"))
+    assert a.drain_trades(unavailable) == 0
+    assert statuses(pg_engine) == [("0xaaa", "pending")]
+
+
+def test_migration_demotes_earlier_duplicates(pg_engine):
+    with pg_engine.begin() as conn:
+        conn.execute(text("TRUNCATE trade_intents"))
+        conn.execute(text("DROP INDEX idx_trade_intents_token"))
+        conn.execute(text("""
+            INSERT INTO trade_intents (pair_address, chain, base_token_name, base_token_address, worker_id, status)
+            VALUES ('p', 'ethereum', 'A', '0xaaa', 'w', 'executed'),
+                   ('p', 'ethereum', 'A', '0xaaa', 'w', 'executed'),
+                   ('p', 'ethereum', 'A', '0xaaa', 'w', 'pending'),
+                   ('p', 'ethereum', 'B', '0xbbb', 'w', 'failed')
+        """))
+    migrate(pg_engine, LOGGER, reapply=5)
+    assert statuses(pg_engine) == [("0xaaa", "executed"), ("0xaaa", "duplicate"),
+                                   ("0xaaa", "duplicate"), ("0xbbb", "failed")]
@@ -0,0 +1,47 @@
+import pytest
+
+from empty_my_wallet.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.enabled = True
+    return registry
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("latency_seconds", "Latency", ("api",), buckets=(0.1, 1.0, 0.5))
+    for value in (0.05, 0.1, 0.3, 0.7, 5.0):
+        histogram.observe(value, api="dex")
+
+    assert histogram.buckets == (0.1, 0.5, 1.0)
+    assert histogram.count(api="dex") == 5
+    lines = histogram.render().splitlines()
+    assert lines == [
+        'latency_seconds_bucket{api="dex",le="0.1"} 2',  # La borne est inclusive
+        'latency_seconds_bucket{api="dex",le="0.5"} 3',
+        'latency_seconds_bucket{api="dex",le="1.0"} 4',
+        'latency_seconds_bucket{api="dex",le="+Inf"} 5',
+        'latency_seconds_sum{api="dex"} 6.15',
+        'latency_seconds_count{api="dex"} 5',
+    ]
+
+
+def test_histogram_labels_are_separate_series(registry):
+    histogram = registry.histogram("stage_seconds", "Stage", ("stage",), buckets=(1.0,))
+    histogram.observe(0.5, stage="fetch")
+    histogram.observe(2.0, stage="store")
+    assert histogram.count(stage="fetch") == 1
+    assert histogram.count(stage="store") == 1
+    assert histogram.count(stage="score") == 0
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("noop_seconds", "Noop")
+    histogram.observe(1.0)
+    with histogram.time():
+        pass
+    assert histogram.count() == 0
+    assert "# TYPE noop_seconds histogram" in registry.render()
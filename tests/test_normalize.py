@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.bench_process_data import legacy_normalize, synthetic_pair
+from empty_my_wallet.normalize import normalize_pairs
+
+
+def assert_same_frame(raw):
+    now = datetime(2024, 1, 1)
+    expected = legacy_normalize(raw).assign(timestamp=now)
+    actual = normalize_pairs(raw, now=now)
+    actual["chain"] = actual["chain"].astype(object)
+    actual["exchange"] = actual["exchange"].astype(object)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_matches_legacy_on_synthetic_payload():
+    assert_same_frame([synthetic_pair(i) for i in range(200)])
+
+
+def test_matches_legacy_on_malformed_fields():
+    pairs = [synthetic_pair(i) for i in range(6)]
+    pairs[0]["pairAddress"] = "  " + pairs[0]["pairAddress"] + "  "
+    pairs[1]["baseToken"]["address"] = "not-an-address"
+    pairs[2]["quoteToken"]["address"] = "osmo" + "1" * 40
+    pairs[3]["priceUsd"] = "n/a"
+    pairs[4]["liquidity"]["usd"] = None
+    pairs[5]["pairAddress"] = 42
+    assert_same_frame(pairs)
@@ -0,0 +1,65 @@
+from empty_my_wallet.prefilter import MS_PER_DAY, PreFilter
+
+NOW_MS = 1700000000000
+SETTINGS = {
+    "min_liquidity": 5000,
+    "min_age_days": 3,
+    "coin_blacklist": ["SCAM"],
+    "dev_blacklist": [],
+    "chain_whitelist": ["ethereum", "bsc"],
+}
+
+
+class StaticBlacklist:
+    def __init__(self, coins=()):
+        self.coins = frozenset(coins)
+
+    def addresses(self, kind):
+        return self.coins if kind == "coin" else frozenset()
+
+
+def pair(address, chain="ethereum", liquidity=10000, age_days=10, name="Token", base="0xbase"):
+    return {
+        "pairAddress": address,
+        "chainId": chain,
+        "liquidity": {"usd": liquidity},
+        "pairCreatedAt": NOW_MS - age_days * MS_PER_DAY,
+        "baseToken": {"address": base, "name": name},
+    }
+
+
+def test_first_failing_rule_drops_the_pair():
+    prefilter = PreFilter(StaticBlacklist({"0xbad"}), SETTINGS)
+    pairs = [
+        pair("kept"),
+        pair("chain", chain="solana", liquidity=0),  # Compté une seule fois, sur la première règle
+        pair("liquidity", liquidity=4999),
+        pair("age", age_days=1),
+        pair("blacklisted-base", base="0xbad"),
+        pair("0xbad"),
+        pair("symbol", name="scam"),
+        pair("kept-bsc", chain="BSC", liquidity="6000"),
+    ]
+    kept = list(prefilter.filter(pairs, now_ms=NOW_MS))
+    assert [p["pairAddress"] for p in kept] == ["kept", "kept-bsc"]
+    assert prefilter.drops == {"chain": 1, "liquidity": 1, "age": 1, "blacklist": 3}
+    assert (prefilter.seen, prefilter.kept) == (8, 2)
+
+
+def test_malformed_fields_are_dropped():
+    prefilter = PreFilter(StaticBlacklist(), SETTINGS)
+    bad_liquidity = pair("a", liquidity="n/a")
+    missing_age = pair("b")
+    del missing_age["pairCreatedAt"]
+    assert list(prefilter.filter([bad_liquidity, missing_age, {}], now_ms=NOW_MS)) == []
+    assert prefilter.drops == {"chain": 1, "liquidity": 1, "age": 1, "blacklist": 0}
+
+
+def test_counts_are_recorded_when_the_stream_is_abandoned():
+    prefilter = PreFilter(StaticBlacklist(), SETTINGS)
+    stream = prefilter.filter([pair("a"), pair("b", chain="solana"), pair("c")], now_ms=NOW_MS)
+    next(stream)
+    next(stream)
+    stream.close()
+    assert prefilter.seen == 3
+    assert prefilter.drops["chain"] == 1
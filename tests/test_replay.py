@@ -0,0 +1,83 @@
+import gzip
+import json
+
+import pytest
+
+from empty_my_wallet.replay import (RecordingSession, ReplaySession, StubServer, load_recording,
+                                    request_key)
+
+
+def record(body, query="", status=200, path="/latest/dex/search"):
+    return {
+        "cycle": 0,
+        "method": "GET",
+        "host": "api.dexscreener.com",
+        "path": path,
+        "query": query,
+        "status": status,
+        "headers": {"Content-Type": "application/json"},
+        "elapsed": 0.01,
+        "body": json.dumps(body),
+    }
+
+
+def write_recording(path, records):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+@pytest.fixture
+def stub(tmp_path):
+    path = tmp_path / "rec.jsonl.gz"
+    write_recording(path, [record({"n": 1}, "q=eth"), record({"n": 2}, "q=eth")])
+    server = StubServer(load_recording(str(path))).start()
+    yield server
+    server.stop()
+
+
+def test_request_key_drops_secrets_and_sorts_query():
+    key = request_key("get", "https://api.binance.com/api/v3/order?symbol=X&apikey=k&side=BUY&signature=s")
+
+    assert key == ("GET", "api.binance.com", "/api/v3/order", "side=BUY&symbol=X")
+
+
+def test_load_recording_groups_by_key_in_order(tmp_path):
+    path = tmp_path / "rec.jsonl.gz"
+    write_recording(path, [record({"n": 1}, "q=eth"), record({"n": 2}, "q=sol"), record({"n": 3}, "q=eth")])
+
+    recording = load_recording(str(path))
+
+    eth = recording[("GET", "api.dexscreener.com", "/latest/dex/search", "q=eth")]
+    assert [json.loads(r["body"])["n"] for r in eth] == [1, 3]
+
+
+def test_replay_serves_in_order_then_repeats_last(stub):
+    session = ReplaySession(stub.url)
+    url = "https://api.dexscreener.com/latest/dex/search?q=eth"
+
+    bodies = [session.get(url, timeout=5).json()["n"] for _ in range(3)]
+
+    assert bodies == [1, 2, 2]
+    assert stub.misses == 0
+
+
+def test_unrecorded_request_is_a_404_miss(stub):
+    response = ReplaySession(stub.url).get("https://api.dexscreener.com/latest/dex/search?q=btc", timeout=5)
+
+    assert response.status_code == 404
+    assert stub.misses == 1
+
+
+def test_recording_session_round_trips_through_the_stub(stub, tmp_path):
+    # Enregistre le trafic servi par le stub, puis rejoue l'enregistrement
+    out = tmp_path / "out" / "again.jsonl.gz"
+    recorder = RecordingSession(str(out))
+    recorder.get(f"{stub.url}/api.dexscreener.com/latest/dex/search?q=eth&apikey=secret", timeout=5)
+    recorder.close()
+
+    (records,) = load_recording(str(out)).values()
+    assert records[0]["query"] == "q=eth"
+    assert json.loads(records[0]["body"]) == {"n": 1}
+    with gzip.open(out, "rt") as f:
+        assert "secret" not in f.read()
@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from empty_my_wallet.risk_gate import RiskGate
+
+SETTINGS = {"max_workers": 4, "token_budget": 0.3, "fail_closed": True}
+
+
+def candidates(n=2):
+    return pd.DataFrame({"base_token_address": [f"0xtoken{i}" for i in range(n)]})
+
+
+def gate(checks, **overrides):
+    return RiskGate(checks, logging.getLogger("test"), {**SETTINGS, **overrides})
+
+
+def passes(row):
+    return False
+
+
+def flags(row):
+    return True
+
+
+def fails(row):
+    raise RuntimeError("explorer down")
+
+
+@pytest.fixture
+def release():
+    # Débloque les checks lents en fin de test pour ne pas laisser de threads bloqués
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_empty_candidates_yield_no_verdicts():
+    assert gate({"ok": passes}).evaluate(candidates(0)) == []
+
+
+def test_clean_token_is_approved_and_flagged_one_is_not():
+    verdicts = gate({"ok": passes, "bundled": lambda row: row["base_token_address"] == "0xtoken1"}) \
+        .evaluate(candidates())
+
+    assert [v.approved for v in verdicts] == [True, False]
+    assert verdicts[1].flagged == ["bundled"]
+    assert verdicts[0].failed == verdicts[1].failed == []
+
+
+def test_failing_check_blocks_only_when_fail_closed():
+    closed = gate({"ok": passes, "broken": fails}).evaluate(candidates(1))
+    opened = gate({"ok": passes, "broken": fails}, fail_closed=False).evaluate(candidates(1))
+
+    assert not closed[0].approved
+    assert closed[0].failed == ["broken: explorer down"]
+    assert opened[0].approved
+
+
+def test_slow_check_times_out_at_the_token_deadline(release):
+    started = time.monotonic()
+    verdicts = gate({"ok": passes, "slow": lambda row: release.wait(5)}).evaluate(candidates(1))
+
+    assert time.monotonic() - started < 2
+    assert verdicts[0].failed == ["slow: timeout"]
+    assert not verdicts[0].approved
+
+
+def test_queued_tokens_get_their_own_budget():
+    # Un seul worker: chaque token attend le précédent, mais son budget ne démarre qu'avec son check
+    verdicts = gate({"check": lambda row: time.sleep(0.2) or False}, max_workers=1, token_budget=0.3) \
+        .evaluate(candidates(3))
+
+    assert all(v.approved for v in verdicts)
+    assert all(v.failed == [] for v in verdicts)
@@ -0,0 +1,56 @@
+import pytest
+
+from empty_my_wallet.scheduler import AdaptiveCadence
+
+SETTINGS = {
+    "interval": 60,
+    "adaptive": True,
+    "min_interval": 15,
+    "max_interval": 300,
+    "api_budgets_per_minute": {"dexscreener": 300, "explorer": 150},
+    "budget_utilization": 0.5,
+}
+
+
+def test_target_follows_the_budget():
+    cadence = AdaptiveCadence(SETTINGS)
+    # 2.5 requêtes/s autorisées pour DexScreener
+    assert cadence.target({"dexscreener": 100}) == pytest.approx(40.0)
+    assert cadence.target({"dexscreener": 10}) == 15.0  # min_interval
+    assert cadence.target({"dexscreener": 10000}) == 300.0  # max_interval
+
+
+def test_most_loaded_api_sets_the_target():
+    cadence = AdaptiveCadence(SETTINGS)
+    assert cadence.target({"dexscreener": 40, "explorer": 100}) == pytest.approx(80.0)
+    assert cadence.target({"dexscreener": 40, "unbudgeted": 10000}) == 16.0
+    assert cadence.target({}) == 15.0
+
+
+def test_default_settings_never_cycle_faster_than_before():
+    from config.config import DEFAULT_CONFIG
+    cadence = AdaptiveCadence(DEFAULT_CONFIG["SCHEDULER"])
+    assert cadence.target({"dexscreener": 4}) == 60.0
+
+
+def test_target_is_fixed_when_not_adaptive():
+    cadence = AdaptiveCadence(dict(SETTINGS, adaptive=False))
+    assert cadence.target({"dexscreener": 10000}) == 60.0
+
+
+def test_throttled_cycle_doubles_then_decays():
+    cadence = AdaptiveCadence(SETTINGS)
+    requests = {"dexscreener": 100}
+    assert cadence.update(requests, rate_limited=0) == pytest.approx(45.0)  # Part de `interval`
+    assert cadence.update(requests, rate_limited=0) == pytest.approx(40.0)
+    assert cadence.update(requests, rate_limited=3) == pytest.approx(80.0)
+    assert cadence.update(requests, rate_limited=0) == pytest.approx(60.0)
+    assert cadence.update(requests, rate_limited=0) == pytest.approx(45.0)
+    assert cadence.update(requests, rate_limited=0) == pytest.approx(40.0)
+
+
+def test_throttled_interval_is_capped():
+    cadence = AdaptiveCadence(SETTINGS)
+    for _ in range(10):
+        interval = cadence.update({"dexscreener": 500}, rate_limited=1)
+    assert interval == 300.0
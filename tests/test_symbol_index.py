@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+from empty_my_wallet import symbol_index
+from empty_my_wallet.symbol_index import SymbolIndex, SymbolRule, parse_symbol
+
+RULE = SymbolRule("PEPEUSDT", "PEPE", step_size=Decimal("0.01"), min_qty=Decimal("1"),
+                  max_qty=Decimal("1000"), min_notional=Decimal("5"))
+
+
+def test_quantity_is_rounded_down_to_the_step():
+    assert SymbolIndex.shape_quantity(RULE, 12.3456, 1) == Decimal("12.34")
+    assert SymbolIndex.shape_quantity(RULE, "7", None) == Decimal("7.00")
+
+
+def test_lot_size_filters():
+    assert SymbolIndex.shape_quantity(RULE, 0.999, None) is None  # min_qty
+    assert SymbolIndex.shape_quantity(RULE, 1000.01, None) is None  # max_qty
+    assert SymbolIndex.shape_quantity(RULE, 0.004, None) is None  # Arrondi à zéro
+
+
+def test_min_notional_filter():
+    assert SymbolIndex.shape_quantity(RULE, 10, 0.49) is None
+    assert SymbolIndex.shape_quantity(RULE, 10, 0.5) == Decimal("10.00")
+    assert SymbolIndex.shape_quantity(RULE, 10, float("nan")) == Decimal("10.00")  # Prix inconnu
+
+
+def test_zero_step_and_max_qty_are_ignored():
+    rule = RULE._replace(step_size=Decimal("0"), max_qty=Decimal("0"))
+    assert SymbolIndex.shape_quantity(rule, 123456.789, 1) == Decimal("123456.789")
+
+
+def test_parse_symbol_prefers_market_lot_size():
+    rule = parse_symbol({
+        "symbol": "PEPEUSDT",
+        "baseAsset": "pepe",
+        "filters": [
+            {"filterType": "LOT_SIZE", "stepSize": "1", "minQty": "1", "maxQty": "100"},
+            {"filterType": "MARKET_LOT_SIZE", "stepSize": "0.1", "minQty": "0.1", "maxQty": "50"},
+            {"filterType": "NOTIONAL", "minNotional": "5"},
+        ],
+    })
+    assert rule == SymbolRule("PEPEUSDT", "PEPE", Decimal("0.1"), Decimal("0.1"), Decimal("50"), Decimal("5"))
+
+
+class FakeClient:
+    def __init__(self):
+        self.fail = False
+        self.symbols = [{
+            "symbol": "PEPEUSDT", "baseAsset": "PEPE", "quoteAsset": "USDT", "status": "TRADING",
+            "orderTypes": ["LIMIT", "MARKET"],
+            "filters": [{"filterType": "LOT_SIZE", "stepSize": "1", "minQty": "1", "maxQty": "100"}],
+        }]
+
+    def get_exchange_info(self):
+        if self.fail:
+            raise ConnectionError("exchangeInfo down")
+        return {"symbols": self.symbols}
+
+    def get_all_coins_info(self):
+        return [{"coin": "PEPE", "networkList": [{"contractAddress": "0xPePe"}]}]
+
+
+class NullLogger:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+SETTINGS = {
+    "quote_asset": "USDT",
+    "refresh_interval": 3600,
+    "refresh_retry_interval": 30,
+    "resolve_contracts": True,
+    "name_fallback": True,
+    "contract_symbols": {},
+}
+
+
+def test_route_by_contract_never_falls_back_to_the_name():
+    index = SymbolIndex(FakeClient(), NullLogger(), SETTINGS)
+    assert index.refresh() is True
+    assert index.route("0xpepe", "Some Clone").symbol == "PEPEUSDT"
+    assert index.route("0xclone", "PEPE") is None  # Adresse connue comme non listée
+    assert index.route(None, "PEPE").symbol == "PEPEUSDT"
+
+
+def test_failed_refresh_is_retried_with_backoff():
+    client = FakeClient()
+    client.fail = True
+    index = SymbolIndex(client, NullLogger(), SETTINGS)
+    assert index.refresh() is False
+    assert not index.loaded
+    assert index.retry_delay() == 30
+    index.refresh()
+    assert index.retry_delay() == 60
+    for _ in range(10):
+        index.refresh()
+    assert index.retry_delay() == 3600
+
+    client.fail = False
+    assert index.refresh() is True
+    assert index.loaded
+    assert index.retry_delay() == 3600
+
+
+def test_maybe_refresh_waits_for_the_retry_delay(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(symbol_index.time, "monotonic", lambda: now[0])
+    client = FakeClient()
+    client.fail = True
+    index = SymbolIndex(client, NullLogger(), SETTINGS)
+    index.refresh()
+    now[0] += 29
+    assert index.maybe_refresh() is False
+    now[0] += 1
+    client.fail = False
+    assert index.maybe_refresh() is True
+    index._refresh_thread.join()
+    assert len(index) == 1
+    now[0] += 60
+    assert index.maybe_refresh() is False  # Chargé : refresh_interval s'applique